@@ -0,0 +1,168 @@
+""":py:mod:`benchmarks.feeds` generates synthetic xml feeds of arbitrary size"""
+
+__all__ = ["generate_feed"]
+
+import random
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+
+#: Category combinations with the frequency we see them in the real feed. Some of
+#: them match none of the subtables, just as in the real feed.
+CATEGORIES = (
+    ("Grundlagenkurs, Klettern, Mittelgebirge", 12),
+    ("Klettern, Bouldern, Mittelgebirge", 6),
+    ("Wandern, Mittelgebirge", 8),
+    ("Wandern, Hochgebirge", 6),
+    ("Bergsteigen, Hochtouren, Hochgebirge", 8),
+    ("Ski, Hochgebirge", 5),
+    ("Klettersteig, Klettern, Hochgebirge", 4),
+    ("Höhle, Mittelgebirge, Hochgebirge", 1),
+    ("Familie", 4),
+    ("Jugend", 4),
+    ("Mountainbiken", 2),
+    ("Grundlagenkurs, Klettern, in Berlin", 6),
+    ("Wandern, in Berlin", 2),
+)
+KINDS = ("A", "A/E", "E", "G", "Gemeinschaftsfahrt")
+PLACES = tuple(
+    "Ort %s" % place
+    for place in (
+        "Elbsandstein",
+        "Frankenjura",
+        "Harz",
+        "Zittauer Gebirge",
+        "Ötztal",
+        "Stubaital",
+        "Dolomiten",
+        "Berchtesgaden",
+        "Wallis",
+        "Kletterhalle nach Absprache",
+        "Hüttenweg",
+        "Südbloc Boulderhalle",
+    )
+)
+LEADERS = tuple(
+    "%s %s" % (first_name, last_name)
+    for first_name in ("Anna", "Jens", "Lars", "Maria", "Jörg", "Petra")
+    for last_name in ("Breidenstein", "Reichenberg", "Müller", "Schulz", "Weiß")
+)
+TARGET_GROUPS = (
+    "Anfänger",
+    "Anfänger mit Toprope-Erfahrung",
+    "Fortgeschrittene mit Vorstiegserfahrung",
+    "Familien mit Kindern ab 6 Jahren",
+    "Jugendliche von 14 bis 18 Jahren",
+)
+PREREQUISITES = ("", "", "Trittsicherheit", "Kondition für 6 Stunden Gehzeit")
+EQUIPMENT = ("", "", "Kletterausrüstung", "Ski- und Lawinenausrüstung")
+COSTS = ("", "0,00", "15,00", "36,00", "120,00", "450,00")
+OFFERS = ("", "Organisation, Führung", "Leihmaterial, Führung")
+WORDS = (
+    "Wir",
+    "üben",
+    "klettern",
+    "wandern",
+    "gemeinsam",
+    "im",
+    "Gebirge",
+    "die",
+    "Grundlagen",
+    "der",
+    "Sicherungstechnik",
+    "und",
+    "Tourenplanung",
+    "bei",
+    "jedem",
+    "Wetter",
+    "mit",
+    "Einkehr",
+)
+
+
+def generate_feed(output, number_of_events, seed=0):
+    """Write a synthetic feed in the format of the real *kurs* xml export
+
+    The feed contains a realistic mix of categories, places, leaders and dates,
+    including events without date, which are offered on request, and events with
+    up to three date ranges. The same seed always results in the same feed.
+
+    :param output: path or binary file object to write the feed to
+    :param int number_of_events: the number of *kurs* elements to create
+    :param int seed: the seed for the random choices
+    """
+    generator = random.Random(seed)
+    categories, weights = zip(*CATEGORIES)
+    start = datetime(2021, 1, 1, 8)
+    if isinstance(output, str):
+        with open(output, "wb") as file:
+            _write_feed(file, number_of_events, generator, categories, weights, start)
+    else:
+        _write_feed(output, number_of_events, generator, categories, weights, start)
+
+
+def _write_feed(file, number_of_events, generator, categories, weights, start):
+    file.write(
+        b'<?xml version="1.0" encoding="ISO-8859-15"?>\n<kursexport>\n'
+        b"<date>2020-11-11T11:56:29.396336</date>\n"
+    )
+    for counter in range(1, number_of_events + 1):
+        texts = [
+            ("counter", str(counter)),
+            ("Kursnummer", "B%07d" % counter),
+            ("Kursart", generator.choice(KINDS)),
+            ("Kategorie", generator.choices(categories, weights)[0]),
+            ("Bezeichnung", " ".join(generator.choices(WORDS, k=4)).capitalize()),
+            ("Bezeichnung2", generator.choice(("", "Ausdauernde Tour"))),
+            (
+                "Beschreibung",
+                " ".join(generator.choices(WORDS, k=generator.randint(10, 60))) + ".",
+            ),
+            ("TrainerURL", generator.choice(("", "www.example.org/kurs"))),
+        ]
+        texts.extend(_create_dates(generator, start))
+        texts.extend(
+            [
+                ("Ort1", generator.choice(PLACES)),
+                ("Kursleiter", generator.choice(LEADERS)),
+                ("Zielgruppe", generator.choice(TARGET_GROUPS)),
+                ("Voraussetzung", generator.choice(PREREQUISITES)),
+                ("Ausruestung", generator.choice(EQUIPMENT)),
+                ("Kurskosten", generator.choice(COSTS)),
+                ("Leistungen", generator.choice(OFFERS)),
+                ("Treffpunkt", "Bahnhof"),
+            ]
+        )
+        file.write(b"<kurs>\n")
+        for tag, text in texts:
+            file.write(
+                ("    <%s>%s</%s>\n" % (tag, escape(text), tag)).encode("iso-8859-15")
+            )
+        file.write(b"</kurs>\n")
+    file.write(b"</kursexport>\n")
+
+
+def _create_dates(generator, start):
+    """Create the three date ranges of one event
+
+    :returns: the tags and texts of the date ranges
+    :rtype: List[Tuple[str, str]]
+    """
+    date_format = "%d.%m.%Y %H:%M"
+    if generator.random() < 0.1:
+        # Events on request are exported without start and with a placeholder end.
+        dates = [("", "01.01.2099 00:00"), ("", ""), ("", "")]
+    else:
+        dates = []
+        begin = start + timedelta(days=generator.randrange(365))
+        for _ in range(generator.choices((1, 2, 3), (8, 2, 1))[0]):
+            if generator.random() < 0.3:
+                begin = begin.replace(hour=0)
+            end = begin + timedelta(hours=generator.choice((3, 8, 32, 56)))
+            dates.append((begin.strftime(date_format), end.strftime(date_format)))
+            begin = end + timedelta(days=generator.randint(1, 14))
+        dates.extend([("", "")] * (3 - len(dates)))
+    texts = []
+    for number, (begin, end) in enumerate(dates, 1):
+        texts.append(("TerminDatumVon%d" % number, begin))
+        texts.append(("TerminDatumBis%d" % number, end))
+    return texts
@@ -0,0 +1,282 @@
+"""Time each stage of the conversion of synthetic feeds and compare to baselines
+
+Run for instance::
+
+    python -m benchmarks.run --events 1000 10000 --save
+    python -m benchmarks.run --events 1000 10000
+
+The first call stores the measured times as baselines, the second call compares
+the measured times to the baselines and exits with a non-zero status if any stage
+got slower than the tolerance allows or has no baseline to compare to. The
+baselines of the default size are kept in *benchmarks/baselines.json*.
+
+The times are stored and compared relative to a calibration workload timed in the
+same run, so that baselines measured on one machine carry over to others.
+"""
+
+__all__ = [
+    "STAGES",
+    "benchmark_stages",
+    "calibrate",
+    "compare_to_baselines",
+    "find_missing_baselines",
+    "main",
+    "relative_times",
+]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from typing import Dict, List
+
+from defusedxml.ElementTree import parse
+from reportlab.platypus import SimpleDocTemplate
+from reportlab.platypus.flowables import KeepTogether
+
+from benchmarks.feeds import generate_feed
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.RowCache import RowCache
+from pyxml2pdf.Core.Sorter import Sorter
+from pyxml2pdf.model.tables.TableBuilder import TableBuilder
+
+#: The timed stages in the order of their execution. The *calibration* does not
+#: touch the feed, it is the unit of the times of all other stages. The stage
+#: *events* only creates the events, *rows* builds their full and reduced rows for
+#: the subtables they are routed to. The stages starting with *long* lay the same
+#: events out once more with one long table per subtable.
+STAGES = (
+    "calibration",
+    "parse",
+    "sort",
+    "events",
+    "rows",
+    "distribute",
+    "build",
+    "postprocess",
+    "long_distribute",
+    "long_build",
+)
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def calibrate():
+    """Measure the wall time of a fixed workload independent of the conversion
+
+    The workload formats, sorts and joins strings in pure Python, so its time
+    scales with the speed of the machine and the interpreter like the stages do.
+
+    :returns: the seconds the workload took
+    :rtype: float
+    """
+    start = time.perf_counter()
+    generator = random.Random(0)
+    words = ["%08x" % generator.getrandbits(32) for _ in range(200000)]
+    " ".join(sorted(words)).split()
+    return time.perf_counter() - start
+
+
+def benchmark_stages(number_of_events, directory, seed=0):
+    """Convert a synthetic feed and measure the wall time of each stage
+
+    :param int number_of_events: the number of events in the synthetic feed
+    :param str directory: the folder to write the feed and the PDFs to
+    :param int seed: the seed for the generation of the feed
+    :returns: the seconds each stage took
+    :rtype: Dict[str, float]
+    """
+    feed_path = os.path.join(directory, "feed_%d.xml" % number_of_events)
+    output_path = os.path.join(directory, "feed_%d.pdf" % number_of_events)
+    long_output_path = os.path.join(directory, "feed_%d_long.pdf" % number_of_events)
+    generate_feed(feed_path, number_of_events, seed)
+    times = {"calibration": calibrate()}
+    # Start without any texts parsed or broken into lines by previous runs.
+    Event.row_cache = RowCache()
+    Event.release_layouts()
+
+    start = time.perf_counter()
+    courses = parse(feed_path).findall("kurs")
+    times["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    courses = Sorter(courses).sort_parsed_xml("TerminDatumVon1")
+    times["sort"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    events = [Event(course) for course in courses]
+    times["events"] = time.perf_counter() - start
+
+    table_builder = TableBuilder()
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        routes = table_builder.route_events(events)
+    for title, subtable_events in zip(table_builder.subtable_titles, routes):
+        for event in subtable_events:
+            event.get_table_row(title)
+    times["rows"] = time.perf_counter() - start
+
+    # Distribute events, which have not built any rows yet.
+    Event.row_cache = RowCache()
+    Event.release_layouts()
+    events = [Event(course) for course in courses]
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for event in events:
+            table_builder.distribute_event(event)
+    times["distribute"] = time.perf_counter() - start
+
+    elements = [KeepTogether(row) for row in table_builder.collect_subtables()]
+    start = time.perf_counter()
+    SimpleDocTemplate(output_path, **Initializer.document_layout).build(elements)
+    times["build"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    PostProcessor(output_path).finalize_print_preparation()
+    times["postprocess"] = time.perf_counter() - start
+
+    Event.row_cache = RowCache()
+    Event.release_layouts()
+    events = [Event(course) for course in courses]
+    long_table_builder = TableBuilder(long_tables=True)
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for event in events:
+            long_table_builder.distribute_event(event)
+    times["long_distribute"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    long_tables = long_table_builder.collect_subtables()
+    SimpleDocTemplate(long_output_path, **Initializer.document_layout).build(
+        long_tables
+    )
+    times["long_build"] = time.perf_counter() - start
+    return times
+
+
+def relative_times(runs):
+    """Express the fastest time of each stage in units of the fastest calibration
+
+    :param List[Dict[str, float]] runs: the seconds each stage took per run, see
+        :func:`benchmark_stages`
+    :returns: the relative time of each stage except the calibration
+    :rtype: Dict[str, float]
+    """
+    calibration = min(run["calibration"] for run in runs)
+    return {
+        stage: min(run[stage] for run in runs) / calibration
+        for stage in STAGES
+        if stage != "calibration"
+    }
+
+
+def compare_to_baselines(results, baselines, tolerance):
+    """Find all stages which got slower than the baselines allow
+
+    :param Dict[str, Dict[str, float]] results: the relative time per stage per
+        number of events, see :func:`relative_times`
+    :param Dict[str, Dict[str, float]] baselines: the baseline relative time per
+        stage per number of events
+    :param float tolerance: the allowed relative slowdown
+    :returns: a description of each regression
+    :rtype: List[str]
+    """
+    regressions = []
+    for number_of_events, times in results.items():
+        for stage, seconds in times.items():
+            baseline = baselines.get(number_of_events, {}).get(stage)
+            if baseline is not None and seconds > baseline * (1 + tolerance):
+                regressions.append(
+                    "%s with %s events took %.2f instead of %.2f calibrations."
+                    % (stage, number_of_events, seconds, baseline)
+                )
+    return regressions
+
+
+def find_missing_baselines(results, baselines):
+    """Find all measured stages without a baseline to compare them to
+
+    :param Dict[str, Dict[str, float]] results: the relative time per stage per
+        number of events, see :func:`relative_times`
+    :param Dict[str, Dict[str, float]] baselines: the baseline relative time per
+        stage per number of events
+    :returns: a description of each missing baseline
+    :rtype: List[str]
+    """
+    return [
+        "%s with %s events has no baseline." % (stage, number_of_events)
+        for number_of_events, times in results.items()
+        for stage in times
+        if stage not in baselines.get(number_of_events, {})
+    ]
+
+
+def main(argv=None):
+    """Run the benchmarks from the commandline
+
+    :param List[str] argv: the commandline arguments without the program name
+    :returns: the exit status, which is 1 if there were regressions or missing
+        baselines
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--events", type=int, nargs="+", default=[1000], help="sizes of the feeds"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per size, the fastest counts"
+    )
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as new baselines"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed relative slowdown"
+    )
+    arguments = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for number_of_events in arguments.events:
+        runs: List[Dict[str, float]] = []
+        for _ in range(arguments.repeat):
+            with tempfile.TemporaryDirectory() as directory:
+                runs.append(benchmark_stages(number_of_events, directory))
+        results[str(number_of_events)] = relative_times(runs)
+        print(
+            "%7d events: calibration %.3fs, "
+            % (number_of_events, min(run["calibration"] for run in runs))
+            + ", ".join(
+                "%s %.2f" % (stage, relative_time)
+                for stage, relative_time in results[str(number_of_events)].items()
+            )
+        )
+
+    baselines: Dict[str, Dict[str, float]] = {}
+    if os.path.isfile(arguments.baselines):
+        with open(arguments.baselines) as baselines_file:
+            baselines = json.load(baselines_file)
+    if arguments.save:
+        baselines.update(results)
+        with open(arguments.baselines, "w") as baselines_file:
+            json.dump(baselines, baselines_file, indent=4, sort_keys=True)
+        return 0
+    missing_baselines = find_missing_baselines(results, baselines)
+    for missing_baseline in missing_baselines:
+        print(missing_baseline + " Store one with --save.")
+    regressions = compare_to_baselines(results, baselines, arguments.tolerance)
+    for regression in regressions:
+        print(regression)
+    return 1 if regressions or missing_baselines else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
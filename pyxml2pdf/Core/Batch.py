@@ -0,0 +1,128 @@
+""":py:mod:`Core.Batch` performs many conversions in one warm process or pool"""
+
+__all__ = ["Batch", "convert"]
+
+import json
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from pyxml2pdf.Core.Downloader import Downloader
+from pyxml2pdf.Core.Initializer import Initializer
+
+
+def convert(conversion):
+    """Perform one conversion described by an entry of a manifest
+
+    This is a module level function to be executable in a process pool. Since
+    fonts and styles are kept per process, only the first conversion in each
+    process pays for loading them.
+
+    :param Dict conversion: the entry of the manifest with the absolute paths
+    """
+    if conversion.get("url"):
+        Downloader(conversion["url"], conversion["xml"])
+    Initializer(
+        conversion["xml"],
+        conversion["pdf"],
+        conversion["properties"],
+        **conversion.get("options", {}),
+    )
+
+
+class Batch:
+    """Perform all conversions listed in a manifest file
+
+    The manifest is a JSON file containing a list of conversions. Each conversion
+    is an object with the local path to the XML file as *xml*, the output PDF's
+    path and filename as *pdf* and the properties file's path as *properties*. If
+    an optional *url* is given, the XML file is downloaded from there first. Also
+    optional are *options*, which are handed over as keyword arguments to
+    :py:class:`Core.Initializer.Initializer`. Relative paths are relative to the
+    folder of the manifest. An example manifest looks like::
+
+        [
+            {
+                "url": "https://www.alpinclub-berlin.de/kv/kursdaten.xml",
+                "xml": "input/kursdaten.xml",
+                "pdf": "output/kursdaten.pdf",
+                "properties": "input/kursdaten_prop.properties"
+            },
+            {
+                "xml": "input/kursdaten_jugend.xml",
+                "pdf": "output/kursdaten_jugend.pdf",
+                "properties": "input/kursdaten_prop.properties",
+                "options": {"single_pass": true}
+            }
+        ]
+
+    All conversions are performed in the current process one after the other, so
+    the interpreter, :py:mod:`reportlab`, the fonts and the styles are loaded
+    only once. Alternatively they are distributed over a pool of processes, each
+    of which stays warm for all conversions it performs. A failing conversion does
+    not stop the others. Its error is printed and it is listed in
+    :attr:`failures`.
+
+    :param str manifest_path: path to the manifest file
+    :param int processes: number of processes to perform the conversions in
+        parallel. The default of 1 performs all conversions in the current process.
+    """
+
+    conversions: List[Dict]
+    failures: List[Tuple[Dict, str]]
+
+    def __init__(self, manifest_path, processes=1):
+        self.conversions = self._read_manifest(manifest_path)
+        self.failures = []
+        if processes > 1 and len(self.conversions) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(convert, conversion)
+                    for conversion in self.conversions
+                ]
+                for conversion, future in zip(self.conversions, futures):
+                    try:
+                        future.result()
+                    except Exception:
+                        self._fail(conversion)
+        else:
+            for conversion in self.conversions:
+                try:
+                    convert(conversion)
+                except Exception:
+                    self._fail(conversion)
+        print(
+            "Converted %d of %d feeds."
+            % (len(self.conversions) - len(self.failures), len(self.conversions))
+        )
+
+    @staticmethod
+    def _read_manifest(manifest_path):
+        """Read the conversions from the manifest and make their paths absolute
+
+        :param str manifest_path: path to the manifest file
+        :returns: the conversions
+        :rtype: List[Dict]
+        """
+        with open(manifest_path) as manifest_file:
+            conversions = json.load(manifest_file)
+        manifest_folder = os.path.dirname(os.path.abspath(manifest_path))
+        for index, conversion in enumerate(conversions):
+            for key in ("xml", "pdf", "properties"):
+                if key not in conversion:
+                    raise ValueError(
+                        f"Expected conversion number {index + 1} in {manifest_path} "
+                        f"to specify '{key}' but only {list(conversion)} were given."
+                    )
+                conversion[key] = os.path.join(manifest_folder, conversion[key])
+        return conversions
+
+    def _fail(self, conversion):
+        """Record and report the failure of the conversion currently handled
+
+        :param Dict conversion: the failed conversion
+        """
+        error = traceback.format_exc()
+        self.failures.append((conversion, error))
+        print("The conversion of " + conversion["xml"] + " failed:\n" + error)
@@ -0,0 +1,189 @@
+""":py:mod:`Core.ChunkedRenderer` builds the document chunk by chunk"""
+
+__all__ = ["ChunkedRenderer"]
+
+import os
+import tempfile
+from typing import Dict, Iterator, List
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus.flowables import Flowable, KeepTogether
+
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.SplittingDocTemplate import SplittingDocTemplate
+from pyxml2pdf.model.tables.TableBuilder import TableBuilder
+
+
+class ChunkedRenderer:
+    """Build the document keeping only the rows of a few events in memory
+
+    Usually all rows of the document are collected before the document is built
+    and the finished pages stay on the canvas until the multi page PDF is written.
+    Instead, the events are routed to the subtables first and the rows of each
+    subtable are built in chunks of at most *chunk_size* events, while the document
+    is being built. The next chunk's rows are only built as soon as all rows before
+    are placed on the pages. Then the rows of the previous chunk are released and
+    the finished pages are saved into a PDF segment of their own. Finally the
+    segments are merged into the multi page PDF. Thus the memory needed for the
+    rows and pages does not grow with the size of the feed, but the events
+    themselves are still kept to sort and route them and merging the segments reads
+    the whole PDF once. With *single_pass* no merge is needed at all.
+
+    The rows are placed on the pages exactly as in a build from all rows at once,
+    so the resulting pages are the same.
+
+    :param str output_path: path to pdf file containing result
+    :param Dict document_layout: the page size and margins of the resulting PDF as
+        keyword arguments of :py:class:`reportlab.platypus.SimpleDocTemplate`
+    :param int chunk_size: the maximum number of events whose rows are built at
+        once, defaults to 500
+    :param bool single_pass: if True, the rotated single page PDFs are written
+        directly instead of the multi page PDF, see
+        :py:class:`Core.SplittingDocTemplate.SplittingDocTemplate`, defaults to False
+    """
+
+    output_path: str
+    #: The number of rows laid out during the latest build.
+    rows: int
+    _document_layout: Dict
+    _chunk_size: int
+    _single_pass: bool
+
+    def __init__(self, output_path, document_layout, chunk_size=500, single_pass=False):
+        self.output_path = output_path
+        self.rows = 0
+        self._document_layout = document_layout
+        self._chunk_size = chunk_size
+        self._single_pass = single_pass
+
+    def build(self, events):
+        """Build the document from the events chunk by chunk
+
+        :param List[Core.events.Event] events: the events in the order of the
+            document
+        :returns: the number of pages
+        :rtype: int
+        """
+        Event.format_dates(events)
+        self.rows = 0
+        chunks = self._chunks(events)
+        if self._single_pass:
+            pdf = _ChunkedDocTemplate(self.output_path, chunks, **self._document_layout)
+            pdf.build(next(chunks))
+            return pdf.page
+        with tempfile.TemporaryDirectory() as directory:
+            pdf = _ChunkedDocTemplate(
+                os.path.join(directory, os.path.basename(self.output_path)),
+                chunks,
+                segments=True,
+                rotation=0,
+                **self._document_layout
+            )
+            pdf.build(next(chunks))
+            return PostProcessor.merge_segments(pdf.segment_paths, self.output_path)
+
+    def _chunks(self, events):
+        """Build the rows of the subtables chunk by chunk
+
+        The rows of a chunk are released, as soon as the next chunk is requested.
+
+        :param List[Core.events.Event] events: the events in the order of the
+            document
+        :returns: the rows of each chunk, the first of which of each subtable
+            begins with the subtable's title and column headings
+        :rtype: Iterator[List[Flowable]]
+        """
+        table_builder = TableBuilder()
+        routes = table_builder.route_events(events)
+        for title, subtable_events in zip(table_builder.subtable_titles, routes):
+            rows = table_builder.make_header(title)
+            start = 0
+            while True:
+                chunk = subtable_events[start : start + self._chunk_size]
+                rows.extend(event.get_table_row(title) for event in chunk)
+                self.rows += len(rows)
+                yield [KeepTogether(row) for row in rows]
+                for event in chunk:
+                    event.release_table_rows()
+                Event.release_layouts()
+                rows = []
+                start += self._chunk_size
+                if start >= len(subtable_events):
+                    break
+
+
+class _ChunkedDocTemplate(SplittingDocTemplate):
+    """Build a document from rows, which are handed over chunk by chunk
+
+    As soon as all rows are placed, the next chunk is taken. With *segments* the
+    canvas is only saved at the end of the first page finished after that, so each
+    file contains the pages of about one chunk, otherwise each page is saved into
+    its own file.
+
+    :param str filename: path of the multi page PDF the files belong to
+    :param Iterator[List[Flowable]] chunks: the rows of the chunks after the first
+        one, which is handed to :meth:`build`
+    :param bool segments: if True, the pages are saved chunk by chunk instead of
+        page by page, defaults to False
+    :param kw: all other keyword arguments of
+        :py:class:`reportlab.platypus.SimpleDocTemplate`
+    """
+
+    #: The paths of the files the pages are saved in, in their order.
+    segment_paths: List[str]
+    _chunks: Iterator[List[Flowable]]
+    _rows: List[Flowable]
+    _segments: bool
+    _chunk: int
+    _segment_chunk: int
+
+    def __init__(self, filename, chunks, segments=False, **kw):
+        super().__init__(filename, **kw)
+        self._chunks = chunks
+        self._segments = segments
+        self._chunk = self._segment_chunk = 0
+        self.segment_paths = []
+
+    def build(self, flowables, **kw):
+        """Build the document starting with the rows of the first chunk
+
+        :param List[Flowable] flowables: the rows of the first chunk
+        :param kw: all other keyword arguments of
+            :py:meth:`reportlab.platypus.SimpleDocTemplate.build`
+        """
+        self._rows = flowables
+        super().build(flowables, **kw)
+
+    def handle_flowable(self, flowables):
+        """Place the next row and take the next chunk, if all rows are placed
+
+        :param List[Flowable] flowables: the rows not placed yet or the flowables
+            hanging over from the previous page
+        """
+        super().handle_flowable(flowables)
+        if flowables is self._rows and not flowables:
+            flowables.extend(next(self._chunks, []))
+            self._chunk += 1
+
+    def saves_canvas(self):
+        """Save the canvas after the first page finished in a new chunk
+
+        :returns: True, if the pages are not saved in segments or a new chunk was
+            taken since the canvas was created
+        :rtype: bool
+        """
+        return not self._segments or self._chunk != self._segment_chunk
+
+    def _makeCanvas(self, filename=None, canvasmaker=Canvas):
+        """Create the canvas for the upcoming pages
+
+        :param str filename: ignored, since the filename is determined by the page
+        :param canvasmaker: the class of the canvas to create
+        :returns: the canvas for the next pages
+        :rtype: reportlab.pdfgen.canvas.Canvas
+        """
+        canv = super()._makeCanvas(filename, canvasmaker)
+        self._segment_chunk = self._chunk
+        self.segment_paths.append(canv._filename)
+        return canv
@@ -0,0 +1,146 @@
+""":py:mod:`Core.DownloadStream` provides a file still being downloaded for reading"""
+
+__all__ = ["DownloadStream"]
+
+import io
+import os
+import queue
+import threading
+from typing import Optional
+
+import requests
+
+
+class DownloadStream(io.RawIOBase):
+    """Read a file from a URL while it is still being downloaded
+
+    The download runs in a background thread, which hands each received chunk over
+    to the reader right away. Handed to :py:class:`Core.Initializer.Initializer`,
+    the xml input is parsed while the remainder is still arriving, so the whole
+    conversion takes about as long as the slower of downloading and parsing instead
+    of their sum. At most `buffered_chunks` chunks are held in memory, if the
+    parser falls behind, the download waits for it.
+
+    If `output_filename` is given, the content is additionally written to a partial
+    file next to it, which replaces the output file only after the transfer
+    completed. Unlike :py:class:`Core.Downloader.Downloader` a stream always
+    transfers the whole file, so an existing cache file with the validators of a
+    previous download is deleted along with replacing the output file.
+
+    Errors of the download are raised by :meth:`read` once all chunks received
+    before the error were read.
+
+    :param str url: the full download link
+    :param str output_filename: optional local path where and under what name to
+        store a copy of the downloaded file
+    :param float timeout: seconds to wait for the server before the transfer is
+        considered interrupted, defaults to 60
+    :param int buffered_chunks: number of received chunks to hold in memory until
+        they are read, defaults to 64
+    """
+
+    _url: str
+    _output_filename: Optional[str]
+    _timeout: float
+    _chunks: "queue.Queue[Optional[bytes]]"
+    _chunk: memoryview
+    _error: Optional[BaseException]
+    _stopped: threading.Event
+
+    _chunk_size = 64 * 1024
+
+    def __init__(self, url, output_filename=None, timeout=60, buffered_chunks=64):
+        super().__init__()
+        self._url = url
+        self._output_filename = output_filename
+        self._timeout = timeout
+        self._chunks = queue.Queue(buffered_chunks)
+        self._chunk = memoryview(b"")
+        self._error = None
+        self._stopped = threading.Event()
+        threading.Thread(target=self._download, daemon=True).start()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        """Read the received bytes into a buffer and wait for them if necessary
+
+        :param bytearray buffer: the buffer to fill
+        :returns: the number of bytes read, which is 0 at the end of the file
+        :rtype: int
+        """
+        if not self._chunk:
+            chunk = self._chunks.get()
+            if chunk is None:
+                # Keep returning the end of the file on subsequent calls.
+                self._chunks.put(None)
+                if self._error is not None:
+                    raise self._error
+                return 0
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        """Stop the download if it is still running and close the stream"""
+        self._stopped.set()
+        super().close()
+
+    def _download(self):
+        """Transfer the file and hand the chunks over to the reader"""
+        try:
+            with requests.get(
+                self._url, stream=True, timeout=self._timeout
+            ) as response:
+                response.raise_for_status()
+                if self._output_filename is None:
+                    self._forward(response)
+                else:
+                    partial_filename = self._output_filename + ".part"
+                    with open(partial_filename, "wb") as file:
+                        self._forward(response, file)
+                    if not self._stopped.is_set():
+                        os.replace(partial_filename, self._output_filename)
+                        cache_filename = self._output_filename + ".cache"
+                        if os.path.isfile(cache_filename):
+                            os.remove(cache_filename)
+        except BaseException as error:
+            self._error = error
+        finally:
+            self._put(None)
+
+    def _forward(self, response, file=None):
+        """Hand the response's chunks over to the reader and write them to a file
+
+        :param requests.Response response: the response to read from
+        :param BinaryIO file: the optional file to store the chunks in
+        """
+        # Iterating the content waits for complete chunks, so rather hand over what
+        # arrived so far if the installed urllib3 supports it.
+        read1 = getattr(response.raw, "read1", None)
+        if read1 is None:
+            chunks = response.iter_content(self._chunk_size)
+        else:
+            chunks = iter(lambda: read1(self._chunk_size, decode_content=True), b"")
+        for chunk in chunks:
+            if self._stopped.is_set():
+                return
+            if chunk:  # filter out keep-alive new chunks
+                if file is not None:
+                    file.write(chunk)
+                self._put(chunk)
+
+    def _put(self, chunk):
+        """Hand a chunk over to the reader as soon as there is room for it
+
+        :param Optional[bytes] chunk: the chunk or None to mark the end of the file
+        """
+        while not self._stopped.is_set():
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                pass
@@ -1,3 +1,8 @@
+import hashlib
+import json
+import os
+import re
+
 import requests
 from clint.textui import progress
 
@@ -8,38 +13,86 @@ class Downloader:
     If no `output_filename` is specified, we extract the filename of the downloaded
     file and store the result in the *input* subfolder of the root directory.
 
+    The validators *ETag* and *Last-Modified* the server sends along with the file
+    are stored in a small cache file next to the downloaded file. On the next
+    download of the same file they are sent back as *If-None-Match* and
+    *If-Modified-Since*, so that the server can answer with *304 Not Modified* and
+    the local file is reused without transferring it again.
+
+    The content is first written to a partial file next to the output file, which is
+    only renamed to the output file after the transfer completed and passed the
+    integrity checks. Interrupted transfers are continued where they stopped with
+    HTTP *Range* requests, either right away for up to `retries` times or on the
+    next instantiation for the same file.
+
     :param str url: the full download link
     :param str output_filename: the local path where and under what name to store
         the downloaded file
+    :param bool cache: if False, the file is downloaded unconditionally and no
+        validators are stored, defaults to True
+    :param str checksum: optional hexadecimal SHA-256 digest the downloaded file
+        has to match
+    :param int retries: number of times an interrupted transfer is resumed before
+        giving up, defaults to 3
+    :param float timeout: seconds to wait for the server before the transfer is
+        considered interrupted, defaults to 60
     """
 
     _url: str
     _output_filename: str
+    _cache_filename: str
+    _partial_filename: str
+    _partial_cache_filename: str
+    _timeout: float
 
-    def __init__(self, url, output_filename=None):
+    _chunk_size = 512 * 1024
+    _retried_exceptions = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ChunkedEncodingError,
+        requests.exceptions.Timeout,
+    )
+
+    def __init__(
+        self,
+        url,
+        output_filename=None,
+        cache=True,
+        checksum=None,
+        retries=3,
+        timeout=60,
+    ):
         self._url = url
-        self._output_filename = output_filename
+        self._timeout = timeout
 
         # If no output file was given, set output filename to name of downloaded file.
         if output_filename is None:
             output_filename = self._extract_filename()
+        self._output_filename = output_filename
+        self._cache_filename = output_filename + ".cache"
+        self._partial_filename = output_filename + ".part"
+        self._partial_cache_filename = self._partial_filename + ".cache"
 
-        # Get the file nd follow redirects.
-        response = requests.get(url, stream=True)
-
-        # Compute parameters for download and corresponding progress bar.
-        total_length = int(response.headers.get("content-length"))
-        chunk_size = 512 * 1024
-
-        # Do the actual download by opening a file and then getting the download
-        # source in chunks to avoid memory overload.
-        file = open(output_filename, "wb")
-        for chunk in progress.bar(
-            response.iter_content(chunk_size), expected_size=(total_length / 1024) + 1
-        ):
-            if chunk:  # filter out keep-alive new chunks
-                file.write(chunk)
-        file.close()
+        # Get the file and follow redirects, but only if it changed since the last
+        # download. Resume the transfer as long as it gets interrupted.
+        for attempt in range(retries + 1):
+            try:
+                modified = self._transfer(cache)
+                break
+            except self._retried_exceptions:
+                if attempt == retries:
+                    raise
+                print("The download of " + url + " was interrupted. Resuming...")
+        if not modified:
+            print("The file " + output_filename + " is up to date.")
+            return
+
+        self._verify_checksum(checksum)
+        os.replace(self._partial_filename, output_filename)
+        if cache and os.path.isfile(self._partial_cache_filename):
+            os.replace(self._partial_cache_filename, self._cache_filename)
+        else:
+            self._remove(self._partial_cache_filename)
+            self._remove(self._cache_filename)
         print("The file " + output_filename + " was successfully downloaded.")
 
     def _extract_filename(self):
@@ -49,3 +102,212 @@ class Downloader:
         :rtype: str
         """
         return self._url.split("/")[-1]
+
+    def _transfer(self, cache):
+        """Transfer the file's content, or its remainder, into the partial file
+
+        :param bool cache: if True, the request is conditional on the stored
+            validators of the last completed download
+        :returns: False if the server reported the local file as up to date, True
+            if the partial file now contains the complete file
+        :rtype: bool
+        """
+        headers = {}
+        offset = self._resumable_size()
+        if offset:
+            # Byte offsets are only meaningful for the unencoded content.
+            headers["Range"] = "bytes=%d-" % offset
+            headers["Accept-Encoding"] = "identity"
+            headers["If-Range"] = self._resume_validator()
+        elif cache:
+            headers.update(self._load_conditional_headers())
+
+        with requests.get(
+            self._url, stream=True, headers=headers, timeout=self._timeout
+        ) as response:
+            if response.status_code == requests.codes.not_modified:
+                return False
+            if response.status_code == requests.codes.range_not_satisfiable:
+                # The partial file does not fit the file on the server anymore.
+                self._remove(self._partial_filename)
+                return self._transfer(cache)
+            response.raise_for_status()
+
+            # Compute parameters for download and corresponding progress bar.
+            if response.status_code == requests.codes.partial_content:
+                mode = "ab"
+                total_length = self._parse_content_range(response, offset)
+            else:
+                mode = "wb"
+                offset = 0
+                total_length = self._parse_content_length(response)
+                self._store_validators(response.headers, self._partial_cache_filename)
+            chunks = response.iter_content(self._chunk_size)
+            if total_length is not None:
+                chunks = progress.bar(
+                    chunks,
+                    expected_size=(total_length - offset) // self._chunk_size + 1,
+                )
+
+            # Do the actual download by opening a file and then getting the download
+            # source in chunks to avoid memory overload.
+            with open(self._partial_filename, mode) as file:
+                for chunk in chunks:
+                    if chunk:  # filter out keep-alive new chunks
+                        file.write(chunk)
+
+        if total_length is not None:
+            received_length = os.path.getsize(self._partial_filename)
+            if received_length < total_length:
+                raise requests.exceptions.ChunkedEncodingError(
+                    "Received only %d of %d bytes." % (received_length, total_length)
+                )
+        return True
+
+    def _resumable_size(self):
+        """Determine how many bytes of the file are already downloaded
+
+        A partial file is only continued if we know from its validators, that the
+        file on the server did not change in the meantime.
+
+        :returns: the size of the resumable partial file or zero
+        :rtype: int
+        """
+        if not os.path.isfile(self._partial_filename) or not self._resume_validator():
+            return 0
+        return os.path.getsize(self._partial_filename)
+
+    def _resume_validator(self):
+        """Return the validator of the file the partial file was started from
+
+        :returns: the partial file's ETag if it is a strong one, else its
+            Last-Modified date or None if both are unknown
+        :rtype: str
+        """
+        validators = self._load_validators(self._partial_cache_filename)
+        etag = validators.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return validators.get("last-modified")
+
+    @staticmethod
+    def _parse_content_length(response):
+        """Extract the length of the file from a complete response if it is known
+
+        The length is unknown if the server does not send it, for instance for
+        chunked transfers, or if it only refers to the compressed content.
+
+        :param requests.Response response: the response to a request for the file
+        :returns: the length of the file in bytes or None if it is unknown
+        :rtype: Optional[int]
+        """
+        content_length = response.headers.get("content-length")
+        if content_length is None or response.headers.get("content-encoding"):
+            return None
+        return int(content_length)
+
+    def _parse_content_range(self, response, offset):
+        """Extract the length of the file from a partial response
+
+        :param requests.Response response: the response to a range request
+        :param int offset: the first byte position requested
+        :returns: the length of the file in bytes or None if it is unknown
+        :rtype: Optional[int]
+        """
+        match = re.match(
+            r"bytes (\d+)-\d+/(\d+|\*)", response.headers.get("content-range", "")
+        )
+        if match is None or int(match.group(1)) != offset:
+            self._remove(self._partial_filename)
+            raise requests.exceptions.ChunkedEncodingError(
+                "The server did not continue the transfer at byte %d." % offset
+            )
+        if match.group(2) == "*":
+            return None
+        return int(match.group(2))
+
+    def _verify_checksum(self, checksum):
+        """Make sure the downloaded content matches the expected SHA-256 digest
+
+        The partial file is deleted in case of a mismatch, so the next download
+        starts from scratch.
+
+        :param str checksum: the expected hexadecimal SHA-256 digest or None to skip
+            the verification
+        """
+        if checksum is None:
+            return
+        sha256 = hashlib.sha256()
+        with open(self._partial_filename, "rb") as file:
+            for chunk in iter(lambda: file.read(self._chunk_size), b""):
+                sha256.update(chunk)
+        if sha256.hexdigest() != checksum.lower():
+            self._remove(self._partial_filename)
+            self._remove(self._partial_cache_filename)
+            raise IOError(
+                f"The SHA-256 digest {sha256.hexdigest()} of the download of "
+                f"{self._url} does not match the expected {checksum}. The file "
+                f"was discarded."
+            )
+
+    def _load_conditional_headers(self):
+        """Assemble the request headers to only download the file if it changed
+
+        The headers are based on the validators stored during the last download. If
+        the local file or the validators are missing, no conditional headers are
+        returned to make sure the file is downloaded.
+
+        :returns: the conditional request headers
+        :rtype: Dict[str, str]
+        """
+        if not os.path.isfile(self._output_filename):
+            return {}
+        validators = self._load_validators(self._cache_filename)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last-modified"):
+            headers["If-Modified-Since"] = validators["last-modified"]
+        return headers
+
+    def _load_validators(self, cache_filename):
+        """Load the validators stored for the url
+
+        :param str cache_filename: the path of the file containing the validators
+        :returns: the stored validators or an empty dict, if there are none
+        :rtype: Dict[str, str]
+        """
+        try:
+            with open(cache_filename) as cache_file:
+                validators = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if validators.get("url") != self._url:
+            return {}
+        return validators
+
+    def _store_validators(self, response_headers, cache_filename):
+        """Store the validators of a response for subsequent requests
+
+        :param Mapping[str, str] response_headers: the headers of the response
+        :param str cache_filename: the path of the file to store the validators in
+        """
+        validators = {
+            "url": self._url,
+            "etag": response_headers.get("etag"),
+            "last-modified": response_headers.get("last-modified"),
+        }
+        if validators["etag"] or validators["last-modified"]:
+            with open(cache_filename, "w") as cache_file:
+                json.dump(validators, cache_file)
+        else:
+            self._remove(cache_filename)
+
+    @staticmethod
+    def _remove(filename):
+        """Remove a file if it exists
+
+        :param str filename: the path of the file to remove
+        """
+        if os.path.isfile(filename):
+            os.remove(filename)
@@ -3,41 +3,182 @@ from typing import List
 from defusedxml.ElementTree import parse
 from reportlab.lib.pagesizes import mm
 from reportlab.platypus import SimpleDocTemplate
-from reportlab.platypus.flowables import KeepTogether
+from reportlab.platypus.flowables import Flowable
 
+from pyxml2pdf.Core.ChunkedRenderer import ChunkedRenderer
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.PageCache import PageCache
 from pyxml2pdf.Core.Parser import Parser
 from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.Profiler import Profiler
+from pyxml2pdf.Core.RowCache import RowCache
 from pyxml2pdf.Core.Sorter import Sorter
+from pyxml2pdf.Core.SplittingDocTemplate import SplittingDocTemplate
+from pyxml2pdf.Core.Streamer import Streamer
+from pyxml2pdf.Core.SubtableRenderer import SubtableRenderer
 
 
 class Initializer:
     """Coordinate the construction of the pdf result
 
-    :param str input_path: path to input xml-file
+    :param input_path: path to input xml-file or a binary file object to read it
+        from, like a :py:class:`Core.DownloadStream.DownloadStream`
     :param str output_path: path to pdf file containing result
     :param str properties_path: path to text file containing properties
+    :param bool streaming: if True, the input is parsed one *kurs* at a time and
+        each one is turned into an :py:class:`Core.events.Event` right away instead
+        of keeping the entire parsed xml tree in memory. All events are still kept
+        to sort them by date, so memory still grows with the size of the feed, but
+        only by the compact events. Defaults to False.
+    :param int workers: number of processes to lay out the subtables, if
+        *segments* is True, and to split the resulting PDF into single pages,
+        defaults to 1
+    :param bool single_pass: if True, the rotated single page PDFs are written
+        directly while the document is built and the multi page PDF is omitted,
+        defaults to False
+    :param bool split_pages: if False, only the multi page PDF is written and not
+        split into rotated single page PDFs afterwards. This is ignored if
+        *single_pass* is True. Defaults to True.
+    :param bool segments: if True, each subtable starts on a new page and is laid
+        out separately, so that up to *workers* subtables are laid out in parallel,
+        see :py:class:`Core.SubtableRenderer.SubtableRenderer`. This is not
+        possible together with *single_pass* or *incremental*. Defaults to False.
+    :param bool incremental: if True, the pages are kept in a folder next to the
+        pdf result and on the next build only pages with changed rows are rendered,
+        see :py:class:`Core.PageCache.PageCache`. Defaults to False.
+    :param int chunk_size: optional number of events, whose rows are built at once,
+        to build the document chunk by chunk and save the finished pages to disk
+        after each chunk, so that only the rows and pages of one chunk are kept in
+        memory, see :py:class:`Core.ChunkedRenderer.ChunkedRenderer`. The input is
+        then always parsed as with *streaming*, so the parsed xml tree is not kept
+        either. The events themselves, which are needed to sort them, still grow
+        with the size of the feed. This is not possible together with *segments*
+        or *incremental*.
+    :param bool long_tables: if True, each subtable is laid out as one
+        :py:class:`reportlab.platypus.LongTable`, which repeats the title and
+        column headings on every page, instead of one table per row, see
+        :py:meth:`model.tables.TableBuilder.TableBuilder.create_long_table`. This
+        is not possible together with *segments*, *incremental* or *chunk_size*.
+        Defaults to False.
+    :param str row_cache_path: optional path of a file to keep the line breaks of
+        the table rows in across runs, so that only rows of changed events are laid
+        out anew, see :py:class:`Core.RowCache.RowCache`
+    :param str report_path: optional path of a JSON file to write wall time, CPU
+        time and peak memory of each stage and the number of events, rows and
+        pages to, see :py:class:`Core.Profiler.Profiler`. The stages are *setup* of
+        the styles, the fonts, the subtables and the document, *parse*, which reads
+        the input and turns each *kurs* into an :py:class:`Core.events.Event` in
+        every mode, *sort*, *collect*, which is omitted if the rows are collected
+        while laid out, *build* and *postprocess*. The rows counted include the
+        title and the column headings of each subtable.
+    :param Callable[[Dict], None] report_hook: optional callback to hand the same
+        report to
     """
 
-    __data: List[KeepTogether]
+    __data: List[Flowable]
 
-    def __init__(self, input_path, output_path, properties_path):
+    #: The page size and margins of the resulting PDF.
+    document_layout = dict(
+        pagesize=(178 * mm, 134 * mm),
+        topMargin=0.0,
+        bottomMargin=0.0,
+        leftMargin=0.0,
+        rightMargin=0.0,
+    )
+
+    def __init__(
+        self,
+        input_path,
+        output_path,
+        properties_path,
+        streaming=False,
+        workers=1,
+        single_pass=False,
+        split_pages=True,
+        segments=False,
+        incremental=False,
+        chunk_size=None,
+        long_tables=False,
+        row_cache_path=None,
+        report_path=None,
+        report_hook=None,
+    ):
+        if segments and (single_pass or incremental):
+            raise ValueError(
+                "Subtables laid out separately are merged into the multi page PDF, "
+                "so they cannot be combined with single pass or incremental builds."
+            )
+        if chunk_size is not None and (segments or incremental):
+            raise ValueError(
+                "Chunked builds lay out one subtable after the other, so they "
+                "cannot be combined with segments or incremental builds."
+            )
+        if long_tables and (segments or incremental or chunk_size is not None):
+            raise ValueError(
+                "Long tables are laid out as a whole, so they cannot be combined "
+                "with segments, incremental or chunked builds."
+            )
         self.__data = []
-        parser = Parser(properties_path, self.__data)
-        pdf = SimpleDocTemplate(
-            output_path,
-            pagesize=(178 * mm, 134 * mm),
-            topMargin=0.0,
-            bottomMargin=0.0,
-            leftMargin=0.0,
-            rightMargin=0.0,
-        )
-        doc = parse(input_path)
-        sorter = Sorter(doc.findall("kurs"))
-        sorted_courses = sorter.sort_parsed_xml("TerminDatumVon1")
-
-        parser.collect_xml_data(sorted_courses)
-
-        pdf.build(self.__data)
-
-        pdf_postprocessor = PostProcessor(output_path)
-        pdf_postprocessor.finalize_print_preparation()
+        Event.row_cache = RowCache(row_cache_path)
+        with Profiler(report_path, report_hook) as profiler:
+            if isinstance(input_path, str):
+                profiler.describe_input(input_path)
+
+            with profiler.stage("setup"):
+                parser = Parser(properties_path, self.__data, long_tables=long_tables)
+                doc_template = (
+                    SplittingDocTemplate if single_pass else SimpleDocTemplate
+                )
+                pdf = doc_template(output_path, **self.document_layout)
+
+            with profiler.stage("parse"):
+                if streaming or chunk_size is not None:
+                    courses = Streamer(input_path)
+                else:
+                    courses = iter(parse(input_path).findall("kurs"))
+                # Only the events are kept, not the elements they are built from.
+                events = [Event(course) for course in courses]
+            profiler.count("events", len(events))
+
+            with profiler.stage("sort"):
+                sorter = Sorter(events)
+                events = sorter.sort_parsed_xml("TerminDatumVon1")
+
+            # The rows of segments and chunks are collected while they are laid out.
+            if not segments and chunk_size is None:
+                with profiler.stage("collect"):
+                    parser.collect_xml_data(events)
+                profiler.count("rows", parser.rows)
+
+            with profiler.stage("build"):
+                if segments:
+                    renderer = SubtableRenderer(
+                        output_path, self.document_layout, workers
+                    )
+                    pages = renderer.build(events)
+                    profiler.count("rows", renderer.rows)
+                elif chunk_size is not None:
+                    renderer = ChunkedRenderer(
+                        output_path, self.document_layout, chunk_size, single_pass
+                    )
+                    pages = renderer.build(events)
+                    profiler.count("rows", renderer.rows)
+                elif incremental:
+                    page_cache = PageCache(output_path, self.document_layout)
+                    pages = page_cache.build(
+                        self.__data,
+                        multi_page=not single_pass,
+                        single_pages=split_pages or single_pass,
+                    )
+                    profiler.count("reused_pages", page_cache.reused_pages)
+                else:
+                    pdf.build(self.__data)
+                    pages = pdf.page
+            profiler.count("pages", pages)
+            profiler.count("cached_rows", Event.row_cache.hits)
+            Event.row_cache.store()
+
+            if split_pages and not single_pass and not incremental:
+                with profiler.stage("postprocess"):
+                    pdf_postprocessor = PostProcessor(output_path, workers)
+                    pdf_postprocessor.finalize_print_preparation()
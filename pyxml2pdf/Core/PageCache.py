@@ -0,0 +1,373 @@
+""":py:mod:`Core.PageCache` renders only the pages whose table rows changed"""
+
+__all__ = ["PageCache"]
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Tuple
+
+from PyPDF2.pdf import PdfFileReader, PdfFileWriter
+from reportlab.platypus import Paragraph, Table
+
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.RowCache import RowCache
+from pyxml2pdf.Core.SplittingDocTemplate import SplittingDocTemplate
+
+
+class PageCache:
+    """Keep the pages of the pdf result and render only the changed ones anew
+
+    Every row of the tables is placed on the pages as a separate flowable, so each
+    page contains a contiguous sequence of rows. How many of them fit onto a page
+    only depends on these rows and on the row which did not fit anymore and starts
+    the next page. Each page is thus identified by a hash of the contents of these
+    rows and stored as single page PDF named after that hash in :attr:`folder`.
+
+    On the next build each page, whose rows are unchanged, is taken over from the
+    folder. Starting at the first changed row, the pages are rendered until the
+    remaining rows start a page stored before, from where on the stored pages are
+    used again. Thus the effort is proportional to the number of pages the changed
+    events appear on instead of to the size of the whole feed. Afterwards the
+    multi page PDF is assembled from the single pages and only the rotated single
+    page PDFs of pages, which changed or moved, are written anew.
+
+    The stored pages are only valid for the same fonts, styles, column widths,
+    page layout and :py:mod:`reportlab` version, so all of them are rendered anew,
+    if any of these change. Other builds writing to the same output path in between
+    are not noticed, so stick to incremental builds for one output path.
+
+    :param str output_path: path to pdf file containing result
+    :param Dict document_layout: the page size and margins of the resulting PDF as
+        keyword arguments of :py:class:`reportlab.platypus.SimpleDocTemplate`
+    """
+
+    output_path: str
+    folder: str
+    #: The number of pages rendered during the latest build.
+    rendered_pages: int
+    #: The number of pages taken over from previous builds during the latest build.
+    reused_pages: int
+    _document_layout: Dict
+    _key: str
+    _pages: Dict[str, List[Tuple[int, str]]]
+    _previous_pages: List[str]
+    _row_keys: List[str]
+    _row_indices: Dict[int, int]
+
+    _index_filename = "pages.json"
+    _page_filename = re.compile(r"^[0-9a-f]{64}\.pdf$")
+
+    def __init__(self, output_path, document_layout):
+        self.output_path = output_path
+        self.folder = os.path.splitext(output_path)[0] + "_pages"
+        self.rendered_pages = 0
+        self.reused_pages = 0
+        self._document_layout = document_layout
+        self._key = hashlib.sha256(
+            repr((RowCache._cache_key(), sorted(document_layout.items()))).encode()
+        ).hexdigest()
+        self._load()
+
+    def build(self, flowables, multi_page=True, single_pages=True):
+        """Create the pdf result from the table rows
+
+        :param List[Flowable] flowables: the table rows, each of which is a
+            :py:class:`reportlab.platypus.Table` or a
+            :py:class:`reportlab.platypus.flowables.KeepTogether` containing one
+        :param bool multi_page: if True, the multi page PDF is written, defaults
+            to True
+        :param bool single_pages: if True, the rotated single page PDFs are
+            written, defaults to True
+        :returns: the number of pages
+        :rtype: int
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        self.rendered_pages = 0
+        self.reused_pages = 0
+        self._row_keys = [self._row_key(flowable) for flowable in flowables]
+        self._row_indices = {}
+        for index, flowable in enumerate(flowables):
+            self._row_indices[id(flowable)] = index
+            for content in getattr(flowable, "_content", ()):
+                self._row_indices[id(content)] = index
+
+        pages: List[Tuple[int, int, str]] = []
+        row = 0
+        while row < len(flowables):
+            page = self.find_page(row)
+            if page is None:
+                rendered_pages = self._render(flowables, row)
+                self.rendered_pages += len(rendered_pages)
+                pages.extend(rendered_pages)
+                first_row, number_of_rows, _ = rendered_pages[-1]
+                row = first_row + number_of_rows
+            else:
+                self.reused_pages += 1
+                pages.append((row,) + page)
+                row += page[0]
+
+        page_hashes = [page_hash for _, _, page_hash in pages]
+        if multi_page:
+            self._write_multi_page(page_hashes)
+        if single_pages:
+            self._write_single_pages(page_hashes)
+        self._store(pages)
+        return len(pages)
+
+    def find_page(self, row):
+        """Find a stored page starting with a certain row
+
+        :param int row: the index of the row at the top of the page
+        :returns: the number of rows on the page and its hash or None if there is no
+            such page stored
+        :rtype: Optional[Tuple[int, str]]
+        """
+        for number_of_rows, page_hash in self._pages.get(self._row_keys[row], ()):
+            if (
+                row + number_of_rows <= len(self._row_keys)
+                and self.page_hash(row, row + number_of_rows) == page_hash
+                and os.path.isfile(self.page_path(page_hash))
+            ):
+                return number_of_rows, page_hash
+        return None
+
+    def page_hash(self, start, stop):
+        """Identify a page by its rows and the row which did not fit anymore
+
+        :param int start: the index of the first row on the page
+        :param int stop: the index of the first row on the next page
+        :returns: the hash of the page
+        :rtype: str
+        """
+        keys = [self._key] + self._row_keys[start : stop + 1]
+        if stop == len(self._row_keys):
+            # Mark the last page, since it is followed by no row at all.
+            keys.append("")
+        return hashlib.sha256("\n".join(keys).encode()).hexdigest()
+
+    def page_path(self, page_hash):
+        """Determine the path of the file storing a page
+
+        :param str page_hash: the hash of the page
+        :returns: the path to the single page PDF
+        :rtype: str
+        """
+        return os.path.join(self.folder, page_hash + ".pdf")
+
+    def _render(self, flowables, start):
+        """Render the pages starting with a certain row until a stored page follows
+
+        :param List[Flowable] flowables: all table rows
+        :param int start: the index of the first row to render
+        :returns: the index of the first row, the number of rows and the hash of
+            each rendered page
+        :rtype: List[Tuple[int, int, str]]
+        """
+        renderer = _PageRenderer(self, start, **self._document_layout)
+        try:
+            renderer.build(flowables[start:])
+        except _Resynchronized:
+            pass
+        return renderer.rendered_pages
+
+    def _write_multi_page(self, page_hashes):
+        """Assemble the multi page PDF from the single pages if any page changed
+
+        :param List[str] page_hashes: the hashes of all pages in their order
+        """
+        if page_hashes == self._previous_pages and os.path.isfile(self.output_path):
+            return
+        pdf_writer = PdfFileWriter()
+        for page_hash in page_hashes:
+            pdf_writer.addPage(PdfFileReader(self.page_path(page_hash)).getPage(0))
+        with open(self.output_path, "wb") as pdf_out:
+            pdf_writer.write(pdf_out)
+
+    def _write_single_pages(self, page_hashes):
+        """Write the rotated single page PDFs of all pages changed since last build
+
+        :param List[str] page_hashes: the hashes of all pages in their order
+        """
+        for page_number, page_hash in enumerate(page_hashes, 1):
+            single_page_path = PostProcessor.single_page_path(
+                self.output_path, page_number
+            )
+            if (
+                page_number <= len(self._previous_pages)
+                and self._previous_pages[page_number - 1] == page_hash
+                and os.path.isfile(single_page_path)
+            ):
+                continue
+            page = PdfFileReader(self.page_path(page_hash)).getPage(0)
+            page.rotateClockwise(PostProcessor.rotation)
+            pdf_writer = PdfFileWriter()
+            pdf_writer.addPage(page)
+            with open(single_page_path, "wb") as pdf_out:
+                pdf_writer.write(pdf_out)
+        # Remove the pages the result got shorter by.
+        for page_number in range(len(page_hashes) + 1, len(self._previous_pages) + 1):
+            single_page_path = PostProcessor.single_page_path(
+                self.output_path, page_number
+            )
+            if os.path.isfile(single_page_path):
+                os.remove(single_page_path)
+
+    def _load(self):
+        """Load the index of the stored pages if it is up to date"""
+        self._pages = {}
+        self._previous_pages = []
+        try:
+            with open(os.path.join(self.folder, self._index_filename)) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return
+        if index.get("key") == self._key:
+            self._index_pages(index["pages"])
+
+    def _store(self, pages):
+        """Store the index of the pages and delete the pages not needed anymore
+
+        :param List[Tuple[int, int, str]] pages: the index of the first row, the
+            number of rows and the hash of all pages
+        """
+        index = {
+            "key": self._key,
+            "pages": [
+                [self._row_keys[first_row], number_of_rows, page_hash]
+                for first_row, number_of_rows, page_hash in pages
+            ],
+        }
+        with open(os.path.join(self.folder, self._index_filename), "w") as index_file:
+            json.dump(index, index_file)
+        page_filenames = {page_hash + ".pdf" for _, _, page_hash in pages}
+        for filename in os.listdir(self.folder):
+            if self._page_filename.match(filename) and filename not in page_filenames:
+                os.remove(os.path.join(self.folder, filename))
+        self._index_pages(index["pages"])
+
+    def _index_pages(self, pages):
+        """Make the stored pages searchable by the rows at their tops
+
+        :param List[List[Union[str, int]]] pages: the hash of the first row, the
+            number of rows and the hash of all pages in their order
+        """
+        self._pages = {}
+        for first_row_key, number_of_rows, page_hash in pages:
+            self._pages.setdefault(first_row_key, []).append(
+                (number_of_rows, page_hash)
+            )
+        self._previous_pages = [page_hash for _, _, page_hash in pages]
+
+    @staticmethod
+    def _row_key(flowable):
+        """Identify a table row by everything its appearance depends on
+
+        :param Flowable flowable: the row as a
+            :py:class:`reportlab.platypus.Table` or wrapped into a
+            :py:class:`reportlab.platypus.flowables.KeepTogether`
+        :returns: the hash of the row
+        :rtype: str
+        """
+        descriptions = []
+        for table in getattr(flowable, "_content", [flowable]):
+            if not isinstance(table, Table):
+                # Other flowables cannot be compared, so they are always rendered.
+                descriptions.append("%s at %d" % (table.__class__.__name__, id(table)))
+                continue
+            descriptions.append(
+                repr(
+                    (
+                        table._colWidths,
+                        table._bkgrndcmds,
+                        table._linecmds,
+                        table._spanCmds,
+                        [
+                            [
+                                (
+                                    (cell.style.name, cell.text)
+                                    if isinstance(cell, Paragraph)
+                                    else repr(cell)
+                                )
+                                for cell in row
+                            ]
+                            for row in table._cellvalues
+                        ],
+                        [
+                            [
+                                (
+                                    cell_style.alignment,
+                                    cell_style.valign,
+                                    cell_style.leftPadding,
+                                    cell_style.rightPadding,
+                                    cell_style.topPadding,
+                                    cell_style.bottomPadding,
+                                )
+                                for cell_style in row
+                            ]
+                            for row in table._cellStyles
+                        ],
+                    )
+                )
+            )
+        return hashlib.sha256("\n".join(descriptions).encode()).hexdigest()
+
+
+class _Resynchronized(Exception):
+    """Stop rendering, because all following pages are stored already"""
+
+
+class _PageRenderer(SplittingDocTemplate):
+    """Render table rows into the folder of a page cache one file per page
+
+    The pages are rendered upright and named after their hashes. Rendering stops
+    with :py:class:`_Resynchronized`, as soon as a new page would start with a row
+    beginning a stored page.
+
+    :param PageCache page_cache: the cache to render the pages for
+    :param int start: the index of the first row to render
+    :param kw: the page size and margins of the resulting PDF
+    """
+
+    #: The index of the first row, the number of rows and the hash of the pages.
+    rendered_pages: List[Tuple[int, int, str]]
+    _page_cache: PageCache
+    _first_row: int
+    _next_row: int
+
+    def __init__(self, page_cache, start, **kw):
+        super().__init__(
+            os.path.join(page_cache.folder, "rendering.pdf"), rotation=0, **kw
+        )
+        self._page_cache = page_cache
+        self._first_row = self._next_row = start
+        self.rendered_pages = []
+
+    def afterFlowable(self, flowable):
+        """Remember the row following the row just placed on the page
+
+        :param Flowable flowable: the flowable just placed
+        """
+        index = self._page_cache._row_indices.get(id(flowable))
+        if index is not None:
+            self._next_row = index + 1
+
+    def handle_pageBegin(self):
+        """Start a new page unless it is stored already"""
+        if self.page and self._page_cache.find_page(self._next_row) is not None:
+            raise _Resynchronized
+        super().handle_pageBegin()
+
+    def handle_pageEnd(self):
+        """Save the current page and name its file after the page's hash"""
+        super().handle_pageEnd()
+        page_hash = self._page_cache.page_hash(self._first_row, self._next_row)
+        os.replace(
+            PostProcessor.single_page_path(self.filename, self.page),
+            self._page_cache.page_path(page_hash),
+        )
+        self.rendered_pages.append(
+            (self._first_row, self._next_row - self._first_row, page_hash)
+        )
+        self._first_row = self._next_row
@@ -5,7 +5,7 @@ __all__ = ["Parser"]
 import warnings
 from typing import List
 
-from reportlab.platypus.flowables import KeepTogether
+from reportlab.platypus.flowables import Flowable, KeepTogether
 
 from pyxml2pdf.Core.events import Event
 from pyxml2pdf.model.tables.TableBuilder import TableBuilder
@@ -17,14 +17,20 @@ class Parser:
     :param str properties: path to the properties file
     :param List[KeepTogether] elements: optional cells
         to populate the Parser
+    :param int subtable: optional index of the only subtable to collect the rows
+        of, see :py:class:`model.tables.TableBuilder.TableBuilder`
+    :param bool long_tables: if True, each subtable is collected as one table
+        instead of one table per row, see
+        :py:meth:`model.tables.TableBuilder.TableBuilder.create_long_table`
     """
 
-    _elements: List[KeepTogether]
+    _elements: List[Flowable]
     _table_manager: TableBuilder
 
-    def __init__(self, properties, elements=[]):
+    def __init__(self, properties, elements=[], subtable=None, long_tables=False):
         self._elements = elements
-        self._table_manager = TableBuilder()
+        self._long_tables = long_tables
+        self._table_manager = TableBuilder(subtable, long_tables)
 
     def collect_xml_data(self, events):
         """Traverse the parsed xml data and gather collected event data
@@ -32,22 +38,40 @@ class Parser:
         The collected xml data then is passed to the table_manager and all arranged
         data is return.
 
-        :param List[Event] events: a list of the items from which the texts shall be
-            extracted into a nicely formatted table
+        :param List[Union[Element, Event]] events: a list of the items from which the
+            texts shall be extracted into a nicely formatted table. Items already
+            converted into :py:class:`Core.events.Event` are used as they are.
         :returns: list of all table rows containing the relevant
-            event data
-        :rtype: List[KeepTogether]
+            event data, or of all subtables with *long_tables*
+        :rtype: List[Flowable]
         """
         if events:
+            events = [
+                event if isinstance(event, Event) else Event(event) for event in events
+            ]
+            Event.format_dates(events)
             for event in events:
-                self._table_manager.distribute_event(Event(event))
+                self._table_manager.distribute_event(event)
             subtable_elements = self._table_manager.collect_subtables()
-            self._elements.extend(
-                [
-                    KeepTogether(subtable_element)
-                    for subtable_element in subtable_elements
-                ]
-            )
+            if self._long_tables:
+                # The long tables control themselves where to split.
+                self._elements.extend(subtable_elements)
+            else:
+                self._elements.extend(
+                    [
+                        KeepTogether(subtable_element)
+                        for subtable_element in subtable_elements
+                    ]
+                )
             return self._elements
         else:
             warnings.warn("There were no items to print.", RuntimeWarning)
+
+    @property
+    def rows(self):
+        """Return the number of rows of the subtables collected
+
+        :returns: the number of rows including the titles and column headings
+        :rtype: int
+        """
+        return self._table_manager.rows
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 from PyPDF2.pdf import PageObject, PdfFileReader, PdfFileWriter
 
@@ -10,16 +11,19 @@ class PostProcessor:
     file to automate splitting and rotating.
 
     :param str path:  path to the PDF file which shall be processed
+    :param int workers: number of processes to split the pages in parallel. The
+        default of 1 splits all pages in the current process.
     """
 
     _path: str
-    _directory: str
-    _name: str
+    _workers: int
 
-    def __init__(self, path):
+    #: The clockwise rotation of the single pages in degrees.
+    rotation = -90
+
+    def __init__(self, path, workers=1):
         self._path = path
-        self._directory = os.path.dirname(path)
-        self._name = os.path.splitext(os.path.basename(path))[0]
+        self._workers = workers
 
     def finalize_print_preparation(self):
         """Take the resulting multi page PDF and split into rotated single pages
@@ -28,18 +32,81 @@ class PostProcessor:
         <https://www.blog.pythonlibrary.org/2018/04/11/splitting-and-merging-pdfs
         -with-python/>`_ in combination with `johndcook.com
         <https://www.johndcook.com/blog/2015/05/01/rotating-pdf-pages-with-python/>`_
+
+        If more than one worker is requested, the pages are divided into contiguous
+        ranges, each of which is split by a separate process. The resulting files
+        are identical to the ones produced by a single process.
         """
+        number_of_pages: int = PdfFileReader(self._path).getNumPages()
+        workers = min(self._workers, number_of_pages)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(
+                    executor.map(
+                        self._split_pages,
+                        self._divide_pages(number_of_pages, workers),
+                    )
+                )
+        else:
+            self._split_pages(range(number_of_pages))
+
+        print("Create ", number_of_pages, " single paged PDFs.")
+
+    @staticmethod
+    def _divide_pages(number_of_pages, parts):
+        """Divide all page numbers into contiguous ranges of almost equal length
+
+        :param int number_of_pages: the number of pages to divide
+        :param int parts: the number of ranges to create
+        :returns: the page ranges
+        :rtype: List[range]
+        """
+        boundaries = [number_of_pages * part // parts for part in range(parts + 1)]
+        return [range(start, stop) for start, stop in zip(boundaries, boundaries[1:])]
+
+    def _split_pages(self, page_numbers):
+        """Write the given pages rotated into one single paged PDF each
 
+        :param range page_numbers: the zero-based numbers of the pages to write
+        """
         pdf: PdfFileReader = PdfFileReader(self._path)
-        for page_number in range(pdf.getNumPages()):
+        for page_number in page_numbers:
             pdf_writer: PdfFileWriter = PdfFileWriter()
             page: PageObject = pdf.getPage(page_number)
-            page.rotateCounterClockwise(90)
+            page.rotateClockwise(self.rotation)
             pdf_writer.addPage(page)
-            output_filename: str = "%s_seite_%02d.pdf" % (self._name, page_number + 1)
 
-            pdf_out = open(os.path.join(self._directory, output_filename), "wb")
+            pdf_out = open(self.single_page_path(self._path, page_number + 1), "wb")
             pdf_writer.write(pdf_out)
             pdf_out.close()
 
-        print("Create ", pdf.getNumPages(), " single paged PDFs.")
+    @staticmethod
+    def merge_segments(segment_paths, path):
+        """Merge the PDF segments into one multi page PDF in their order
+
+        :param List[str] segment_paths: the paths to the segments
+        :param str path: path to the multi page PDF to write
+        :returns: the number of pages
+        :rtype: int
+        """
+        pdf_writer = PdfFileWriter()
+        for segment_path in segment_paths:
+            segment = PdfFileReader(segment_path)
+            for page_number in range(segment.getNumPages()):
+                pdf_writer.addPage(segment.getPage(page_number))
+        with open(path, "wb") as pdf_out:
+            pdf_writer.write(pdf_out)
+        return pdf_writer.getNumPages()
+
+    @staticmethod
+    def single_page_path(path, page_number):
+        """Determine the path of the file for one page of a multi page PDF
+
+        :param str path: path to the multi page PDF
+        :param int page_number: the one-based number of the page
+        :returns: the path to the single paged PDF
+        :rtype: str
+        """
+        directory = os.path.dirname(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(directory, "%s_seite_%02d.pdf" % (name, page_number))
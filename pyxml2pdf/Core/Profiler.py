@@ -0,0 +1,122 @@
+""":py:mod:`Core.Profiler` records the performance of the stages of a conversion"""
+
+__all__ = ["Profiler"]
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Optional, Union
+
+
+class Profiler:
+    """Record wall time, CPU time and peak memory of the stages of a conversion
+
+    The profiler is meant to be used as a context manager around the whole
+    conversion. Each stage is measured by wrapping it into :meth:`stage`. Further
+    figures like the number of processed events are added with :meth:`count` and
+    the converted file is described with :meth:`describe_input`. On successful
+    exit the report is written as JSON and/or handed to a callback.
+
+    The peak memory of a stage is the maximum of the memory traced by
+    :py:mod:`tracemalloc` during the stage, including the memory allocated before
+    and still in use. Since tracing slows down the conversion considerably, it is
+    only enabled if a report is requested.
+
+    :param str report_path: optional path of a JSON file to write the report to
+    :param Callable[[Dict], None] hook: optional callback receiving the report
+    """
+
+    _report_path: Optional[str]
+    _hook: Optional[Callable[[Dict], None]]
+    _stages: Dict[str, Dict[str, float]]
+    _counts: Dict[str, int]
+    _input: Dict[str, Union[int, str]]
+    _trace_memory: bool
+    _started_tracing: bool
+
+    def __init__(self, report_path=None, hook=None):
+        self._report_path = report_path
+        self._hook = hook
+        self._stages = {}
+        self._counts = {}
+        self._input = {}
+        self._trace_memory = report_path is not None or hook is not None
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self._trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.finish()
+        finally:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """Measure the stage executed inside the `with` statement
+
+        :param str name: the name of the stage in the report
+        """
+        # Before Python 3.9 the peak covers all stages up to the current one.
+        if self._trace_memory and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            measurements = {
+                "wall_time": time.perf_counter() - wall_start,
+                "cpu_time": time.process_time() - cpu_start,
+            }
+            if self._trace_memory and tracemalloc.is_tracing():
+                measurements["peak_memory"] = tracemalloc.get_traced_memory()[1]
+            self._stages[name] = measurements
+
+    def count(self, name, value):
+        """Add a figure describing the conversion to the report
+
+        :param str name: the name of the figure in the report
+        :param int value: the figure
+        """
+        self._counts[name] = value
+
+    def describe_input(self, path):
+        """Add the path and size of the converted input file to the report
+
+        :param str path: the path to the input file
+        """
+        self._input = {"path": path, "size": os.path.getsize(path)}
+
+    @property
+    def report(self):
+        """Return the measurements and figures recorded so far
+
+        :returns: the report
+        :rtype: Dict
+        """
+        return {
+            "created": datetime.now().isoformat(),
+            "input": self._input,
+            "stages": self._stages,
+            "counts": self._counts,
+        }
+
+    def finish(self):
+        """Write the report to the JSON file and hand it to the callback"""
+        report = self.report
+        if self._report_path is not None:
+            with open(self._report_path, "w") as report_file:
+                json.dump(report, report_file, indent=4)
+        if self._hook is not None:
+            self._hook(report)
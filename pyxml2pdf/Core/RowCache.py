@@ -0,0 +1,186 @@
+""":py:mod:`Core.RowCache` remembers the laid-out table rows across runs"""
+
+__all__ = ["RowCache"]
+
+import hashlib
+import os
+import pickle
+from typing import Dict, List, Optional, Set, Tuple
+
+from pyxml2pdf.PdfVisualisation.FontRegistry import FontRegistry
+from pyxml2pdf.PdfVisualisation.TableStyle import TableStyle
+
+#: The line breaks of a cell's text for one width: the widths of the first and
+#: subsequent lines, the broken lines as computed by :py:mod:`reportlab`, the
+#: resulting height, the width of the longest line, the numbers of split long
+#: words and of hyphenations and the fragments the text was broken from.
+Layout = Tuple[List[float], object, float, float, int, int, list]
+
+
+class RowCache:
+    """Remember the line breaks of the cells of the events' table rows
+
+    Breaking the cells' texts into lines is the most expensive part of building the
+    PDF. Between two downloads of the feed most events do not change, so the broken
+    lines of all cells of a row are stored under a hash of the row's texts and
+    looked up again instead of being computed anew. Within one run this already
+    saves the repeated line breaking, since :py:mod:`reportlab` wraps each cell
+    several times. If `path` is given, the cache is loaded from that file and
+    :meth:`store` writes it back, so subsequent runs only lay out changed events.
+
+    The stored layouts are only valid for the same fonts, paragraph style, column
+    widths and :py:mod:`reportlab` version, so a cache file written for any other
+    configuration is ignored.
+
+    :param str path: optional path of the file to persist the cache in
+    """
+
+    #: The version of the stored layouts, which is raised whenever their structure
+    #: changes, so that cache files of older versions are ignored.
+    layout_version = 3
+
+    path: Optional[str]
+    hits: int
+    _rows: Dict[str, List[Dict[float, Layout]]]
+    _used: Set[str]
+
+    def __init__(self, path=None):
+        self.path = path
+        self.hits = 0
+        self._rows = self._load()
+        self._used = set()
+
+    def cell_layouts(self, texts):
+        """Return the layouts of the cells of a row with the given texts
+
+        :param Sequence[str] texts: the texts of the row's cells
+        :returns: one dictionary per cell mapping the widths the cell was wrapped
+            to onto the resulting layouts, which is filled while the cells are
+            wrapped
+        :rtype: List[Dict[float, Layout]]
+        """
+        key = hashlib.sha256("\x1f".join(texts).encode()).hexdigest()
+        self._used.add(key)
+        try:
+            layouts = self._rows[key]
+        except KeyError:
+            layouts = self._rows[key] = [{} for _ in texts]
+            return layouts
+        self.hits += 1
+        return layouts
+
+    def store(self):
+        """Write the layouts of all rows used in this run to the cache file
+
+        Rows of events which vanished from the feed are dropped, so the file does
+        not grow from run to run. If no rows were laid out at all, the file is kept.
+        """
+        if self.path is None or not self._used:
+            return
+        rows = {key: self._rows[key] for key in self._used}
+        partial_path = self.path + ".part"
+        try:
+            with open(partial_path, "wb") as cache_file:
+                pickle.dump(
+                    (self._cache_key(), rows), cache_file, pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(partial_path, self.path)
+        except (OSError, pickle.PickleError, TypeError, AttributeError):
+            # A cache which cannot be written only costs the time to lay out again.
+            if os.path.isfile(partial_path):
+                os.remove(partial_path)
+
+    def take_used(self):
+        """Hand out the layouts of the rows used since the last call
+
+        Afterwards the used rows and the hits are counted anew. This allows another
+        process to lay out rows and hand their layouts over to :meth:`merge`.
+
+        :returns: the layouts of the used rows by the hashes of their texts and the
+            number of hits
+        :rtype: Tuple[Dict[str, List[Dict[float, Layout]]], int]
+        """
+        rows = {key: self._rows[key] for key in self._used}
+        hits = self.hits
+        self._used = set()
+        self.hits = 0
+        return rows, hits
+
+    def merge(self, rows, hits=0):
+        """Take over the layouts of rows used in another process
+
+        A row's cells might only have been wrapped to some widths in one process
+        and to others in another one, so the layouts are merged cell by cell.
+
+        :param Dict[str, List[Dict[float, Layout]]] rows: the layouts of the rows
+            by the hashes of their texts as returned by :meth:`take_used`
+        :param int hits: the number of hits in the other process
+        """
+        for key, layouts in rows.items():
+            known_layouts = self._rows.setdefault(key, layouts)
+            if known_layouts is not layouts:
+                for known_cell, cell in zip(known_layouts, layouts):
+                    known_cell.update(cell)
+            self._used.add(key)
+        self.hits += hits
+
+    def prune(self):
+        """Forget the layouts of all rows not used since the last call
+
+        A process laying out changing rows again and again, like
+        :py:class:`Core.Watcher.Watcher`, thus only keeps the layouts of the rows
+        of its latest build instead of every layout ever computed.
+        """
+        self._rows = {key: self._rows[key] for key in self._used}
+        self._used = set()
+
+    def release(self):
+        """Forget the layouts of the rows laid out so far unless they are stored
+
+        Without a file to persist the cache in, the layouts are only reused while
+        the same rows are laid out. Releasing them keeps the memory bounded, if the
+        rows are laid out chunk by chunk, as with
+        :py:class:`Core.ChunkedRenderer.ChunkedRenderer`.
+        """
+        if self.path is None:
+            self._rows.clear()
+            self._used.clear()
+
+    def _load(self):
+        """Load the layouts from the cache file if it is up to date
+
+        :returns: the layouts of the rows by the hashes of their texts
+        :rtype: Dict[str, List[Dict[float, Layout]]]
+        """
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, "rb") as cache_file:
+                key, rows = pickle.load(cache_file)
+        except (OSError, pickle.PickleError, AttributeError, EOFError, ValueError):
+            return {}
+        if key != self._cache_key():
+            return {}
+        return rows
+
+    @staticmethod
+    def _cache_key():
+        """Identify the versions of everything the layouts depend on
+
+        :returns: the version of the stored layouts, the reportlab version and font
+            files, the cells' paragraph style and the column widths
+        :rtype: tuple
+        """
+        table_style = TableStyle()
+        style = table_style.custom_styles["Normal"]
+        return (
+            RowCache.layout_version,
+            FontRegistry._cache_key(),
+            tuple(
+                (name, repr(value))
+                for name, value in sorted(vars(style).items())
+                if name != "parent"
+            ),
+            tuple(table_style.column_widths),
+            tuple(table_style.reduced_column_widths),
+        )
@@ -0,0 +1,241 @@
+""":py:mod:`Core.Server` renders PDFs on request in warm worker processes"""
+
+__all__ = ["RenderRequestHandler", "RenderServer", "render"]
+
+import io
+import itertools
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from threading import BoundedSemaphore
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+from xml.etree.ElementTree import ParseError
+
+from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.model.tables.TableBuilder import TableBuilder
+
+
+def render(source, properties_path, pages):
+    """Convert xml input into the multi page PDF or the zipped single page PDFs
+
+    This is a module level function to be executable in a process pool.
+
+    :param Union[bytes, str] source: the xml input itself or the path to it
+    :param str properties_path: path to text file containing properties
+    :param bool pages: if True, the rotated single page PDFs are returned zipped
+        instead of the multi page PDF
+    :returns: the content of the PDF or zip file
+    :rtype: bytes
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = os.path.join(directory, "kursdaten.pdf")
+        Initializer(
+            source, output_path, properties_path, single_pass=pages, split_pages=False
+        )
+        if not pages:
+            with open(output_path, "rb") as pdf_file:
+                return pdf_file.read()
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            for page_number in itertools.count(1):
+                page_path = PostProcessor.single_page_path(output_path, page_number)
+                if not os.path.isfile(page_path):
+                    break
+                zip_file.write(page_path, os.path.basename(page_path))
+        return archive.getvalue()
+
+
+def _warm_up():
+    """Load the fonts and styles in a starting worker process
+
+    This is the initializer of every worker process. Importing this module in the
+    worker already loads :py:mod:`reportlab`, but the fonts are only registered on
+    first use. Building a table builder registers them and builds the styles, so
+    the first request does not wait for that.
+    """
+    TableBuilder()
+
+
+class RenderServer(ThreadingMixIn, HTTPServer):
+    """Serve previews of the pdf result over HTTP
+
+    Requests are answered by :py:class:`RenderRequestHandler` in separate threads,
+    while the conversions run in a pool of worker processes. The workers are
+    started together with the server and stay alive, so no request has to wait for
+    the interpreter, :py:mod:`reportlab`, the fonts and the styles being loaded.
+    At most *workers* conversions run at the same time and at most *pending*
+    further requests wait for a worker. Requests exceeding that are answered with
+    status 503 right away.
+
+    :param Tuple[str, int] address: host and port to listen on
+    :param str properties_path: path to text file containing properties
+    :param int workers: number of worker processes, defaults to 2
+    :param int pending: number of requests waiting for a free worker, defaults to 8
+    :param str input_folder: optional folder whose xml files may be rendered by
+        specifying their path relative to it instead of sending their content
+    :param int max_body_size: the maximum number of bytes of xml input sent with a
+        request. Larger requests are answered with status 413. Defaults to 64 MiB.
+    """
+
+    daemon_threads = True
+
+    properties_path: str
+    input_folder: Optional[str]
+    max_body_size: int
+    _executor: ProcessPoolExecutor
+    _slots: BoundedSemaphore
+
+    def __init__(
+        self,
+        address,
+        properties_path,
+        workers=2,
+        pending=8,
+        input_folder=None,
+        max_body_size=64 * 1024 * 1024,
+    ):
+        super().__init__(address, RenderRequestHandler)
+        self.properties_path = properties_path
+        self.input_folder = (
+            os.path.realpath(input_folder) if input_folder is not None else None
+        )
+        self.max_body_size = max_body_size
+        self._slots = BoundedSemaphore(workers + pending)
+        # Every process warms itself up when it starts, also if it replaces one.
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up)
+        # Start the processes right away instead of on the first requests.
+        for future in [self._executor.submit(os.getpid) for _ in range(workers)]:
+            future.result()
+
+    def render(self, source, pages):
+        """Convert xml input in one of the worker processes
+
+        :param Union[bytes, str] source: the xml input itself or the path to it
+        :param bool pages: if True, the zipped single page PDFs are returned
+        :returns: the content of the PDF or zip file or None if the server is busy
+        :rtype: Optional[bytes]
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            return self._executor.submit(
+                render, source, self.properties_path, pages
+            ).result()
+        finally:
+            self._slots.release()
+
+    def resolve(self, path):
+        """Find a file in the input folder
+
+        :param str path: the path relative to the input folder
+        :returns: the absolute path or None if it is outside the input folder
+        :rtype: Optional[str]
+        """
+        if self.input_folder is None:
+            return None
+        resolved_path = os.path.realpath(os.path.join(self.input_folder, path))
+        if os.path.commonpath([resolved_path, self.input_folder]) != self.input_folder:
+            return None
+        return resolved_path
+
+    def server_close(self):
+        """Stop listening and shut the worker processes down"""
+        super().server_close()
+        self._executor.shutdown()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Answer requests for previews of the pdf result
+
+    The path of a request selects the format of the result. */pdf* returns the
+    multi page PDF and */pages* returns a zip file containing the rotated single
+    page PDFs. The xml input is either sent as body of a *POST* request or
+    specified with the query parameter *path* relative to the server's input
+    folder, as in ``GET /pages?path=kursdaten.xml``.
+    """
+
+    server: RenderServer
+
+    #: The content types of the results by the paths selecting them.
+    formats = {"/pdf": "application/pdf", "/pages": "application/zip"}
+
+    def do_GET(self):
+        self._respond(None)
+
+    def do_POST(self):
+        if "Content-Length" not in self.headers:
+            self.send_error(411, "Send the xml input with its Content-Length.")
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_error(400, "The Content-Length is invalid.")
+            return
+        if length > self.server.max_body_size:
+            self.send_error(
+                413,
+                "The xml input may not exceed %d bytes." % self.server.max_body_size,
+            )
+            return
+        self._respond(self.rfile.read(length))
+
+    def _respond(self, body):
+        """Render the requested result and send it
+
+        :param Optional[bytes] body: the xml input, if it was sent
+        """
+        url = urlsplit(self.path)
+        if url.path not in self.formats:
+            self.send_error(404, "Request either /pdf or /pages.")
+            return
+        source, error = self._find_source(body, parse_qs(url.query).get("path"))
+        if error is not None:
+            self.send_error(*error)
+            return
+        try:
+            result = self.server.render(source, url.path == "/pages")
+        except ParseError as parse_error:
+            self.send_error(400, "The xml input is invalid: %s" % parse_error)
+            return
+        except Exception as exception:
+            # The details might reveal paths and internals, so they are only logged.
+            self.log_error("The conversion failed: %r", exception)
+            self.send_error(500, "The conversion failed.")
+            return
+        if result is None:
+            self.send_error(503, "All workers are busy. Try again later.")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", self.formats[url.path])
+        self.send_header("Content-Length", str(len(result)))
+        self.end_headers()
+        self.wfile.write(result)
+
+    def _find_source(self, body, paths):
+        """Determine the xml input from the request
+
+        :param Optional[bytes] body: the request's body
+        :param Optional[List[str]] paths: the values of the query parameter *path*
+        :returns: the xml input itself or its path and None or None and the status
+            and message of the error to respond with
+        :rtype: Tuple[Union[bytes, str, None], Optional[Tuple[int, str]]]
+        """
+        if paths:
+            path = self.server.resolve(paths[0])
+            if path is None:
+                return None, (403, "The path is outside the input folder.")
+            if not os.path.isfile(path):
+                return None, (404, "There is no such xml file.")
+            return path, None
+        if not body:
+            return None, (400, "Send the xml input or specify its path.")
+        return body, None
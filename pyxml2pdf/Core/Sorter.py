@@ -1,32 +1,102 @@
+import re
+from calendar import monthrange
+from datetime import datetime
+from typing import Tuple
+
+
 class Sorter:
     """Provides a method to sort from xml extracted data by a tag containing a date
 
     We took `effbot.org <http://effbot.org/zone/element-sort.htm>`_ and adapted the
     code to our needs of sorting a list of :py:class:`xml.etree.ElementTree.Element`
     by the texts of one of their tags containing a string representation of a date.
+    Everything providing a method `findtext` like
+    :py:class:`xml.etree.ElementTree.Element` can be sorted, especially
+    :py:class:`Core.events.Event`.
 
     :param List[xml.etree.ElementTree.Element] courses: events that where extracted
         from an xml source
     """
 
+    #: The format of the dates to sort by.
+    date_format = "%d.%m.%Y %H:%M"
+    #: The sort key for courses without a date, which moves them to the end.
+    _missing_date = (2099, 1, 1, 0, 0)
+    #: Dates which can be converted by slicing, with ASCII digits only.
+    _fixed_date = re.compile(r"[0-9]{2}\.[0-9]{2}\.[0-9]{4} [0-9]{2}:[0-9]{2}")
+
     def __init__(self, courses):
         self._courses = courses
 
-    def sort_parsed_xml(self, sort_key):
+    def sort_parsed_xml(self, sort_key, *secondary_keys):
         """Sort a list of :py:class:`xml.etree.ElementTree.Element` by their date
 
         Taken from `effbot.org <http://effbot.org/zone/element-sort.htm>`_ and adapted.
+        The list is sorted in place and only if it is not sorted already. The sort
+        is skipped only for completely sorted courses. Mostly sorted courses are
+        still sorted, which :py:func:`sorted` does in close to linear time for
+        long runs of sorted courses. Courses with the same date keep their order,
+        unless further tags are specified to sort by.
 
         :param str sort_key: the xml tag which contains the data
+        :param str secondary_keys: further xml tags whose texts decide the order of
+            courses with equal values for all preceding tags
+        :returns: the sorted courses
+        :rtype: List[xml.etree.ElementTree.Element]
         """
-        from datetime import datetime
 
         def get_key(course):
-            _key = course.findtext(sort_key)
-            if _key:
-                return datetime.strptime(_key, "%d.%m.%Y %H:%M")
-            else:
-                return datetime.strptime("01.01.2099 00:00", "%d.%m.%Y %H:%M")
-
-        self._courses[:] = sorted(self._courses, key=get_key)
-        return self._courses[:]
+            key = self._parse_date(course.findtext(sort_key))
+            if secondary_keys:
+                key = (key,) + tuple(
+                    course.findtext(secondary_key) or ""
+                    for secondary_key in secondary_keys
+                )
+            return key
+
+        keys = [get_key(course) for course in self._courses]
+        if any(keys[index] > keys[index + 1] for index in range(len(keys) - 1)):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._courses[:] = [self._courses[index] for index in order]
+        return self._courses
+
+    @classmethod
+    def _parse_date(cls, text) -> Tuple[int, int, int, int, int]:
+        """Convert a string representation of a date into a sortable tuple
+
+        Dates in the expected format of fixed length with ASCII digits only are
+        converted by slicing. All other dates, like those with signs or spaces
+        instead of leading zeros, are parsed with
+        :py:func:`datetime.datetime.strptime`, so both ways accept the same dates
+        and dates which do not exist raise a :py:exc:`ValueError` on both ways.
+
+        :param str text: the date in the format *dd.mm.yyyy HH:MM* or an empty
+            string or None if the date is missing
+        :returns: year, month, day, hour and minute
+        """
+        if not text:
+            return cls._missing_date
+        if cls._fixed_date.fullmatch(text):
+            year, month, day, hour, minute = date = (
+                int(text[6:10]),
+                int(text[3:5]),
+                int(text[:2]),
+                int(text[11:13]),
+                int(text[14:]),
+            )
+            if (
+                year > 0
+                and 0 < month <= 12
+                and 0 < day <= monthrange(year, month)[1]
+                and 0 <= hour < 24
+                and 0 <= minute < 60
+            ):
+                return date
+        parsed_date = datetime.strptime(text, cls.date_format)
+        return (
+            parsed_date.year,
+            parsed_date.month,
+            parsed_date.day,
+            parsed_date.hour,
+            parsed_date.minute,
+        )
@@ -0,0 +1,95 @@
+""":py:mod:`Core.SplittingDocTemplate` renders every page into its own PDF file"""
+
+__all__ = ["SplittingDocTemplate"]
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate
+
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+
+
+class SplittingDocTemplate(SimpleDocTemplate):
+    """A document template writing each page to a separate, rotated PDF file
+
+    This produces the same single paged files as
+    :py:meth:`Core.PostProcessor.PostProcessor.finalize_print_preparation` but
+    while the document is built. Each page is drawn on a canvas of its own, which
+    is saved as soon as the page is finished. Thus the multi page PDF is neither
+    written nor read back to be split. The page files are named after the
+    `filename` of the document, which itself is not created.
+
+    :param str filename: path of the multi page PDF the single pages belong to
+    :param kw: all other keyword arguments of
+        :py:class:`reportlab.platypus.SimpleDocTemplate`
+    """
+
+    def __init__(self, filename, **kw):
+        kw.setdefault("rotation", PostProcessor.rotation)
+        super().__init__(filename, **kw)
+        # The canvas of the last page is already saved at the end of the build.
+        self._doSave = 0
+        self._canvas_saved = False
+
+    def _startBuild(self, filename=None, canvasmaker=Canvas):
+        """Prepare the build of the document starting with the first page's canvas
+
+        :param str filename: ignored, since the filenames are determined by the pages
+        :param canvasmaker: the class of the canvases to create
+        """
+        self.page = 0
+        super()._startBuild(filename, canvasmaker)
+
+    def _makeCanvas(self, filename=None, canvasmaker=Canvas):
+        """Create the canvas for the upcoming page
+
+        :param str filename: ignored, since the filename is determined by the page
+        :param canvasmaker: the class of the canvas to create
+        :returns: the canvas for the next page
+        :rtype: reportlab.pdfgen.canvas.Canvas
+        """
+        page_number = self.page + 1
+        # Keep the sequencer, which is reset for each new canvas by reportlab,
+        # so numbering continues across the pages of one build.
+        sequencer = self.seq if self.page else None
+        canv = super()._makeCanvas(
+            filename=PostProcessor.single_page_path(self.filename, page_number),
+            canvasmaker=canvasmaker,
+        )
+        if sequencer is not None:
+            self.seq = sequencer
+        canv._pageNumber = page_number
+        self._canvas_saved = False
+        return canv
+
+    def handle_pageBegin(self):
+        """Switch to a new canvas, if the current one contains a finished page"""
+        if self._canvas_saved:
+            canvasmaker = self.canv.__class__
+            self.canv = self._makeCanvas(canvasmaker=canvasmaker)
+            self.canv._doctemplate = self
+        super().handle_pageBegin()
+
+    def handle_pageEnd(self):
+        """Show the current page and save it into its own file"""
+        super().handle_pageEnd()
+        if self.saves_canvas():
+            self.canv.save()
+            self._canvas_saved = True
+
+    def saves_canvas(self):
+        """Decide whether the canvas is saved after the page just finished
+
+        Subclasses may keep drawing several pages on one canvas, which is saved at
+        the end of the build at the latest.
+
+        :returns: True, so that every page is saved into its own file
+        :rtype: bool
+        """
+        return True
+
+    def _endBuild(self):
+        """Finish the last page and save the canvas if it is not saved yet"""
+        super()._endBuild()
+        if not self._canvas_saved:
+            self.canv.save()
+            self._canvas_saved = True
@@ -0,0 +1,56 @@
+""":py:mod:`Core.Streamer` provides a memory-friendly iteration over xml elements"""
+
+__all__ = ["Streamer"]
+
+from typing import Iterator
+from xml.etree.ElementTree import Element
+
+from defusedxml.ElementTree import iterparse
+
+
+class Streamer:
+    """Iterate one at a time over the root's children with a certain tag
+
+    Just like :py:meth:`xml.etree.ElementTree.Element.findall` on the root, only
+    direct children of the root are considered, while elements with the tag nested
+    deeper stay part of their ancestors. Instead of parsing the whole xml source
+    into one tree, the elements are yielded as soon as their closing tag is parsed.
+    As soon as the consumer resumes the iteration, the previously yielded element is
+    cleared and detached from the tree, so that only the element currently
+    processed is held in memory. The parsing is performed by
+    :py:func:`defusedxml.ElementTree.iterparse` to stay as safe as with
+    :py:func:`defusedxml.ElementTree.parse`.
+
+    :param source: path to or file object of the xml input
+    :param str tag: the tag of the elements to iterate over, defaults to *kurs*
+    """
+
+    _source: str
+    _tag: str
+
+    def __init__(self, source, tag="kurs"):
+        self._source = source
+        self._tag = tag
+
+    def __iter__(self) -> Iterator[Element]:
+        """Yield the root's children with the specified tag in order of appearance
+
+        :returns: the root's children with the specified tag
+        :rtype: Iterator[xml.etree.ElementTree.Element]
+        """
+        root = None
+        depth = 0
+        for xml_event, element in iterparse(self._source, events=("start", "end")):
+            if xml_event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                if element.tag == self._tag:
+                    yield element
+                # Free the child's subtree and the root's reference to it, no
+                # matter if it was yielded or not.
+                element.clear()
+                root.clear()
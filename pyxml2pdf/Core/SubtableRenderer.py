@@ -0,0 +1,122 @@
+""":py:mod:`Core.SubtableRenderer` lays the subtables out in parallel processes"""
+
+__all__ = ["SubtableRenderer", "render_subtable"]
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+from reportlab.platypus import SimpleDocTemplate
+
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.Parser import Parser
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.model.tables.TableBuilder import TableBuilder
+
+
+def render_subtable(events, subtable, segment_path, document_layout):
+    """Lay one subtable out into a PDF file of its own
+
+    This is a module level function to be executable in a process pool.
+
+    :param List[Core.events.Event] events: the events in the order of the
+        document, at least all events routed to the subtable, see
+        :py:meth:`model.tables.TableBuilder.TableBuilder.route_events`
+    :param int subtable: the index of the subtable to lay out
+    :param str segment_path: path to the PDF file to write
+    :param Dict document_layout: the page size and margins of the resulting PDF
+    :returns: the number of pages and the number of rows laid out
+    :rtype: Tuple[int, int]
+    """
+    # The events might have been distributed to another subtable in this process.
+    for event in events:
+        event.reset_table_rows()
+    flowables = Parser(None, [], subtable).collect_xml_data(events) or []
+    rows = len(flowables)
+    pdf = SimpleDocTemplate(segment_path, **document_layout)
+    pdf.build(flowables)
+    return pdf.page, rows
+
+
+def _render_subtable_in_worker(hand_back, *arguments):
+    """Lay one subtable out in a worker process and count the rows found cached
+
+    :param bool hand_back: if True, the layouts of the rows laid out are handed
+        back as well, otherwise they are dropped
+    :param arguments: the arguments of :py:func:`render_subtable`
+    :returns: the number of pages and rows, the layouts of the rows laid out and
+        the number of rows found in the row cache, see
+        :py:meth:`Core.RowCache.RowCache.take_used`
+    :rtype: Tuple[int, int, Dict[str, List[Dict[float, Core.RowCache.Layout]]], int]
+    """
+    pages_and_rows = render_subtable(*arguments)
+    layouts, hits = Event.row_cache.take_used()
+    return pages_and_rows + (layouts if hand_back else {}, hits)
+
+
+class SubtableRenderer:
+    """Lay each subtable out separately and merge the results in their order
+
+    Which rows a subtable contains only depends on the events, but not on the
+    other subtables. Each subtable is thus laid out into a PDF segment of its own
+    starting on a new page, so that up to *workers* subtables are laid out at the
+    same time in separate processes. The segments are merged into the multi page
+    PDF in the order of the subtables, so the pages are numbered continuously
+    throughout the document and the single page PDFs split from it follow this
+    numbering.
+
+    :param str output_path: path to pdf file containing result
+    :param Dict document_layout: the page size and margins of the resulting PDF as
+        keyword arguments of :py:class:`reportlab.platypus.SimpleDocTemplate`
+    :param int workers: number of processes to lay the subtables out, defaults to 1
+    """
+
+    output_path: str
+    #: The number of rows laid out during the latest build.
+    rows: int
+    _document_layout: Dict
+    _workers: int
+
+    def __init__(self, output_path, document_layout, workers=1):
+        self.output_path = output_path
+        self.rows = 0
+        self._document_layout = document_layout
+        self._workers = workers
+
+    def build(self, events):
+        """Lay out all subtables and write the multi page PDF
+
+        :param List[Core.events.Event] events: the events in the order of the
+            document
+        :returns: the number of pages
+        :rtype: int
+        """
+        # Each subtable gets only its events, so no process receives all of them.
+        routes = TableBuilder().route_events(events)
+        number_of_subtables = len(routes)
+        with tempfile.TemporaryDirectory() as directory:
+            segment_paths = [
+                os.path.join(directory, "segment_%02d.pdf" % subtable)
+                for subtable in range(number_of_subtables)
+            ]
+            arguments = (
+                routes,
+                range(number_of_subtables),
+                segment_paths,
+                [self._document_layout] * number_of_subtables,
+            )
+            workers = min(self._workers, number_of_subtables)
+            if workers > 1:
+                # Only a persisted row cache needs the line breaks of the workers.
+                hand_back = [Event.row_cache.path is not None] * number_of_subtables
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(
+                        executor.map(_render_subtable_in_worker, hand_back, *arguments)
+                    )
+                for _, _, layouts, hits in results:
+                    Event.row_cache.merge(layouts, hits)
+            else:
+                results = list(map(render_subtable, *arguments))
+            self.rows = sum(result[1] for result in results)
+            return PostProcessor.merge_segments(segment_paths, self.output_path)
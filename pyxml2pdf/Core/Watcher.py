@@ -0,0 +1,224 @@
+""":py:mod:`Core.Watcher` rebuilds the pdf result whenever its inputs change"""
+
+__all__ = ["Watcher"]
+
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from reportlab.platypus import SimpleDocTemplate
+from reportlab.platypus.flowables import KeepTogether
+
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.Parser import Parser
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.Profiler import Profiler
+from pyxml2pdf.Core.RowCache import RowCache
+from pyxml2pdf.Core.Sorter import Sorter
+from pyxml2pdf.Core.SplittingDocTemplate import SplittingDocTemplate
+from pyxml2pdf.Core.Streamer import Streamer
+
+
+class Watcher:
+    """Keep the pdf result up to date with the xml input
+
+    The watcher stays alive between the builds, so the interpreter, the fonts, the
+    styles and the parsed events are kept in memory. Whenever the xml input
+    changed, it is parsed again, but all events whose xml data did not change are
+    reused and the line breaks of their table rows are taken from the row cache, so
+    only new and edited events are laid out from scratch. The document is then
+    built and post-processed again.
+
+    Changes are detected by polling the modification time and size of the xml
+    input. The properties file is not watched, since the subtables and their
+    categories do not depend on it yet.
+
+    :param str input_path: path to input xml-file
+    :param str output_path: path to pdf file containing result
+    :param str properties_path: path to text file containing properties
+    :param float interval: seconds to wait in between two checks for changes
+    :param int workers: number of processes to split the resulting PDF into single
+        pages, defaults to 1
+    :param bool single_pass: if True, the rotated single page PDFs are written
+        directly while the document is built and the multi page PDF is omitted,
+        defaults to False
+    :param str row_cache_path: optional path of a file to keep the line breaks of
+        the table rows in across runs, see :py:class:`Core.RowCache.RowCache`. Only
+        the line breaks of the latest build's rows are kept in memory and the file.
+    :param str report_path: optional path of a JSON file to write the measurements
+        of the latest build to, see :py:class:`Core.Profiler.Profiler`
+    """
+
+    _events: Dict[Tuple[Tuple[str, Optional[str]], ...], List[Event]]
+    _sorted_events: List[Event]
+    _input_signature: Optional[Tuple[int, int]]
+    _row_cache: RowCache
+    #: The number of events taken over from the previous build.
+    reused_events: int
+
+    def __init__(
+        self,
+        input_path,
+        output_path,
+        properties_path,
+        interval=1.0,
+        workers=1,
+        single_pass=False,
+        row_cache_path=None,
+        report_path=None,
+    ):
+        self._input_path = input_path
+        self._output_path = output_path
+        self._properties_path = properties_path
+        self._interval = interval
+        self._workers = workers
+        self._single_pass = single_pass
+        self._report_path = report_path
+        self._events = {}
+        self._sorted_events = []
+        self._input_signature = None
+        self._row_cache = RowCache(row_cache_path)
+        self.reused_events = 0
+
+    def watch(self, builds=None):
+        """Build the pdf result and rebuild it on every change of the inputs
+
+        :param int builds: optional number of builds after which to stop watching,
+            by default the watcher runs until it is interrupted
+        """
+        print("Watching " + self._input_path)
+        try:
+            while builds is None or builds > 0:
+                if self.rebuild():
+                    if builds is not None:
+                        builds -= 1
+                else:
+                    time.sleep(self._interval)
+        except KeyboardInterrupt:
+            pass
+
+    def rebuild(self):
+        """Rebuild the pdf result if the xml input changed since the last call
+
+        :returns: True if the pdf result was rebuilt, False if nothing changed or
+            the rebuild failed. If the xml input could not be read, parsed or
+            sorted, for instance because it was still being written or was replaced
+            by an editor, it is read again on the next call. If the rebuild failed
+            afterwards, it is tried again once the xml input changed. No report is
+            written for failed rebuilds.
+        :rtype: bool
+        """
+        input_signature = self._signature(self._input_path)
+        if input_signature == self._input_signature:
+            return False
+        start = time.perf_counter()
+        self.reused_events = 0
+        input_read = False
+        try:
+            with Profiler(self._report_path) as profiler:
+                with profiler.stage("parse"):
+                    events = self._parse()
+                with profiler.stage("sort"):
+                    self._sorted_events = Sorter(events).sort_parsed_xml(
+                        "TerminDatumVon1"
+                    )
+                input_read = True
+                profiler.count("events", len(self._sorted_events))
+                profiler.count("reused_events", self.reused_events)
+                self._build(profiler)
+        except Exception as error:
+            if not input_read:
+                print("Could not read " + self._input_path + ": " + str(error))
+                return False
+            # The same input would fail again, so it is kept until it changes.
+            self._input_signature = input_signature
+            print("Could not rebuild " + self._output_path + ": " + str(error))
+            return False
+        self._input_signature = input_signature
+        print(
+            "Rebuilt %s in %.2fs reusing %d of %d events."
+            % (
+                self._output_path,
+                time.perf_counter() - start,
+                self.reused_events,
+                len(self._sorted_events),
+            )
+        )
+        return True
+
+    def _parse(self):
+        """Parse the xml input and reuse the events whose xml data did not change
+
+        The events of the previous build are only replaced once the whole input is
+        parsed, so they are still reused after an attempt to parse an incomplete
+        input.
+
+        :returns: the events in the order of the xml input
+        :rtype: List[Core.events.Event]
+        """
+        events = []
+        previous_events = {key: list(value) for key, value in self._events.items()}
+        current_events: Dict[Tuple[Tuple[str, Optional[str]], ...], List[Event]] = {}
+        reused_events = 0
+        for element in Streamer(self._input_path):
+            key = tuple((child.tag, child.text) for child in element)
+            candidates = previous_events.get(key)
+            if candidates:
+                event = candidates.pop()
+                reused_events += 1
+            else:
+                event = Event(element)
+            current_events.setdefault(key, []).append(event)
+            events.append(event)
+        self._events = current_events
+        self.reused_events = reused_events
+        return events
+
+    def _build(self, profiler):
+        """Distribute the events to the subtables, build and post-process the pdf
+
+        :param Core.Profiler.Profiler profiler: the profiler measuring the stages
+        """
+        elements: List[KeepTogether] = []
+        Event.row_cache = self._row_cache
+        self._row_cache.hits = 0
+        with profiler.stage("setup"):
+            parser = Parser(self._properties_path, elements)
+            doc_template = (
+                SplittingDocTemplate if self._single_pass else SimpleDocTemplate
+            )
+            pdf = doc_template(self._output_path, **Initializer.document_layout)
+        with profiler.stage("collect"):
+            for event in self._sorted_events:
+                # The rows are built anew, so the cache learns which are in use.
+                event.release_table_rows()
+                event.reset_table_rows()
+            parser.collect_xml_data(self._sorted_events)
+        profiler.count("rows", len(elements))
+        with profiler.stage("build"):
+            pdf.build(elements)
+        profiler.count("pages", pdf.page)
+        profiler.count("cached_rows", self._row_cache.hits)
+        self._row_cache.store()
+        self._row_cache.prune()
+        if not self._single_pass:
+            with profiler.stage("postprocess"):
+                PostProcessor(
+                    self._output_path, self._workers
+                ).finalize_print_preparation()
+
+    @staticmethod
+    def _signature(path):
+        """Return what identifies the current version of a file
+
+        :param str path: the path of the file
+        :returns: the modification time in nanoseconds and the size or None if the
+            file does not exist
+        :rtype: Optional[Tuple[int, int]]
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -1,23 +1,30 @@
 """Module to provide a wrapper :py:class:`Core.events.Event` for xml extracted data"""
 import re
-from typing import List, Match
-from xml.etree.ElementTree import Element
+import sys
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Match, Optional, Tuple
 
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import Paragraph, Table
 
+from pyxml2pdf.Core.RowCache import Layout, RowCache
 from pyxml2pdf.model.tables.TableBuilder import TableBuilder
 from pyxml2pdf.PdfVisualisation.TableStyle import TableStyle
 
 __all__ = ["Event"]
 
 
-class Event(Element):
-    """A wrapper class for :py:class:`xml.etree.ElementTree.Element`
+class Event:
+    """A compact record of the data of one event extracted from the xml input
 
-    :py:class:`xml.etree.ElementTree.Element` is augmented with the table row
-    representation and the attributes and methods to manipulate everything
-    according to the final tables needs. A :py:class:`Core.events.Event` can only
-    be initialized with an object of type :py:class:`xml.etree.ElementTree.Element`.
+    The texts of all children tags of an :py:class:`xml.etree.ElementTree.Element`
+    which are needed for the table are extracted in one pass and stored in one
+    tuple. Texts which usually repeat throughout the events, like places, leaders
+    and target groups, are interned so that all events share the same string
+    objects. The record is augmented with the table row representation and the
+    attributes and methods to manipulate everything according to the final tables
+    needs. A :py:class:`Core.events.Event` can only be initialized with an object
+    of type :py:class:`xml.etree.ElementTree.Element`.
 
     :param xml.etree.ElementTree.Element element: the element to build the instance from
     """
@@ -26,41 +33,232 @@ class Event(Element):
         """A wrapper class for :py:class:`reportlab.platypus.Paragraph`
 
         :py:class:`reportlab.platypus.Paragraph` is solely used with one
-        certain style, which is handed over in the constructor.
+        certain style, which is handed over in the constructor. Many cells repeat
+        throughout the events, like the leaders, places, target groups and the
+        default prerequisites, so the markup of each text is parsed only once and
+        the resulting fragments are shared by all paragraphs with the same text.
+        The lines the text is broken into are stored in `layouts` for each width
+        the paragraph is wrapped to, so they are computed only once per width and,
+        with a persistent :py:class:`Core.RowCache.RowCache`, only once for all
+        runs. A paragraph wrapped to a stored width gets all attributes
+        :py:meth:`reportlab.platypus.Paragraph.breakLines` would have set,
+        including the fragments it replaces for texts with markup, but the broken
+        lines themselves are shared by all paragraphs with the same text.
+        This relies on :py:mod:`reportlab` not changing them while drawing, which
+        it only does for right-to-left texts.
 
         :param str text: the text to write into row
+        :param Dict[float, Layout] layouts: optional storage for the line breaks
+            of the text
         """
 
-        def __init__(self, text: str):
-            super().__init__(text, self.style)
+        #: The style of all paragraphs, which is looked up on first use, since
+        #: this registers the fonts.
+        style: Optional[ParagraphStyle] = None
+        _layouts: Dict[float, Layout]
 
-    _table_builder: TableBuilder = TableBuilder()
+        def __init__(self, text: str, layouts=None):
+            text, style, frags = self._parse(text, self._get_style())
+            super().__init__(text, style, frags=frags)
+            self._layouts = {} if layouts is None else layouts
+
+        @classmethod
+        def _get_style(cls):
+            """Return the style of the paragraphs and look it up on the first call
+
+            :returns: the style of the table cells
+            :rtype: ParagraphStyle
+            """
+            if cls.style is None:
+                cls.style = TableStyle().custom_styles["Normal"]
+            return cls.style
+
+        def wrap(self, availWidth, availHeight):
+            """Break the text into lines fitting into the available width
+
+            :param float availWidth: the width available for the paragraph
+            :param float availHeight: the height available for the paragraph
+            :returns: the width and height the paragraph takes up
+            :rtype: Tuple[float, float]
+            """
+            try:
+                (
+                    self._wrapWidths,
+                    self.blPara,
+                    self.height,
+                    self._width_max,
+                    self._splitLongWordCount,
+                    self._hyphenations,
+                    self.frags,
+                ) = self._layouts[availWidth]
+            except KeyError:
+                width, height = super().wrap(availWidth, availHeight)
+                # Reportlab does not break any lines for widths too small to fit.
+                if width:
+                    self._layouts[availWidth] = (
+                        self._wrapWidths,
+                        self.blPara,
+                        height,
+                        self._width_max,
+                        self._splitLongWordCount,
+                        self._hyphenations,
+                        self.frags,
+                    )
+                return width, height
+            self.width = availWidth
+            return self.width, self.height
+
+        @staticmethod
+        @lru_cache(maxsize=4096)
+        def _parse(text, style):
+            """Parse the markup of a text in a certain style
+
+            Reportlab never modifies the fragments after parsing, so they can be
+            shared by several paragraphs.
+
+            :param str text: the text to parse
+            :param ParagraphStyle style: the style of the paragraph
+            :returns: the cleaned text, the style and the fragments
+            :rtype: Tuple[str, ParagraphStyle, List[ParaFrag]]
+            """
+            paragraph = Paragraph(text, style)
+            return paragraph.text, paragraph.style, paragraph.frags
+
+    __slots__ = (
+        "_texts",
+        "_categories",
+        "_date",
+        "_responsible",
+        "_description",
+        "_full_row",
+        "_full_columns",
+        "_full_subtable",
+        "_reduced_row",
+        "_reduced_columns",
+    )
+
+    #: The table builder for the rows, which is created on first use, since this
+    #: registers the fonts.
+    _table_builder: Optional[TableBuilder] = None
     _table_style: TableStyle = TableStyle()
+    #: The storage for the line breaks of the rows' cells, which
+    #: :py:class:`Core.Initializer.Initializer` replaces for each run.
+    row_cache: RowCache = RowCache()
+
+    #: The tags of all children whose texts are extracted in this order.
+    fields: Tuple[str, ...] = (
+        "Kursnummer",
+        "Kursart",
+        "Kategorie",
+        "Bezeichnung",
+        "Bezeichnung2",
+        "Beschreibung",
+        "TrainerURL",
+        "TerminDatumVon1",
+        "TerminDatumBis1",
+        "TerminDatumVon2",
+        "TerminDatumBis2",
+        "TerminDatumVon3",
+        "TerminDatumBis3",
+        "Ort1",
+        "Kursleiter",
+        "Zielgruppe",
+        "Voraussetzung",
+        "Ausruestung",
+        "Kurskosten",
+        "Leistungen",
+    )
+    _field_indices: Dict[str, int] = {tag: index for index, tag in enumerate(fields)}
+    #: The position of the date tags, which are stored contiguously.
+    _dates_slice: slice = slice(
+        _field_indices["TerminDatumVon1"], _field_indices["TerminDatumBis3"] + 1
+    )
+    #: The tags whose texts are likely to repeat throughout the events.
+    _interned_fields: FrozenSet[str] = frozenset(
+        (
+            "Kursart",
+            "Kategorie",
+            "TerminDatumVon1",
+            "TerminDatumBis1",
+            "TerminDatumVon2",
+            "TerminDatumBis2",
+            "TerminDatumVon3",
+            "TerminDatumBis3",
+            "Ort1",
+            "Kursleiter",
+            "Zielgruppe",
+            "Voraussetzung",
+            "Ausruestung",
+            "Kurskosten",
+            "Leistungen",
+        )
+    )
 
+    _texts: Tuple[Optional[str], ...]
     _categories: List[str]
     _full_row: Table
+    _full_columns: List[EventParagraph]
+    _full_subtable: Optional[str]
     _reduced_row: Table
     _date: str
     _responsible: str
+    _description: Optional[str]
     _reduced_columns: List[EventParagraph]
 
     def __init__(self, element):
-        # Call Element constructor and extend ourselves by extending all children
-        # tags to create an underlying copy of element.
-        super().__init__(element.tag, element.attrib)
-        self.extend(list(element))
-        # Initialize needed objects especially for table creation.
-        self.EventParagraph.style = self._table_style.custom_styles["Normal"]
-        # Initialize definitely needed instance variables.
+        # Extract the texts of all needed children tags in one pass.
+        texts: List[Optional[str]] = [None] * len(self.fields)
+        for child in element:
+            index = self._field_indices.get(child.tag)
+            # Like findtext the first of several equal tags counts.
+            if index is not None and texts[index] is None:
+                text = child.text or ""
+                if child.tag in self._interned_fields:
+                    text = sys.intern(text)
+                texts[index] = text
+        self._texts = tuple(texts)
+        self._description = None
+        self._full_subtable = None
+        # Initialize definitely needed instance variables. The table rows are only
+        # built on demand, after the event was distributed to its subtables.
         self._init_categories()
-        self._date = self._init_date()
         self._responsible = self._concatenate_tags_content(["Kursleiter"])
-        self._reduced_columns = self._init_full_row()
+
+    def findtext(self, tag, default=None):
+        """Return the text of the child tag of the original element
+
+        This mimics :py:meth:`xml.etree.ElementTree.Element.findtext` for the
+        extracted tags, so events can be processed like the elements they were
+        built from.
+
+        :param str tag: the tag of the child
+        :param default: the value to return if the tag was not found or extracted
+        :returns: the text of the tag, which is an empty string if it has no content
+        :rtype: str
+        """
+        index = self._field_indices.get(tag)
+        if index is None or self._texts[index] is None:
+            return default
+        return self._texts[index]
 
     def _init_categories(self):
         """Initialize the list of categories from the according xml tag's content"""
         categories: str = self._concatenate_tags_content(["Kategorie"])
-        self._categories = categories.split(", ")
+        self._categories = list(self._split_categories(categories))
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _split_categories(categories):
+        """Split the content of the categories' xml tag into the single categories
+
+        Most events share their combination of categories, so each combination is
+        split only once.
+
+        :param str categories: the comma separated categories
+        :returns: the interned categories
+        :rtype: Tuple[str, ...]
+        """
+        return tuple(sys.intern(category) for category in categories.split(", "))
 
     def _init_reduced_row(self, subtable_title):
         """Initializes the reduced version of the event
@@ -70,50 +268,31 @@ class Event(Element):
         namely the subtable with the given title.
 
         :param str subtable_title: title of the subtable which contains the full event
-
-        .. warning:: Do not call this function directly since it is automatically
-        called right after :meth:`get_full_row` is invoked.
         """
-        self._reduced_columns.append(
-            self.EventParagraph(self._build_description(link=subtable_title))
+        self._reduced_row = self._get_table_builder().create_fixedwidth_table(
+            [self._get_reduced_columns(subtable_title)],
+            self._table_style.reduced_column_widths,
         )
-        self._reduced_row = self._table_builder.create_fixedwidth_table(
-            [self._reduced_columns],
-            self._table_style.column_widths[:4]
-            + [sum(self._table_style.column_widths[4:])],
-        )
-
-    def create_reduced_after_full(func):
-        """Decorator to execute :meth:`_init_reduced_row` with :meth:`get_full_row`
-
-        :returns: the return value of :meth:`get_full_row`
-        :rtype: Table
-        """
 
-        def execute_get_full_and_init_reduced_row(self, *args, **kwargs):
-            """Exchange a table row with all the event's information against a
-            subtable's title
+    def _get_reduced_columns(self, subtable_title) -> List[EventParagraph]:
+        """Return the cells of the reduced table row referring to another subtable
 
-            This ensures, that after handing over the full information, the reduced
-            version with a reference to the subtable containing the  full version is
-            created.
+        The cells are built only on the first call.
 
-            .. note:: This is ensured by a decorator, which is why the function
-                signature on `ReadTheDocs.org
-                <https://pyxml2pdf.readthedocs.io/en/latest/pyxml2pdf.html#Core.events
-                .Event.get_full_row>`_ is displayed incorrectly. The parameter and
-                return value are as follows...
-
-            :param str subtable_title: the title of the subtable in which the row will
-                be integrated
-            :returns: a table row with all the event's information
-            :rtype: Table
-            """
-            return_table = func(self, *args, **kwargs)
-            self._init_reduced_row(args[0])
-            return return_table
-
-        return execute_get_full_and_init_reduced_row
+        :param str subtable_title: title of the subtable which contains the full event
+        :returns: the cells of the reduced table representation
+        """
+        try:
+            return self._reduced_columns
+        except AttributeError:
+            pass
+        # The reduced version shares the first four cells with the full version.
+        description = self._build_description(link=subtable_title)
+        (layouts,) = self.row_cache.cell_layouts([description])
+        self._reduced_columns = self._get_full_columns()[:4] + [
+            self.EventParagraph(description, layouts)
+        ]
+        return self._reduced_columns
 
     def _concatenate_tags_content(self, event_subelements, separator=" - "):
         """Form one string from the texts of a subset of an event's children tags
@@ -131,39 +310,58 @@ class Event(Element):
         :returns: concatenated, separated texts of all tags for the current event
         :rtype: str
         """
-        return separator.join(
-            [self.findtext(tag) for tag in event_subelements if self.findtext(tag)]
+        texts = [self.findtext(tag) for tag in event_subelements]
+        return separator.join([text for text in texts if text])
+
+    @classmethod
+    def _get_table_builder(cls):
+        """Return the table builder for the rows and create it on the first call
+
+        :returns: the table builder shared by all events
+        :rtype: TableBuilder
+        """
+        if cls._table_builder is None:
+            cls._table_builder = TableBuilder()
+        return cls._table_builder
+
+    def _init_full_row(self):
+        """Initialize the single table row containing all information of the event"""
+        self._full_row = self._get_table_builder().create_fixedwidth_table(
+            [self._get_full_columns()]
         )
 
-    def _init_full_row(self) -> List[EventParagraph]:
-        """Initialize the single table row containing all information of the event
+    def _get_full_columns(self) -> List[EventParagraph]:
+        """Return the cells of the table row containing all information of the event
 
         Extract interesting information from events children tags and connect them
-        into a nicely formatted row of a table.
+        into a nicely formatted row of a table. This happens only on the first call.
 
-        :return: the common starting columns of any table representation
+        :return: the cells of the full table representation
         :rtype: List[EventParagraph]
         """
-        table_columns = [
-            self.EventParagraph(self._build_type()),
-            self.EventParagraph(self._date),
-            self.EventParagraph(self._concatenate_tags_content(["Ort1"])),
-            self.EventParagraph(self._responsible),
-            self.EventParagraph(
-                self._build_description(self._concatenate_tags_content(["TrainerURL"]))
-            ),
-            self.EventParagraph(self._concatenate_tags_content(["Zielgruppe"])),
-            self.EventParagraph(
-                self._parse_prerequisites(
-                    self._concatenate_tags_content(["Voraussetzung"]),
-                    self._concatenate_tags_content(["Ausruestung"]),
-                    self._concatenate_tags_content(["Kurskosten"]),
-                    self._concatenate_tags_content(["Leistungen"]),
-                )
+        try:
+            return self._full_columns
+        except AttributeError:
+            pass
+        texts = [
+            self._build_type(),
+            self.date,
+            self._concatenate_tags_content(["Ort1"]),
+            self._responsible,
+            self._build_description(self._concatenate_tags_content(["TrainerURL"])),
+            self._concatenate_tags_content(["Zielgruppe"]),
+            self._parse_prerequisites(
+                self._concatenate_tags_content(["Voraussetzung"]),
+                self._concatenate_tags_content(["Ausruestung"]),
+                self._concatenate_tags_content(["Kurskosten"]),
+                self._concatenate_tags_content(["Leistungen"]),
             ),
         ]
-        self._full_row = self._table_builder.create_fixedwidth_table([table_columns])
-        return table_columns[:4]
+        self._full_columns = [
+            self.EventParagraph(text, layouts)
+            for text, layouts in zip(texts, self.row_cache.cell_layouts(texts))
+        ]
+        return self._full_columns
 
     @staticmethod
     def _remove_century(matchobj: Match) -> str:
@@ -176,22 +374,46 @@ class Event(Element):
 
     def _init_date(self):
         """Create a properly formatted string containing the date of the event"""
-        # Extract data from xml children tags' texts. Since the date can consist of
-        # three date ranges, we concatenate them separated with a line containing
-        # only an "und".
-
-        dates = [
-            ["TerminDatumVon1", "TerminDatumBis1"],
-            ["TerminDatumVon2", "TerminDatumBis2"],
-            ["TerminDatumVon3", "TerminDatumBis3"],
-        ]
+        return self._format_date(self._texts[self._dates_slice])
+
+    @classmethod
+    def format_dates(cls, events):
+        """Format the dates of many events at once
+
+        The texts of the date tags of all events are gathered column-wise and
+        each distinct combination is formatted only once, since many events take
+        place at the same dates. Events whose dates are formatted already are
+        skipped.
 
+        :param Iterable[Event] events: the events whose dates to format
+        """
+        pending = [event for event in events if not hasattr(event, "_date")]
+        date_columns = [event._texts[cls._dates_slice] for event in pending]
+        formatted_dates = {
+            dates: cls._format_date(dates) for dates in set(date_columns)
+        }
+        for event, dates in zip(pending, date_columns):
+            event._date = formatted_dates[dates]
+
+    @classmethod
+    @lru_cache(maxsize=16384)
+    def _format_date(cls, dates):
+        """Create a properly formatted string from the texts of the date tags
+
+        :param Tuple[Optional[str], ...] dates: the texts of the date tags in the
+            order of :attr:`fields`, where each beginning is followed by its end
+        :returns: the formatted date
+        :rtype: str
+        """
+        # Since the date can consist of three date ranges, we concatenate them
+        # separated with a line containing only an "und".
         extracted_dates = [
-            self._concatenate_tags_content(date)
-            for date in dates
-            if self._concatenate_tags_content(date)
+            " - ".join([text for text in date_range if text])
+            for date_range in zip(dates[::2], dates[1::2])
         ]
-        extracted_dates = "<br/>und<br/>".join(extracted_dates)
+        extracted_dates = "<br/>und<br/>".join(
+            [date_range for date_range in extracted_dates if date_range]
+        )
 
         # Replace any extracted_dates of a form similar to 31.12.2099 with "on request".
         if "2099" in extracted_dates:
@@ -200,7 +422,7 @@ class Event(Element):
             # Remove placeholders for missing time specifications and the first two
             # digits of the year specification.
             new_date = re.sub(
-                "[0-9]{4,}", self._remove_century, extracted_dates.replace("00:00", "")
+                "[0-9]{4,}", cls._remove_century, extracted_dates.replace("00:00", "")
             )
         return new_date
 
@@ -250,12 +472,14 @@ class Event(Element):
         :returns: the full description including url if provided
         :rtype: str
         """
-        texts = [
-            self._concatenate_tags_content(["Bezeichnung"]).join(["<b>", "</b>"]),
-            self._concatenate_tags_content(["Bezeichnung2"]),
-            self._concatenate_tags_content(["Beschreibung"]),
-        ]
-        full_description = " – ".join([text for text in texts if text])
+        if self._description is None:
+            texts = [
+                self._concatenate_tags_content(["Bezeichnung"]).join(["<b>", "</b>"]),
+                self._concatenate_tags_content(["Bezeichnung2"]),
+                self._concatenate_tags_content(["Beschreibung"]),
+            ]
+            self._description = " – ".join([text for text in texts if text])
+        full_description = self._description
         if link:
             joiner = "." if full_description[-1] != "." else ""
             full_description = joiner.join(
@@ -277,27 +501,25 @@ class Event(Element):
 
         return types
 
-    @create_reduced_after_full
     def get_full_row(self, subtable_title=None):
         """Exchange a table row with all the event's information against a
         subtable's title
 
-        This ensures, that after handing over the full information, the reduced
-        version with a reference to the subtable containing the  full version is
-        created.
-
-        .. note:: This is ensured by a decorator, which is why the function
-            signature on `ReadTheDocs.org
-            <https://pyxml2pdf.readthedocs.io/en/latest/pyxml2pdf.html#Core.events
-            .Event.get_full_row>`_ is displayed incorrectly. The parameter and
-            return value are as follows...
+        The row is built on the first call. The title is remembered, so that the
+        reduced version built later on refers to the subtable containing the full
+        version.
 
         :param str subtable_title: the title of the subtable in which the row will
             be integrated
         :returns: a table row with all the event's information
         :rtype: Table
         """
-        return self._full_row
+        self._full_subtable = subtable_title or ""
+        try:
+            return self._full_row
+        except AttributeError:
+            self._init_full_row()
+            return self._full_row
 
     @property
     def categories(self):
@@ -321,28 +543,112 @@ class Event(Element):
     def date(self):
         """Return the date of the event
 
+        The date is formatted on the first access.
+
         :returns: date
         :rtype: str
         """
-        return self._date
+        try:
+            return self._date
+        except AttributeError:
+            self._date = self._init_date()
+            return self._date
 
     def get_table_row(self, subtable_title):
         """Return the table row representation of the event
 
         This is the API of :py:class:`Core.events.Event` for getting the table row
         representation of the event. It makes sure, that on the first call
-        :meth:`get_full_row` is invoked and otherwise :attr:`_reduced_row` is returned.
+        :meth:`get_full_row` is invoked and otherwise the reduced row is returned.
+        Both are only built when they are requested for the first time, so events
+        which are not distributed to any subtable never build any row and events
+        distributed to only one subtable never build the reduced row.
 
         :param str subtable_title: the title of the subtable in which the row will
             be integrated
         :returns: a table row representation of the event
         :rtype: Table
         """
-        # We check if the reduced row was produced before, which means in turn,
-        # that :meth:`get_table_row` was called at least once before. Otherwise we call
-        # :meth:`get_full_row` which automatically triggers the creation of the
-        # reduced row for later uses.
+        if self._full_subtable is None:
+            return self.get_full_row(subtable_title)
         try:
             return self._reduced_row
         except AttributeError:
-            return self.get_full_row(subtable_title)
+            self._init_reduced_row(self._full_subtable)
+            return self._reduced_row
+
+    def get_table_cells(self, subtable_title):
+        """Return the cells of the table row representation of the event
+
+        This is the counterpart of :meth:`get_table_row` for tables containing
+        many events' rows, like the long tables of
+        :py:class:`model.tables.TableBuilder.TableBuilder`. The first call returns
+        the cells of the full row, all further calls the cells of the reduced row,
+        but no single row table is built for either of them.
+
+        :param str subtable_title: the title of the subtable in which the row will
+            be integrated
+        :returns: the cells of the full row or the fewer cells of the reduced row
+        :rtype: List[EventParagraph]
+        """
+        if self._full_subtable is None:
+            self._full_subtable = subtable_title or ""
+            return self._get_full_columns()
+        return self._get_reduced_columns(self._full_subtable)
+
+    def skip_full_row(self, subtable_title):
+        """Remember the subtable containing the full row without building it
+
+        Instead of :meth:`get_table_row` this is called for a subtable, whose rows
+        are not needed here. If it is the event's first subtable, the reduced rows
+        handed out afterwards refer to it as usual.
+
+        :param str subtable_title: the title of the subtable, which would contain
+            the row
+        """
+        if self._full_subtable is None:
+            self._full_subtable = subtable_title
+
+    def reset_table_rows(self):
+        """Prepare the event to be distributed to the subtables once more
+
+        After this call, :meth:`get_table_row` hands out the full row on its next
+        call again and then builds the reduced row anew, just as for a new event.
+        The full row itself is kept, so reusing an event for another document is
+        much cheaper than creating it from the xml data once more.
+        """
+        self._full_subtable = None
+        for attribute in ("_reduced_row", "_reduced_columns"):
+            try:
+                delattr(self, attribute)
+            except AttributeError:
+                pass
+
+    def release_table_rows(self):
+        """Drop the rows built so far to free their memory
+
+        In contrast to :meth:`reset_table_rows` the subtable containing the full row
+        is kept, so the next call of :meth:`get_table_row` builds the reduced row
+        referring to it, just as if the rows had never been dropped.
+        """
+        for attribute in (
+            "_full_row",
+            "_full_columns",
+            "_reduced_row",
+            "_reduced_columns",
+        ):
+            try:
+                delattr(self, attribute)
+            except AttributeError:
+                pass
+
+    @classmethod
+    def release_layouts(cls):
+        """Forget the parsed texts and line breaks of the rows built so far
+
+        Both are kept to be reused by subsequent rows with the same texts, which
+        makes memory grow with the size of the feed up to the caches' limits. The
+        line breaks are kept though, if the row cache is persisted in a file.
+        """
+        cls.EventParagraph._parse.cache_clear()
+        cls.row_cache.release()
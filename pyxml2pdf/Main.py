@@ -2,17 +2,54 @@ import os
 import sys
 
 from pyxml2pdf.Core.Downloader import Downloader
+from pyxml2pdf.Core.DownloadStream import DownloadStream
 from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.Watcher import Watcher
 
 
 def main():
+    watch = pop_flag("--watch")
+    pipeline = pop_flag("--pipeline")
+    cache_rows = pop_flag("--cache-rows")
+    incremental = pop_flag("--incremental")
     validate_inputs()
-    if not os.path.isfile(sys.argv[2]):
-        Downloader(*sys.argv[1:3])
-    Initializer(*sys.argv[2:])
+    # Keep the laid-out rows next to the downloaded feed for the next run.
+    row_cache_path = sys.argv[2] + ".rows" if cache_rows else None
+    if pipeline and not watch and not os.path.isfile(sys.argv[2]):
+        # Parse the feed while it is still being downloaded.
+        with DownloadStream(*sys.argv[1:3]) as stream:
+            Initializer(
+                stream,
+                *sys.argv[3:5],
+                streaming=True,
+                incremental=incremental,
+                row_cache_path=row_cache_path,
+            )
+    else:
+        if not os.path.isfile(sys.argv[2]):
+            Downloader(*sys.argv[1:3])
+        if watch:
+            Watcher(*sys.argv[2:5], row_cache_path=row_cache_path).watch()
+        else:
+            Initializer(
+                *sys.argv[2:], incremental=incremental, row_cache_path=row_cache_path
+            )
     print("\n-------------------------------DONE-------------------------------")
 
 
+def pop_flag(flag):
+    """Remove a flag from the commandline parameters
+
+    :param str flag: the flag to look for
+    :returns: True if the flag was given
+    :rtype: bool
+    """
+    if flag in sys.argv:
+        sys.argv.remove(flag)
+        return True
+    return False
+
+
 def validate_inputs():
     if len(sys.argv) < 4:
         raise ValueError(
@@ -0,0 +1,21 @@
+import sys
+
+from pyxml2pdf.Core.Batch import Batch
+
+
+def main():
+    if len(sys.argv) < 2 or not sys.argv[1].endswith(".json"):
+        raise ValueError(
+            f"Expected first commandline parameter to be the path to a JSON manifest "
+            f"listing the conversions but {sys.argv[1:2]} was given. Optionally "
+            f"specify the number of processes to convert in parallel as second "
+            f"parameter."
+        )
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    batch = Batch(sys.argv[1], processes)
+    print("\n-------------------------------DONE-------------------------------")
+    return 1 if batch.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
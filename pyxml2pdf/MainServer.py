@@ -0,0 +1,31 @@
+import sys
+
+from pyxml2pdf.Core.Server import RenderServer
+
+
+def main():
+    if len(sys.argv) < 2 or ".properties" not in sys.argv[1]:
+        raise ValueError(
+            f"Expected first commandline parameter to be .properties path and "
+            f"filename but {sys.argv[1:2]} was given. Optionally specify the port "
+            f"to listen on, the number of worker processes and the folder of xml "
+            f"files, which may be rendered by their path, as further parameters."
+        )
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    input_folder = sys.argv[4] if len(sys.argv) > 4 else None
+    server = RenderServer(
+        ("127.0.0.1", port), sys.argv[1], workers, input_folder=input_folder
+    )
+    print("Serving previews on http://127.0.0.1:%d/pdf and /pages" % port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
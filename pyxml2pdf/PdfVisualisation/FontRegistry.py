@@ -0,0 +1,156 @@
+import os
+import pickle
+from functools import partial
+from pathlib import PurePath
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab.pdfbase.pdfmetrics import registerFont, registerFontFamily
+
+from pyxml2pdf.PdfVisualisation.MemoizedTTFont import MemoizedTTFont
+
+
+def _scale_to_pdf_units(factor, value):
+    """Scale a value from font units to the thousandths of an em used by PDF
+
+    This replaces the unpicklable lambda, which :py:mod:`reportlab` stores in the
+    parsed font for the same purpose.
+    """
+    return value * factor
+
+
+class FontRegistry:
+    """Register the fonts for the tables with :py:mod:`reportlab` once per process
+
+    The fonts are only loaded and registered on the first call of
+    :meth:`register`, all subsequent calls return immediately. If
+    :attr:`cache_path` is set, the parsed fonts are stored in that file and loaded
+    from there in subsequent processes instead of parsing the TTF files again. The
+    cache is renewed, whenever the font files or the version of :py:mod:`reportlab`
+    change.
+    """
+
+    #: Optional path of the file to cache the parsed fonts in across processes.
+    cache_path = None
+
+    #: The registered font names and the files in this folder they are loaded from.
+    fonts = {
+        "NewsGothBT": "NewsGothicBT-Roman.ttf",
+        "NewsGothBT_Bold": "NewsGothicBT-Bold.ttf",
+        "NewsGothBT_Italic": "NewsGothicBT-Italic.ttf",
+        "NewsGothBT_BoldItalic": "NewsGothicBT-BoldItalic.ttf",
+    }
+
+    _registered = False
+
+    @classmethod
+    def register(cls):
+        """Register the desired font with :py:mod:`reportlab`
+
+        This ensures that `<i></i>` and `<b></b>` as cell content work well.
+        """
+        if cls._registered:
+            return
+
+        # Load fonts from cache or parse them and lead and register them with
+        # reportlab.
+        fonts = cls._load_cache()
+        if fonts is None:
+            fonts = [
+                MemoizedTTFont(name, cls._path_to_font(filename))
+                for name, filename in cls.fonts.items()
+            ]
+            cls._store_cache(fonts)
+        for font in fonts:
+            registerFont(font)
+        registerFontFamily(
+            "NewsGothBT",
+            normal="NewsGothBT",
+            bold="NewsGothBT_Bold",
+            italic="NewsGothBT_Italic",
+            boldItalic="NewsGothBT_BoldItalic",
+        )
+        cls._registered = True
+
+    @staticmethod
+    def _path_to_font(filename):
+        """Return the path to a font file in the folder containing this file
+
+        :param str filename: the font's filename
+        :returns: the path to the font file
+        :rtype: PurePath
+        """
+        return PurePath(__file__).parent.joinpath(filename)
+
+    @classmethod
+    def _cache_key(cls):
+        """Identify the versions of everything the parsed fonts depend on
+
+        :returns: the reportlab version and the names, sizes and modification times
+            of all font files
+        :rtype: tuple
+        """
+        key = [reportlab.Version]
+        for name, filename in sorted(cls.fonts.items()):
+            stat = os.stat(cls._path_to_font(filename))
+            key.append((name, filename, stat.st_size, stat.st_mtime_ns))
+        return tuple(key)
+
+    @classmethod
+    def _load_cache(cls):
+        """Load the parsed fonts from the cache file if it is up to date
+
+        :returns: the parsed fonts or None if there is no valid cache
+        :rtype: Optional[List[MemoizedTTFont]]
+        """
+        if cls.cache_path is None or not os.path.isfile(cls.cache_path):
+            return None
+        try:
+            with open(cls.cache_path, "rb") as cache_file:
+                key, font_states = pickle.load(cache_file)
+            if key != cls._cache_key():
+                return None
+            fonts = []
+            for font_state in font_states:
+                font = MemoizedTTFont.__new__(MemoizedTTFont)
+                font.__dict__.update(font_state)
+                font.state = WeakKeyDictionary()
+                font._widths = {}
+                fonts.append(font)
+            return fonts
+        except Exception:
+            # Unpickling a corrupt cache or one written by other versions of the
+            # involved classes can fail in many ways, so it is parsed anew instead.
+            try:
+                os.remove(cls.cache_path)
+            except OSError:
+                pass
+            return None
+
+    @classmethod
+    def _store_cache(cls, fonts):
+        """Store the parsed fonts in the cache file, if a cache file is set
+
+        :param List[MemoizedTTFont] fonts: the parsed fonts
+        """
+        if cls.cache_path is None:
+            return
+        font_states = []
+        for font in fonts:
+            font.face._pdfScale = partial(
+                _scale_to_pdf_units, 1000 / font.face.unitsPerEm
+            )
+            font_states.append(
+                {
+                    key: value
+                    for key, value in vars(font).items()
+                    if key not in ("state", "_widths")
+                }
+            )
+        try:
+            with open(cls.cache_path, "wb") as cache_file:
+                pickle.dump((cls._cache_key(), font_states), cache_file)
+        except (OSError, pickle.PickleError, TypeError, AttributeError):
+            # A cache which cannot be written only costs the time to parse again.
+            if os.path.isfile(cls.cache_path):
+                os.remove(cls.cache_path)
@@ -0,0 +1,62 @@
+from typing import Dict
+
+from reportlab.pdfbase.ttfonts import TTFont
+
+
+class MemoizedTTFont(TTFont):
+    """A TrueType font remembering the widths of all texts measured in it
+
+    Wrapping a paragraph measures every word with :py:func:`stringWidth
+    <reportlab.pdfbase.pdfmetrics.stringWidth>`, which sums up the widths of all
+    characters each time. In the tables the same words repeat over and over, so
+    the sum is computed only once per text. It is stored in thousandths of the
+    font size, which makes it valid for all font sizes, and scaled exactly as
+    :py:mod:`reportlab` does, so the widths are identical to the ones of
+    :py:class:`TTFont <reportlab.pdfbase.ttfonts.TTFont>`. Once more than
+    :attr:`cache_size` texts are stored, the cache starts over to keep long running
+    processes lean.
+
+    The parameters are the same as for :py:class:`TTFont
+    <reportlab.pdfbase.ttfonts.TTFont>`.
+    """
+
+    #: The maximum number of texts whose widths are remembered.
+    cache_size = 65536
+
+    _widths: Dict[str, int]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._widths = {}
+
+    def stringWidth(self, text, size, encoding="utf8"):
+        """Calculate the width of a text in this font
+
+        :param str text: the text to measure
+        :param float size: the font size in points
+        :param str encoding: the encoding of the text if it is passed as bytes
+        :returns: the width in points
+        :rtype: float
+        """
+        if not isinstance(text, str):
+            text = text.decode(encoding or "utf8")
+        try:
+            units = self._widths[text]
+        except KeyError:
+            units = self._measure(text)
+        return 0.001 * size * units
+
+    def _measure(self, text):
+        """Sum up the widths of all characters of a text and remember the result
+
+        :param str text: the text to measure
+        :returns: the width in thousandths of the font size
+        :rtype: int
+        """
+        get_width = self.face.charWidths.get
+        default_width = self.face.defaultWidth
+        units = sum(get_width(ord(character), default_width) for character in text)
+        if len(self._widths) >= self.cache_size:
+            self._widths.clear()
+        self._widths[text] = units
+        return units
@@ -1,11 +1,9 @@
-from pathlib import PurePath
-
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import mm
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.pdfbase.pdfmetrics import registerFont, registerFontFamily
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import TableStyle as ReportlabTableStyle
 
+from pyxml2pdf.PdfVisualisation.FontRegistry import FontRegistry
 from pyxml2pdf.PdfVisualisation.Styles import Styles
 
 
@@ -17,29 +15,49 @@ class TableStyle:
         *   azure (nicht mit aliceblue)
         *   honeydew
         * ...
+
+    All styling information is built only once per process on the first
+    instantiation. All further instantiations return the same instance, so that
+    every table and paragraph shares the very same style objects. Therefore they
+    are only provided as read-only properties and must not be modified. The table
+    styles are provided as :py:class:`reportlab.platypus.TableStyle` objects, so
+    the commands are not converted into a style for every table anew.
     """
 
-    def __init__(self):
-        self.heading = [
-            Styles.valign_middle,
-            Styles.background(colors.honeydew),
-            Styles.box(colors.black),
-            Styles.inner_grid(colors.black),
-            Styles.align_center,
-        ]
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._init_styles()
+        return cls._instance
+
+    def _init_styles(self):
+        """Build all styling information for the tables"""
+        self._heading = ReportlabTableStyle(
+            (
+                Styles.valign_middle,
+                Styles.background(colors.honeydew),
+                Styles.box(colors.black),
+                Styles.inner_grid(colors.black),
+                Styles.align_center,
+            )
+        )
 
-        self.normal = [
-            Styles.align_left,
-            Styles.valign_middle,
-            Styles.box(colors.black),
-            Styles.inner_grid(colors.black),
-            Styles.leftpadding_reduce,
-            Styles.rightpadding_reduce,
-        ]
+        self._normal = ReportlabTableStyle(
+            (
+                Styles.align_left,
+                Styles.valign_middle,
+                Styles.box(colors.black),
+                Styles.inner_grid(colors.black),
+                Styles.leftpadding_reduce,
+                Styles.rightpadding_reduce,
+            )
+        )
 
-        self.sub_heading = self.normal
+        self._sub_heading = self._normal
 
-        self.table_width = 177.8 * mm
+        self._table_width = 177.8 * mm
 
         # This specifies the column widths of the final result. The columns contain...
         self._column_widths = [
@@ -61,10 +79,14 @@ class TableStyle:
             47 * mm,
         ]
         self._column_widths[4] = (
-            self.table_width
+            self._table_width
             - sum(self._column_widths[0:4])
             - sum(self._column_widths[5:7])
         )
+        # The reduced version of an event combines the last three columns into one.
+        self._reduced_column_widths = self._column_widths[:4] + [
+            sum(self._column_widths[4:])
+        ]
 
         # Set the resulting tables' styling with all the customization of
         # margins, fonts, fontsizes, etc...
@@ -89,43 +111,50 @@ class TableStyle:
         custom_styles.get("Heading2").fontName = "NewsGothBT_Bold"
         self._custom_styles = custom_styles
 
-        # Register font with reportlab.
-        self._init_font_family()
+    @property
+    def heading(self):
+        """Return the table style of the subtables' titles
 
-    @staticmethod
-    def _init_font_family():
-        """Register the desired font with :py:mod:`reportlab`
+        :returns: the table style
+        :rtype: reportlab.platypus.TableStyle
+        """
+        return self._heading
+
+    @property
+    def normal(self):
+        """Return the table style of the events' rows
 
-        This ensures that `<i></i>` and `<b></b>` as cell content work well.
+        :returns: the table style
+        :rtype: reportlab.platypus.TableStyle
         """
-        # Set root of fonts to the folder containing this file.
-        path_to_fonts = PurePath(__file__).parent
+        return self._normal
 
-        # Finally lead and register fonts with reportlab.
-        registerFont(
-            TTFont("NewsGothBT", path_to_fonts.joinpath("NewsGothicBT-Roman.ttf"))
-        )
-        registerFont(
-            TTFont("NewsGothBT_Bold", path_to_fonts.joinpath("NewsGothicBT-Bold.ttf"))
-        )
-        registerFont(
-            TTFont(
-                "NewsGothBT_Italic", path_to_fonts.joinpath("NewsGothicBT-Italic.ttf")
-            )
-        )
-        registerFont(
-            TTFont(
-                "NewsGothBT_BoldItalic",
-                path_to_fonts.joinpath("NewsGothicBT-BoldItalic.ttf"),
-            )
-        )
-        registerFontFamily(
-            "NewsGothBT",
-            normal="NewsGothBT",
-            bold="NewsGothBT_Bold",
-            italic="NewsGothBT_Italic",
-            boldItalic="NewsGothBT_BoldItalic",
-        )
+    @property
+    def sub_heading(self):
+        """Return the table style of the column headings
+
+        :returns: the table style
+        :rtype: reportlab.platypus.TableStyle
+        """
+        return self._sub_heading
+
+    @property
+    def prebuilt(self):
+        """Return all prebuilt table styles
+
+        :returns: the table styles
+        :rtype: Tuple[reportlab.platypus.TableStyle, ...]
+        """
+        return self._heading, self._normal
+
+    @property
+    def table_width(self):
+        """Return the width of the tables
+
+        :returns: the width
+        :rtype: float
+        """
+        return self._table_width
 
     @property
     def column_widths(self):
@@ -136,11 +165,24 @@ class TableStyle:
         """
         return self._column_widths
 
+    @property
+    def reduced_column_widths(self):
+        """Return the column widths for the reduced rows of the tables
+
+        :returns: the list of column widths
+        :rtype: List[float]
+        """
+        return self._reduced_column_widths
+
     @property
     def custom_styles(self):
         """Return the custom stylesheet for the tables
 
+        Since the styles refer to our custom fonts, these are registered with
+        :py:mod:`reportlab` on first access.
+
         :returns: the custom stylesheet
         :rtype: reportlab.lib.styles.StyleSheet1
         """
+        FontRegistry.register()
         return self._custom_styles
@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Union
 
-from reportlab.platypus import Table
+from reportlab.platypus import Flowable, Table
 
 
 class EventTable:
@@ -19,7 +19,8 @@ class EventTable:
     title: str
     locations: List[str]
     activities: List[str]
-    events: List[Table]
+    #: The rows of the table or, for long tables, the cells of each row.
+    events: List[Union[Table, List[Flowable]]]
 
     def __init__(self, title, locations, activities):
         self.events = []
@@ -30,6 +31,7 @@ class EventTable:
     def append(self, event):
         """Append an event to the end of the table
 
-        :param reportlab.platypus.Table event:
+        :param Union[reportlab.platypus.Table, List[Flowable]] event: the row or
+            the cells of the row
         """
         self.events.append(event)
@@ -1,18 +1,43 @@
 import warnings
-from typing import List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
-from reportlab.platypus import Flowable, Paragraph, Table
+from reportlab.platypus import Flowable, LongTable, Paragraph, Table
+from reportlab.platypus import TableStyle as ReportlabTableStyle
 
 from pyxml2pdf.model.tables.EventTable import EventTable
 from pyxml2pdf.PdfVisualisation.TableStyle import TableStyle
 
 
 class TableBuilder:
-    def __init__(self):
+    """Distribute the events to the subtables and lay the subtables out as tables
+
+    Every row is a separate :py:class:`reportlab.platypus.Table`. With *subtable*
+    only the subtable at that position is filled and collected. Each event still
+    receives its full row in the first of its subtables and the reduced rows
+    referring to it in all others, so the subtable contains the same rows as in the
+    complete document and can be laid out on its own.
+
+    With *long_tables* the subtables only collect the cells of their rows instead
+    and each subtable is laid out as one :py:class:`reportlab.platypus.LongTable`,
+    see :meth:`create_long_table`.
+
+    :param int subtable: optional index of the only subtable to fill
+    :param bool long_tables: if True, each subtable is collected as one table
+        instead of one table per row, defaults to False
+    """
+
+    _activity_masks: Dict[str, int]
+    _location_masks: Dict[str, int]
+    _subtable: Optional[EventTable]
+
+    def __init__(self, subtable=None, long_tables=False):
+        self._long_tables = long_tables
         self._subtable_names_and_categs = self._parse_properties()
         self._table_style = TableStyle()
         self._styles = self._table_style.custom_styles
         self._subtables = self.create_subtables()
+        self._subtable = None if subtable is None else self._subtables[subtable]
+        self._index_categories()
 
     @staticmethod
     def _parse_properties() -> List[List[Union[str, List[str]]]]:
@@ -51,6 +76,11 @@ class TableBuilder:
             klettern,
         ]
 
+    @property
+    def subtable_titles(self) -> List[str]:
+        """Return the titles of all subtables in their order of appearance"""
+        return [subtable.title for subtable in self._subtables]
+
     def create_subtables(self) -> List[EventTable]:
         """Create subtables for all different kinds of events
 
@@ -62,12 +92,61 @@ class TableBuilder:
             subtable = EventTable(
                 subtables_props[0], subtables_props[1], subtables_props[2]
             )
-            headers = self.make_header(subtables_props[0])
+            if self._long_tables:
+                headers = self.make_header_cells(subtables_props[0])
+            else:
+                headers = self.make_header(subtables_props[0])
             for header in headers:
                 subtable.append(header)
             subtables.append(subtable)
         return subtables
 
+    def _index_categories(self):
+        """Index the subtables by the activities and locations they cover
+
+        For each category, the bitmask of the subtables which cover it as activity
+        and the bitmask of the subtables which cover it as location are stored,
+        where the bit at position i stands for the i-th subtable.
+        """
+        self._activity_masks = {}
+        self._location_masks = {}
+        for index, subtable in enumerate(self._subtables):
+            for activity in subtable.activities:
+                self._activity_masks[activity] = (
+                    self._activity_masks.get(activity, 0) | 1 << index
+                )
+            for location in subtable.locations:
+                self._location_masks[location] = (
+                    self._location_masks.get(location, 0) | 1 << index
+                )
+
+    def _find_subtables(self, categories: Iterable[str]) -> List[EventTable]:
+        """Find all subtables covering an activity and a location of the categories
+
+        :param categories: the categories of an event
+        :returns: the subtables in their order of appearance
+        """
+        return [self._subtables[index] for index in self._find_indices(categories)]
+
+    def _find_indices(self, categories: Iterable[str]) -> List[int]:
+        """Find the indices of all subtables covering the categories
+
+        :param categories: the categories of an event
+        :returns: the indices of the subtables covering an activity and a location
+            of the categories in ascending order
+        """
+        activities = locations = 0
+        for category in categories:
+            activities |= self._activity_masks.get(category, 0)
+            locations |= self._location_masks.get(category, 0)
+        matches = activities & locations
+        indices = []
+        while matches:
+            lowest_match = matches & -matches
+            indices.append(lowest_match.bit_length() - 1)
+            matches ^= lowest_match
+        return indices
+
     def make_header(self, title: str) -> List[Table]:
         """Build the first two rows of a subtable
 
@@ -78,15 +157,29 @@ class TableBuilder:
         :returns: two line table with title and headings
         :rtype: List[reportlab.platypus.Table]
         """
-        # Create first row spanning the full width and title as content.
-        title_row = [
+        title_cells, columns = self.make_header_cells(title)
+        return [
+            # Create first row spanning the full width and title as content.
             self.create_fixedwidth_table(
-                [[Paragraph(title, self._styles["Heading1"])]],
+                [title_cells],
                 self._table_style.table_width,
                 self._table_style.heading,
-            )
+            ),
+            # Create row containing one column per heading.
+            self.create_fixedwidth_table(
+                [columns],
+                self._table_style.column_widths,
+                self._table_style.sub_heading,
+            ),
         ]
 
+    def make_header_cells(self, title: str) -> List[List[Paragraph]]:
+        """Build the cells of the first two rows of a subtable
+
+        :param str title: the title of the subtable
+        :returns: the single cell of the title row and the cells of the column
+            headings
+        """
         # These are the column headings that should be populated from the
         # properties-file.
         headings = [
@@ -98,57 +191,93 @@ class TableBuilder:
             "Zielgruppe",
             "Voraussetzungen<br/>a) persönliche | b) " "materielle | c) finanzielle",
         ]
-
-        # Create row containing one column per heading.
-        columns = [Paragraph(heading, self._styles["Heading2"]) for heading in headings]
-
-        # Concatenate both rows.
-        title_row.append(
-            self.create_fixedwidth_table(
-                [columns],
-                self._table_style.column_widths,
-                self._table_style.sub_heading,
-            )
-        )
-        return title_row
+        return [
+            [Paragraph(title, self._styles["Heading1"])],
+            [Paragraph(heading, self._styles["Heading2"]) for heading in headings],
+        ]
 
     def collect_subtables(self) -> List[Table]:
         """Collect all subtables at once
 
-        :return: the subtables
+        :return: the rows of all subtables or, with *long_tables*, one table per
+            subtable
         """
-        return [element for subtable in self._subtables for element in subtable.events]
+        subtables = self._subtables if self._subtable is None else [self._subtable]
+        if self._long_tables:
+            return [self.create_long_table(subtable.events) for subtable in subtables]
+        return [element for subtable in subtables for element in subtable.events]
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows of the subtables to collect
+
+        :returns: the number of rows including the titles and column headings
+        """
+        subtables = self._subtables if self._subtable is None else [self._subtable]
+        return sum(len(subtable.events) for subtable in subtables)
 
     def distribute_event(self, event):
         """Distribute an event to the subtables according to the related categories
 
         :param Core.events.Event event: event to distribute
         """
-        distribution_failed = True
-        set_of_cats = set(event.categories)
-        for subtable in self._subtables:
-            if set_of_cats.intersection(
-                subtable.activities
-            ) and set_of_cats.intersection(subtable.locations):
-                subtable.append(event.get_table_row(subtable.title))
-                distribution_failed = False
-        if distribution_failed:
-            warnings.warn(
-                event.responsible
-                + "'s event on "
-                + event.date
-                + " would not be printed, because it does not contain a valid"
-                " combination of locations and activities. Currently it contains "
-                + str(event.categories)
-                + ". Either add a valid location or add a valid activity or both.",
-                RuntimeWarning,
-            )
+        subtables = self._find_subtables(event.categories)
+        for position, subtable in enumerate(subtables):
+            if self._subtable is None or subtable is self._subtable:
+                subtable.append(
+                    event.get_table_cells(subtable.title)
+                    if self._long_tables
+                    else event.get_table_row(subtable.title)
+                )
+            elif position == 0:
+                # The full row goes to the first subtable, the others refer to it.
+                event.skip_full_row(subtable.title)
+        if not subtables and self._subtable is None:
+            self._warn_unprinted(event)
+
+    def route_events(self, events) -> List[List]:
+        """Sort the events into the subtables without building any of their rows
+
+        This is the counterpart of :meth:`distribute_event` for callers, which build
+        the rows of one subtable after the other themselves.
+
+        :param List[Core.events.Event] events: the events in the order of the
+            document
+        :returns: the events of each subtable in the order of the subtables
+        """
+        routes: List[List] = [[] for _ in self._subtables]
+        for event in events:
+            indices = self._find_indices(event.categories)
+            for index in indices:
+                routes[index].append(event)
+            if not indices:
+                self._warn_unprinted(event)
+        return routes
+
+    @staticmethod
+    def _warn_unprinted(event):
+        """Warn about an event, which does not belong to any subtable
+
+        :param Core.events.Event event: the event, which will not be printed
+        """
+        warnings.warn(
+            event.responsible
+            + "'s event on "
+            + event.date
+            + " would not be printed, because it does not contain a valid"
+            " combination of locations and activities. Currently it contains "
+            + str(event.categories)
+            + ". Either add a valid location or add a valid activity or both.",
+            RuntimeWarning,
+        )
 
     def create_fixedwidth_table(
         self,
         cells: List[List[Flowable]],
         widths: Optional[Union[float, List[float]]] = None,
-        style: Optional[List[Tuple[Union[str, Tuple[int]]]]] = None,
+        style: Optional[
+            Union[ReportlabTableStyle, List[Tuple[Union[str, Tuple[int]]]]]
+        ] = None,
     ) -> Table:
         """Create a table with specified column widths
 
@@ -160,14 +289,44 @@ class TableBuilder:
         :param widths: Optional column widths. The default results in reasonable
             settings based on experience.
         :param style: Optional table's style. The default results in reasonable
-            settings based on experience.
+            settings based on experience. Prefer the prebuilt styles of
+            :py:class:`PdfVisualisation.TableStyle.TableStyle` over lists of
+            commands, which are converted into a style for every table anew.
         :returns: A table containing specified cells in fixed width, styled columns.
         """
         if widths is None:
             widths = self._table_style.column_widths
         if style is None:
             style = self._table_style.normal
-        table = Table(cells, colWidths=widths)
-        table.setStyle(style)
+        return Table(cells, colWidths=widths, style=style)
+
+    def create_long_table(self, rows: List[List[Flowable]]) -> LongTable:
+        """Create one table of all rows of a subtable
+
+        The title and the column headings are repeated on every page the table
+        spans and the rows are never split across pages. Rows with fewer cells than
+        columns, like the title and the reduced rows, span their last cell over the
+        remaining columns. The prebuilt styles are applied to the title and to all
+        other rows, just as to the tables of single rows.
 
-        return table
+        :param rows: the cells of the title, the column headings and the events'
+            rows
+        :returns: the table of the subtable
+        """
+        widths = self._table_style.column_widths
+        # Reportlab ignores the height of the lists in cells hidden by a span.
+        cells = [row + [[] for _ in range(len(widths) - len(row))] for row in rows]
+        # The prebuilt styles' commands cover whole tables, so they are restricted.
+        commands = [
+            (command[0], (0, 0), (-1, 0)) + tuple(command[3:])
+            for command in self._table_style.heading.getCommands()
+        ] + [
+            (command[0], (0, 1), (-1, -1)) + tuple(command[3:])
+            for command in self._table_style.normal.getCommands()
+        ]
+        commands.extend(
+            ("SPAN", (len(row) - 1, index), (-1, index))
+            for index, row in enumerate(rows)
+            if len(row) < len(widths)
+        )
+        return LongTable(cells, colWidths=widths, style=commands, repeatRows=2)
@@ -29,7 +29,7 @@ setup(
     author=u"Björn Ludwig, Wojciech Kur",
     author_email="bjoern.ludwig@ptb.de",
     keywords="xml pdf conversion",
-    packages=find_packages(exclude=["test"]),
+    packages=find_packages(exclude=["test", "benchmarks"]),
     documentation="pyxml2pdf.readthedocs.io",
     install_requires=["defusedxml", "reportlab", "requests", "pypdf2", "clint"],
     python_requires=">=3.6",
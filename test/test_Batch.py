@@ -0,0 +1,47 @@
+import json
+import os
+
+import pytest
+
+from pyxml2pdf.Core.Batch import Batch
+
+
+@pytest.fixture
+def manifest_path(tmp_path) -> str:
+    """Create a manifest for two editions and a broken one
+
+    :returns: the path to the manifest
+    """
+    test_data = os.path.abspath(os.path.join("test", "test_data"))
+    conversions = [
+        {
+            "xml": os.path.join(test_data, "testdata.xml"),
+            "pdf": "edition_%s.pdf" % edition,
+            "properties": os.path.join(test_data, "testdata_prop.properties"),
+        }
+        for edition in ("a", "b")
+    ]
+    conversions[1]["options"] = {"single_pass": True}
+    conversions.append(
+        {"xml": "missing.xml", "pdf": "missing.pdf", "properties": "missing"}
+    )
+    path = tmp_path.joinpath("manifest.json")
+    path.write_text(json.dumps(conversions))
+    return str(path)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch(manifest_path, tmp_path, processes):
+    batch = Batch(manifest_path, processes)
+    assert tmp_path.joinpath("edition_a_seite_01.pdf").exists()
+    assert tmp_path.joinpath("edition_b_seite_01.pdf").exists()
+    assert [conversion["pdf"] for conversion, _ in batch.failures] == [
+        str(tmp_path.joinpath("missing.pdf"))
+    ]
+
+
+def test_batch_invalid_manifest(tmp_path):
+    path = tmp_path.joinpath("manifest.json")
+    path.write_text(json.dumps([{"xml": "feed.xml"}]))
+    with pytest.raises(ValueError):
+        Batch(str(path))
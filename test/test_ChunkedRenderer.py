@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from defusedxml.ElementTree import parse
+from PyPDF2 import PdfFileReader
+from reportlab.platypus import SimpleDocTemplate
+
+from benchmarks.feeds import generate_feed
+from pyxml2pdf.Core.ChunkedRenderer import ChunkedRenderer
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.Parser import Parser
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+
+
+@pytest.fixture(scope="module")
+def input_path(tmp_path_factory):
+    input_path = str(tmp_path_factory.mktemp("feed").joinpath("feed.xml"))
+    generate_feed(input_path, 40)
+    return input_path
+
+
+def read_events(input_path):
+    return [Event(course) for course in parse(input_path).findall("kurs")]
+
+
+def extract_texts(path):
+    # Older reportlab versions number the glyphs beyond ASCII in the order of their
+    # first use in each file, so these are extracted differently from the segments.
+    return [
+        re.sub(r"[^\x00-\x7f]", "?", page.extractText())
+        for page in PdfFileReader(path, strict=False).pages
+    ]
+
+
+@pytest.fixture(scope="module")
+def complete_path(input_path, tmp_path_factory):
+    complete_path = str(tmp_path_factory.mktemp("complete").joinpath("result.pdf"))
+    pdf = SimpleDocTemplate(complete_path, **Initializer.document_layout)
+    pdf.build(Parser(None, []).collect_xml_data(read_events(input_path)))
+    return complete_path
+
+
+@pytest.mark.parametrize("chunk_size", [3, 500])
+def test_build(input_path, complete_path, tmp_path, chunk_size):
+    """The chunks should be laid out exactly as all rows at once"""
+    output_path = str(tmp_path.joinpath("result.pdf"))
+    events = read_events(input_path)
+    pages = ChunkedRenderer(output_path, Initializer.document_layout, chunk_size).build(
+        events
+    )
+    assert pages == PdfFileReader(complete_path).getNumPages()
+    assert extract_texts(output_path) == extract_texts(complete_path)
+    assert not any(hasattr(event, "_full_row") for event in events)
+
+
+def test_build_single_pass(input_path, complete_path, tmp_path):
+    output_path = str(tmp_path.joinpath("result.pdf"))
+    pages = ChunkedRenderer(
+        output_path, Initializer.document_layout, 3, single_pass=True
+    ).build(read_events(input_path))
+    assert pages == PdfFileReader(complete_path).getNumPages()
+    assert not tmp_path.joinpath("result.pdf").exists()
+    for page_number in range(1, pages + 1):
+        single_page_path = PostProcessor.single_page_path(output_path, page_number)
+        assert PdfFileReader(single_page_path).getNumPages() == 1
@@ -0,0 +1,101 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from pyxml2pdf.Core.DownloadStream import DownloadStream
+from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.Streamer import Streamer
+
+FIRST_PART = b"<kursexport><kurs><Kursnummer>1</Kursnummer></kurs>"
+SECOND_PART = b"<kurs><Kursnummer>2</Kursnummer></kurs></kursexport>"
+
+
+class SlowFeedHandler(BaseHTTPRequestHandler):
+    """Serve a feed in two parts and send the second part only when released"""
+
+    release = threading.Event()
+    content = FIRST_PART + SECOND_PART
+
+    def do_GET(self):
+        if self.path.endswith("missing.xml"):
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(self.content)))
+        self.end_headers()
+        split = len(FIRST_PART) if self.content.startswith(FIRST_PART) else 0
+        self.wfile.write(self.content[:split])
+        self.wfile.flush()
+        self.release.wait(10)
+        self.wfile.write(self.content[split:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Start a local http server serving the slow feed"""
+    SlowFeedHandler.release = threading.Event()
+    SlowFeedHandler.content = FIRST_PART + SECOND_PART
+    server = HTTPServer(("127.0.0.1", 0), SlowFeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d" % server.server_port
+    SlowFeedHandler.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_stream_parses_while_downloading(server_url, tmp_path):
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    numbers = []
+    with DownloadStream(server_url + "/kursdaten.xml", str(output_path)) as stream:
+        for course in Streamer(stream):
+            numbers.append(course.findtext("Kursnummer"))
+            # The second course is sent only after the first one was parsed.
+            SlowFeedHandler.release.set()
+    assert numbers == ["1", "2"]
+    assert output_path.read_bytes() == FIRST_PART + SECOND_PART
+    assert not tmp_path.joinpath("kursdaten.xml.part").exists()
+
+
+def test_download_stream_without_copy(server_url):
+    SlowFeedHandler.release.set()
+    with DownloadStream(server_url + "/kursdaten.xml") as stream:
+        assert stream.read() == FIRST_PART + SECOND_PART
+
+
+def test_download_stream_replaces_cache(server_url, tmp_path):
+    SlowFeedHandler.release.set()
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    cache_path = tmp_path.joinpath("kursdaten.xml.cache")
+    cache_path.write_text("{}")
+    with DownloadStream(server_url + "/kursdaten.xml", str(output_path)) as stream:
+        stream.read()
+    assert not cache_path.exists()
+
+
+def test_download_stream_raises_errors(server_url, tmp_path):
+    output_path = tmp_path.joinpath("missing.xml")
+    with DownloadStream(server_url + "/missing.xml", str(output_path)) as stream:
+        with pytest.raises(requests.exceptions.HTTPError):
+            stream.read()
+    assert not output_path.exists()
+
+
+def test_download_stream_conversion(server_url, tmp_path):
+    SlowFeedHandler.release.set()
+    with open("test/test_data/testdata.xml", "rb") as xml_file:
+        SlowFeedHandler.content = xml_file.read()
+    with DownloadStream(server_url + "/kursdaten.xml") as stream:
+        Initializer(
+            stream,
+            str(tmp_path.joinpath("kursdaten.pdf")),
+            "test/test_data/testdata_prop.properties",
+            streaming=True,
+        )
+    assert tmp_path.joinpath("kursdaten_seite_01.pdf").exists()
@@ -1,7 +1,79 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 import pytest
+import requests
 
 from pyxml2pdf.Core.Downloader import Downloader
 
+XML_CONTENT = b"<kursexport><kurs><Kursnummer>1</Kursnummer></kurs></kursexport>"
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 21 Oct 2020 07:28:00 GMT"
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serve :data:`XML_CONTENT` like a web server supporting conditional requests
+
+    The attributes :attr:`interruptions` and :attr:`send_length` allow to simulate
+    flaky connections and chunked or compressed responses without known length.
+    """
+
+    requests = []
+    interruptions = 0
+    send_length = True
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        if "Range" in self.headers and self.headers.get("If-Range") == ETAG:
+            start = int(self.headers["Range"][len("bytes=") : -1])
+            self.send_response(206)
+            self.send_header(
+                "Content-Range",
+                "bytes %d-%d/%d" % (start, len(XML_CONTENT) - 1, len(XML_CONTENT)),
+            )
+        else:
+            self.send_response(200)
+        content = XML_CONTENT[start:]
+        self.send_header("Content-Type", "application/xml")
+        if self.send_length:
+            self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        if FeedHandler.interruptions:
+            FeedHandler.interruptions -= 1
+            content = content[:10]
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Write the downloaded content in small chunks to keep the interrupted parts"""
+    monkeypatch.setattr(Downloader, "_chunk_size", 5)
+
+
+@pytest.fixture
+def feed_url():
+    """Start a local http server serving the test feed"""
+    FeedHandler.requests = []
+    FeedHandler.interruptions = 0
+    FeedHandler.send_length = True
+    server = HTTPServer(("127.0.0.1", 0), FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d/kursdaten.xml" % server.server_port
+    server.shutdown()
+    server.server_close()
+
 
 @pytest.mark.online
 def test_downloader():
@@ -10,3 +82,95 @@ def test_downloader():
         "template.xml",
         "test/test_data/test_download",
     )
+
+
+def test_downloader_local(feed_url, tmp_path):
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    Downloader(feed_url, str(output_path))
+    assert output_path.read_bytes() == XML_CONTENT
+
+
+def test_downloader_sends_validators(feed_url, tmp_path):
+    """A second download should be conditional on the first download's validators"""
+    output_path = str(tmp_path.joinpath("kursdaten.xml"))
+    Downloader(feed_url, output_path)
+    Downloader(feed_url, output_path)
+    assert "If-None-Match" not in FeedHandler.requests[0]
+    assert FeedHandler.requests[1]["If-None-Match"] == ETAG
+    assert FeedHandler.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_downloader_reuses_unmodified_file(feed_url, tmp_path):
+    """On 304 Not Modified the local file should be kept untouched"""
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    Downloader(feed_url, str(output_path))
+    output_path.write_bytes(b"local")
+    Downloader(feed_url, str(output_path))
+    assert output_path.read_bytes() == b"local"
+
+
+def test_downloader_without_local_file(feed_url, tmp_path):
+    """Without the local file the validators should not be sent"""
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    Downloader(feed_url, str(output_path))
+    output_path.unlink()
+    Downloader(feed_url, str(output_path))
+    assert "If-None-Match" not in FeedHandler.requests[1]
+    assert output_path.read_bytes() == XML_CONTENT
+
+
+def test_downloader_without_cache(feed_url, tmp_path):
+    output_path = str(tmp_path.joinpath("kursdaten.xml"))
+    Downloader(feed_url, output_path, cache=False)
+    Downloader(feed_url, output_path, cache=False)
+    assert "If-None-Match" not in FeedHandler.requests[1]
+    assert not tmp_path.joinpath("kursdaten.xml.cache").exists()
+
+
+def test_downloader_resumes_interrupted_transfer(feed_url, small_chunks, tmp_path):
+    """An interrupted transfer should be continued where it stopped"""
+    FeedHandler.interruptions = 2
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    Downloader(feed_url, str(output_path))
+    assert output_path.read_bytes() == XML_CONTENT
+    assert "Range" not in FeedHandler.requests[0]
+    assert FeedHandler.requests[1]["Range"] == "bytes=10-"
+    assert FeedHandler.requests[2]["Range"] == "bytes=20-"
+    assert not tmp_path.joinpath("kursdaten.xml.part").exists()
+
+
+def test_downloader_keeps_partial_file(feed_url, small_chunks, tmp_path):
+    """A failed download should not touch the output file but be resumable later"""
+    FeedHandler.interruptions = 1
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        Downloader(feed_url, str(output_path), retries=0)
+    assert not output_path.exists()
+    assert tmp_path.joinpath("kursdaten.xml.part").read_bytes() == XML_CONTENT[:10]
+    Downloader(feed_url, str(output_path))
+    assert output_path.read_bytes() == XML_CONTENT
+    assert FeedHandler.requests[1]["Range"] == "bytes=10-"
+
+
+def test_downloader_without_content_length(feed_url, tmp_path):
+    FeedHandler.send_length = False
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    Downloader(feed_url, str(output_path))
+    assert output_path.read_bytes() == XML_CONTENT
+
+
+def test_downloader_checksum(feed_url, tmp_path):
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    Downloader(
+        feed_url, str(output_path), checksum=hashlib.sha256(XML_CONTENT).hexdigest()
+    )
+    assert output_path.read_bytes() == XML_CONTENT
+
+
+def test_downloader_checksum_mismatch(feed_url, tmp_path):
+    """A download not matching the checksum should never reach the output file"""
+    output_path = tmp_path.joinpath("kursdaten.xml")
+    with pytest.raises(IOError):
+        Downloader(feed_url, str(output_path), checksum="0" * 64)
+    assert not output_path.exists()
+    assert not tmp_path.joinpath("kursdaten.xml.part").exists()
@@ -1,7 +1,7 @@
 import re
 from datetime import date
 from typing import Callable, Dict
-from xml.etree.ElementTree import Element
+from xml.etree.ElementTree import Element, SubElement
 
 import pytest
 from hypothesis import given
@@ -26,6 +26,27 @@ def test_element() -> Element:
     return test_element
 
 
+@pytest.fixture
+def full_element() -> Element:
+    """Create a test element with some children tags of a real event
+
+    :returns: an element
+    """
+    full_element = Element("kurs")
+    for tag, content in (
+        ("Kursnummer", "B1902507"),
+        ("Bezeichnung", "Spandauer Forst + Tegeler See"),
+        ("Kategorie", "Wandern, Mittelgebirge"),
+        ("Beschreibung", "Wir begleiten die Kuhlake."),
+        ("TerminDatumVon1", "08.12.2019 10:00"),
+        ("Ort1", "Berlin"),
+        ("Kursleiter", "Max Mustermann"),
+        ("Treffpunkt", "Bushaltestelle"),
+    ):
+        SubElement(full_element, tag).text = content
+    return full_element
+
+
 @pytest.fixture
 def subtable_title() -> str:
     """Create a title for a test subtable
@@ -62,24 +83,67 @@ def prerequisites() -> Dict[str, str]:
 def test_event_init(test_event):
     """Test initialization of :py:mod:`Event` and check for all expected members"""
     assert test_event._categories
-    assert test_event._full_row
     assert isinstance(test_event._init_reduced_row, Callable)
     assert isinstance(test_event.get_full_row, Callable)
 
 
-def test_event_parent(test_event):
-    """Test if parent class of :py:mod:`Event` is :py:mod:`Element`"""
-    assert isinstance(test_event, Element)
+def test_event_init_builds_no_rows(test_event):
+    """Rows should only be built when they are requested"""
+    for attribute in ("_full_row", "_full_columns", "_reduced_row", "_date"):
+        with pytest.raises(AttributeError):
+            getattr(test_event, attribute)
+
+
+def test_event_is_slotted(test_event):
+    """Events should be compact records without an instance dictionary"""
+    assert not hasattr(test_event, "__dict__")
+    assert not isinstance(test_event, Element)
+
 
+def test_event_fields(full_element):
+    """Texts of all extracted children tags should be accessible as in the element"""
+    event = Event(full_element)
+    for child in full_element:
+        if child.tag in Event.fields:
+            assert event.findtext(child.tag) == full_element.findtext(child.tag)
 
-def test_event_tag(test_element, test_event):
-    """Test if tag of initialization element of event is properly processed"""
-    assert test_event.tag == test_element.tag
 
+def test_event_repeated_tag():
+    """Of several equal tags the first should count as with findtext"""
+    element = Element("kurs")
+    for categories in ("Familie", "Jugend"):
+        SubElement(element, "Kategorie").text = categories
+    event = Event(element)
+    assert event.findtext("Kategorie") == element.findtext("Kategorie")
+    assert event.categories == ["Familie"]
 
-def test_event_attrib(test_element, test_event):
-    """Test if attributes of initialization element of event is properly processed"""
-    assert test_event.attrib == test_element.attrib
+
+def test_event_ignores_unknown_tags(full_element, test_event):
+    """Texts of not extracted or missing tags should be replaced by the default"""
+    assert Event(full_element).findtext("Treffpunkt") is None
+    assert test_event.findtext("Kursleiter", "") == ""
+
+
+def test_event_interns_repeated_texts(full_element):
+    """Equal texts of repeating tags of different events should be shared"""
+    other_element = Element("kurs")
+    for child in full_element:
+        other_child = SubElement(other_element, child.tag)
+        # Copy the text into a different string object.
+        other_child.text = "".join(list(child.text))
+    event, other_event = Event(full_element), Event(other_element)
+    assert event.findtext("Ort1") is other_event.findtext("Ort1")
+    assert event.categories[0] is other_event.categories[0]
+    assert event.findtext("Beschreibung") is not other_event.findtext("Beschreibung")
+
+
+def test_event_paragraphs_share_fragments():
+    """Paragraphs with equal texts should reuse the parsed fragments"""
+    paragraph = Event.EventParagraph("a) keine<br/>b) keine<br/>c) 0,00 €")
+    other_paragraph = Event.EventParagraph("a) keine<br/>b) keine<br/>c) 0,00 €")
+    assert paragraph.frags is other_paragraph.frags
+    assert paragraph.text == other_paragraph.text
+    assert Event.EventParagraph("<b>keine</b>").frags is not paragraph.frags
 
 
 def test_event_call_get_full_row(test_event, subtable_title):
@@ -110,17 +174,17 @@ def test_event_reduced_rows_column_widths(test_event, subtable_title, table_styl
 
 
 def test_event_reduced_creation(test_event, subtable_title):
-    """Reduced row should be created after full row is requested"""
+    """Reduced row should be created only when it is requested after the full row"""
+    assert test_event.get_full_row(subtable_title)
     with pytest.raises(AttributeError):
         assert test_event._reduced_row
-    assert test_event.get_full_row(subtable_title)
-    assert test_event._reduced_row
+    assert test_event.get_table_row(subtable_title) is test_event._reduced_row
 
 
 def test_event_compare_reduced_row(test_event, subtable_title):
     """Reduced row should contain the same as full up to column 4 but not afterwards"""
-    full_row = test_event.get_full_row(subtable_title)
-    reduced_row = test_event._reduced_row
+    full_row = test_event.get_table_row(subtable_title)
+    reduced_row = test_event.get_table_row(subtable_title)
     assert str(full_row._cellvalues[0][:4]) == str(reduced_row._cellvalues[0][:4])
     assert str(full_row._cellvalues[0][:5]) != str(reduced_row._cellvalues[0][:5])
 
@@ -136,11 +200,52 @@ def test_event_content_reduced_row(test_event, subtable_title):
 
 
 def test_event_get_row(test_event, subtable_title):
-    """Before call to table row no reduced table row should be available"""
+    """Before the second call to table row no reduced table row should be available"""
+    assert test_event.get_table_row(subtable_title) is test_event._full_row
     with pytest.raises(AttributeError):
         assert test_event._reduced_row
-    assert test_event.get_table_row(subtable_title)
-    assert test_event._reduced_row
+    assert test_event.get_table_row(subtable_title) is test_event._reduced_row
+
+
+def test_event_reduced_row_refers_to_full_row(test_event, subtable_title):
+    """The reduced row should refer to the subtable containing the full row"""
+    test_event.get_table_row(subtable_title)
+    reduced_row = test_event.get_table_row("Other subtable")
+    assert reduced_row._cellvalues[0][-1].text.endswith(
+        "<b><i>" + subtable_title + "</i></b>."
+    )
+
+
+def test_event_skip_full_row(test_event, subtable_title):
+    """Skipping the full row should not build it but refer to its subtable"""
+    test_event.skip_full_row(subtable_title)
+    reduced_row = test_event.get_table_row("Other subtable")
+    assert not hasattr(test_event, "_full_row")
+    assert reduced_row._cellvalues[0][-1].text.endswith(
+        "<b><i>" + subtable_title + "</i></b>."
+    )
+
+
+def test_event_get_table_cells(test_event, subtable_title):
+    """The cells should be handed out like the rows but without building them"""
+    full_cells = test_event.get_table_cells(subtable_title)
+    reduced_cells = test_event.get_table_cells("Other subtable")
+    assert len(full_cells) == 7
+    assert len(reduced_cells) == 5
+    assert reduced_cells[:4] == full_cells[:4]
+    assert reduced_cells[-1].text.endswith("<b><i>" + subtable_title + "</i></b>.")
+    assert not hasattr(test_event, "_full_row")
+    assert not hasattr(test_event, "_reduced_row")
+
+
+def test_event_reset_table_rows(test_event, subtable_title):
+    """After a reset the full row should be handed out once more"""
+    full_row = test_event.get_table_row(subtable_title)
+    reduced_row = test_event.get_table_row(subtable_title)
+    test_event.reset_table_rows()
+    assert test_event.get_table_row(subtable_title) is full_row
+    assert test_event.get_table_row(subtable_title) is not reduced_row
+    assert len(test_event._reduced_row._cellvalues[0]) == 5
 
 
 def test_concatenate_tags_content(test_event):
@@ -207,3 +312,34 @@ def test_remove_country(test_event, dat):
     assert re.sub(
         "[0-9]{4,}", test_event._remove_century, dat.strftime("%d.%m.%Y")
     ) == dat.strftime("%d.%m.%y")
+
+
+@pytest.mark.parametrize(
+    "dates,expected",
+    [
+        ({}, ""),
+        ({"TerminDatumVon1": "08.12.2019 00:00"}, "08.12.19 "),
+        (
+            {"TerminDatumVon1": "08.12.2019 10:00", "TerminDatumBis1": "09.12.2019"},
+            "08.12.19 10:00 - 09.12.19",
+        ),
+        (
+            {"TerminDatumVon1": "08.12.2019", "TerminDatumVon3": "10.12.2019"},
+            "08.12.19<br/>und<br/>10.12.19",
+        ),
+        ({"TerminDatumVon1": "31.12.2099 00:00"}, "auf Anfrage"),
+    ],
+)
+def test_event_date(dates, expected):
+    element = Element("kurs")
+    for tag, date_text in dates.items():
+        SubElement(element, tag).text = date_text
+    assert Event(element).date == expected
+
+
+def test_event_format_dates(full_element):
+    events = [Event(full_element) for _ in range(3)]
+    expected = Event(full_element).date
+    Event.format_dates(events)
+    assert [event._date for event in events] == [expected] * 3
+    assert events[0]._date is events[2]._date
@@ -0,0 +1,94 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
+from reportlab.pdfbase.ttfonts import TTFont
+
+from pyxml2pdf.PdfVisualisation.FontRegistry import FontRegistry
+
+
+@pytest.fixture
+def unregistered(monkeypatch):
+    """Pretend the fonts were not registered yet in this process"""
+    monkeypatch.setattr(FontRegistry, "_registered", False)
+
+
+@pytest.fixture
+def cache_path(monkeypatch, tmp_path):
+    path = str(tmp_path.joinpath("fonts.pickle"))
+    monkeypatch.setattr(FontRegistry, "cache_path", path)
+    return path
+
+
+def forbid_parsing(monkeypatch):
+    def parse(*args):
+        raise AssertionError("Fonts should not be parsed again.")
+
+    monkeypatch.setattr(TTFont, "__init__", parse)
+
+
+def test_register(unregistered):
+    FontRegistry.register()
+    for name in FontRegistry.fonts:
+        assert getFont(name).fontName == name
+
+
+def test_register_once(unregistered, monkeypatch):
+    FontRegistry.register()
+    forbid_parsing(monkeypatch)
+    FontRegistry.register()
+
+
+def test_register_from_cache(unregistered, cache_path, monkeypatch):
+    FontRegistry.register()
+    width = stringWidth("Wandern im Hochgebirge", "NewsGothBT_Bold", 6.5)
+    monkeypatch.setattr(FontRegistry, "_registered", False)
+    forbid_parsing(monkeypatch)
+    FontRegistry.register()
+    assert stringWidth("Wandern im Hochgebirge", "NewsGothBT_Bold", 6.5) == width
+
+
+def test_register_outdated_cache(unregistered, cache_path, monkeypatch):
+    """A cache for other font files should be ignored"""
+    FontRegistry.register()
+    monkeypatch.setattr(FontRegistry, "_registered", False)
+    monkeypatch.setattr(FontRegistry, "_cache_key", lambda: ("other",))
+    parsed = []
+    original_init = TTFont.__init__
+    monkeypatch.setattr(
+        TTFont,
+        "__init__",
+        lambda self, *args: parsed.append(args) or original_init(self, *args),
+    )
+    FontRegistry.register()
+    assert len(parsed) == len(FontRegistry.fonts)
+
+
+def test_import_registers_no_fonts():
+    """The fonts should only be registered on first use instead of on import"""
+    script = (
+        "import pyxml2pdf.Core.events, pyxml2pdf.Core.Initializer\n"
+        "from reportlab.pdfbase.pdfmetrics import getRegisteredFontNames\n"
+        "from pyxml2pdf.PdfVisualisation.FontRegistry import FontRegistry\n"
+        "assert not FontRegistry._registered\n"
+        "assert not set(FontRegistry.fonts) & set(getRegisteredFontNames())\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+@pytest.mark.parametrize(
+    "content", [b"corrupt", pickle.dumps(("key",)), pickle.dumps(("key", [1]))]
+)
+def test_register_corrupt_cache(unregistered, cache_path, monkeypatch, content):
+    """A cache which cannot be loaded should be removed and the fonts parsed"""
+    with open(cache_path, "wb") as cache_file:
+        cache_file.write(content)
+    monkeypatch.setattr(FontRegistry, "_cache_key", lambda: "key")
+    monkeypatch.setattr(FontRegistry, "_store_cache", lambda fonts: None)
+    FontRegistry.register()
+    assert not os.path.exists(cache_path)
+    for name in FontRegistry.fonts:
+        assert getFont(name).fontName == name
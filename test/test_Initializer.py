@@ -1,5 +1,8 @@
+import os
+
 import pytest
 
+from benchmarks.feeds import generate_feed
 from pyxml2pdf.Core.Initializer import Initializer
 
 init_testcases = [None, "one_string", ("one_string", "two_strings")]
@@ -21,3 +24,246 @@ def test_initializer():
     output_filename = "testdata.pdf"
     output_path = output_folder + output_filename
     Initializer(input_path, output_path, properties_path)
+
+
+def test_initializer_streaming(tmp_path):
+    output_path = str(tmp_path.joinpath("testdata.pdf"))
+    Initializer(
+        "test/test_data/testdata.xml",
+        output_path,
+        "test/test_data/testdata_prop.properties",
+        streaming=True,
+    )
+    assert tmp_path.joinpath("testdata_seite_01.pdf").exists()
+
+
+def test_initializer_single_pass(tmp_path):
+    output_path = str(tmp_path.joinpath("testdata.pdf"))
+    Initializer(
+        "test/test_data/testdata.xml",
+        output_path,
+        "test/test_data/testdata_prop.properties",
+        single_pass=True,
+    )
+    assert tmp_path.joinpath("testdata_seite_01.pdf").exists()
+    assert not tmp_path.joinpath("testdata.pdf").exists()
+
+
+def test_initializer_without_splitting(tmp_path):
+    output_path = str(tmp_path.joinpath("testdata.pdf"))
+    Initializer(
+        "test/test_data/testdata.xml",
+        output_path,
+        "test/test_data/testdata_prop.properties",
+        split_pages=False,
+    )
+    assert tmp_path.joinpath("testdata.pdf").exists()
+    assert not tmp_path.joinpath("testdata_seite_01.pdf").exists()
+
+
+def test_initializer_report(tmp_path):
+    reports = []
+    Initializer(
+        "test/test_data/testdata.xml",
+        str(tmp_path.joinpath("testdata.pdf")),
+        "test/test_data/testdata_prop.properties",
+        report_hook=reports.append,
+    )
+    assert set(reports[0]["stages"]) == {
+        "setup",
+        "parse",
+        "sort",
+        "collect",
+        "build",
+        "postprocess",
+    }
+    assert reports[0]["counts"]["events"] == 9
+    assert reports[0]["counts"]["pages"] == 1
+    assert reports[0]["input"] == {
+        "path": "test/test_data/testdata.xml",
+        "size": os.path.getsize("test/test_data/testdata.xml"),
+    }
+
+
+def test_initializer_rows(tmp_path):
+    """The rows should be counted as well, if they are collected while laid out"""
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    reports = []
+    for options in ({}, {"segments": True}, {"chunk_size": 3}):
+        Initializer(
+            input_path,
+            str(tmp_path.joinpath("feed.pdf")),
+            "test/test_data/testdata_prop.properties",
+            split_pages=False,
+            report_hook=reports.append,
+            **options,
+        )
+    rows = [report["counts"]["rows"] for report in reports]
+    assert rows[0] > 0
+    assert rows == [rows[0]] * 3
+    assert ["collect" in report["stages"] for report in reports] == [
+        True,
+        False,
+        False,
+    ]
+
+
+def test_initializer_row_cache(tmp_path):
+    """The second run should reuse all rows laid out in the first run"""
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    row_cache_path = str(tmp_path.joinpath("feed.xml.rows"))
+    reports = []
+    for _ in range(2):
+        Initializer(
+            input_path,
+            str(tmp_path.joinpath("feed.pdf")),
+            "test/test_data/testdata_prop.properties",
+            split_pages=False,
+            row_cache_path=row_cache_path,
+            report_hook=reports.append,
+        )
+    assert tmp_path.joinpath("feed.xml.rows").exists()
+    assert reports[0]["counts"]["cached_rows"] == 0
+    assert reports[1]["counts"]["cached_rows"] > 0
+
+
+def test_initializer_row_cache_segments(tmp_path):
+    """The layouts of the worker processes should be stored for the next run"""
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    row_cache_path = str(tmp_path.joinpath("feed.xml.rows"))
+    reports = []
+    for _ in range(2):
+        Initializer(
+            input_path,
+            str(tmp_path.joinpath("feed.pdf")),
+            "test/test_data/testdata_prop.properties",
+            workers=2,
+            split_pages=False,
+            segments=True,
+            row_cache_path=row_cache_path,
+            report_hook=reports.append,
+        )
+    assert tmp_path.joinpath("feed.xml.rows").exists()
+    assert reports[1]["counts"]["cached_rows"] > reports[0]["counts"]["cached_rows"]
+
+
+def test_initializer_incremental(tmp_path):
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    reports = []
+    for _ in range(2):
+        Initializer(
+            input_path,
+            str(tmp_path.joinpath("feed.pdf")),
+            "test/test_data/testdata_prop.properties",
+            incremental=True,
+            report_hook=reports.append,
+        )
+    assert tmp_path.joinpath("feed_seite_01.pdf").exists()
+    assert reports[0]["counts"]["reused_pages"] == 0
+    assert reports[1]["counts"]["reused_pages"] == reports[1]["counts"]["pages"]
+    assert "postprocess" not in reports[1]["stages"]
+
+
+def test_initializer_segments(tmp_path):
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    reports = []
+    Initializer(
+        input_path,
+        str(tmp_path.joinpath("feed.pdf")),
+        "test/test_data/testdata_prop.properties",
+        segments=True,
+        report_hook=reports.append,
+    )
+    assert tmp_path.joinpath(
+        "feed_seite_%02d.pdf" % reports[0]["counts"]["pages"]
+    ).exists()
+
+
+@pytest.mark.parametrize("options", [dict(single_pass=True), dict(incremental=True)])
+def test_initializer_segments_exclusive(tmp_path, options):
+    with pytest.raises(ValueError):
+        Initializer(
+            "test/test_data/testdata.xml",
+            str(tmp_path.joinpath("testdata.pdf")),
+            "test/test_data/testdata_prop.properties",
+            segments=True,
+            **options,
+        )
+
+
+def test_initializer_long_tables(tmp_path):
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    reports = []
+    for long_tables in (False, True):
+        Initializer(
+            input_path,
+            str(tmp_path.joinpath("feed.pdf")),
+            "test/test_data/testdata_prop.properties",
+            split_pages=False,
+            long_tables=long_tables,
+            report_hook=reports.append,
+        )
+    assert reports[1]["counts"]["rows"] == reports[0]["counts"]["rows"]
+    # The headings are repeated on each page, which might add further pages.
+    assert reports[1]["counts"]["pages"] >= reports[0]["counts"]["pages"]
+
+
+@pytest.mark.parametrize(
+    "options", [dict(segments=True), dict(incremental=True), dict(chunk_size=5)]
+)
+def test_initializer_long_tables_exclusive(tmp_path, options):
+    with pytest.raises(ValueError):
+        Initializer(
+            "test/test_data/testdata.xml",
+            str(tmp_path.joinpath("testdata.pdf")),
+            "test/test_data/testdata_prop.properties",
+            long_tables=True,
+            **options,
+        )
+
+
+def test_initializer_chunked(tmp_path):
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 20)
+    reports = []
+    Initializer(
+        input_path,
+        str(tmp_path.joinpath("feed.pdf")),
+        "test/test_data/testdata_prop.properties",
+        chunk_size=5,
+        report_hook=reports.append,
+    )
+    assert tmp_path.joinpath(
+        "feed_seite_%02d.pdf" % reports[0]["counts"]["pages"]
+    ).exists()
+
+
+def test_initializer_chunked_streams(tmp_path, monkeypatch):
+    """Chunked builds should not parse the whole xml tree at once"""
+    monkeypatch.setattr("pyxml2pdf.Core.Initializer.parse", None)
+    Initializer(
+        "test/test_data/testdata.xml",
+        str(tmp_path.joinpath("testdata.pdf")),
+        "test/test_data/testdata_prop.properties",
+        split_pages=False,
+        chunk_size=5,
+    )
+    assert tmp_path.joinpath("testdata.pdf").exists()
+
+
+@pytest.mark.parametrize("options", [dict(segments=True), dict(incremental=True)])
+def test_initializer_chunked_exclusive(tmp_path, options):
+    with pytest.raises(ValueError):
+        Initializer(
+            "test/test_data/testdata.xml",
+            str(tmp_path.joinpath("testdata.pdf")),
+            "test/test_data/testdata_prop.properties",
+            chunk_size=5,
+            **options,
+        )
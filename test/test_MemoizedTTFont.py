@@ -0,0 +1,49 @@
+import pytest
+from hypothesis import given
+from hypothesis.strategies import floats, text
+from reportlab.pdfbase.pdfmetrics import getFont
+from reportlab.pdfbase.ttfonts import TTFont
+
+from pyxml2pdf.PdfVisualisation.FontRegistry import FontRegistry
+from pyxml2pdf.PdfVisualisation.MemoizedTTFont import MemoizedTTFont
+
+FONT_PATH = FontRegistry._path_to_font("NewsGothicBT-Roman.ttf")
+
+
+@pytest.fixture(scope="module")
+def fonts():
+    """Load the same font with and without memoization
+
+    :returns: the memoizing and the plain font
+    """
+    return MemoizedTTFont("Memoized", FONT_PATH), TTFont("Plain", FONT_PATH)
+
+
+@given(text=text(), size=floats(min_value=1, max_value=100))
+def test_memoized_widths_equal_plain_widths(fonts, text, size):
+    memoized_font, plain_font = fonts
+    for _ in range(2):
+        assert memoized_font.stringWidth(text, size) == plain_font.stringWidth(
+            text, size
+        )
+
+
+def test_memoized_width_of_bytes(fonts):
+    memoized_font, plain_font = fonts
+    assert memoized_font.stringWidth("Höhle".encode(), 6.5) == plain_font.stringWidth(
+        "Höhle", 6.5
+    )
+
+
+def test_cache_size(fonts, monkeypatch):
+    memoized_font = fonts[0]
+    monkeypatch.setattr(memoized_font, "cache_size", 2)
+    for word in ("Wandern", "im", "Hochgebirge"):
+        memoized_font.stringWidth(word, 6.5)
+    assert len(memoized_font._widths) <= 2
+
+
+def test_registered_fonts_are_memoized():
+    FontRegistry.register()
+    for name in FontRegistry.fonts:
+        assert isinstance(getFont(name), MemoizedTTFont)
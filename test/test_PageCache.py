@@ -0,0 +1,87 @@
+import pytest
+from PyPDF2 import PdfFileReader
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table
+from reportlab.platypus.flowables import KeepTogether
+
+from pyxml2pdf.Core.PageCache import PageCache
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+
+layout = dict(
+    pagesize=(200, 120), topMargin=0, bottomMargin=0, leftMargin=0, rightMargin=0
+)
+
+
+def make_rows(texts):
+    style = getSampleStyleSheet()["Normal"]
+    return [KeepTogether(Table([[Paragraph(text, style)]])) for text in texts]
+
+
+def page_texts(path):
+    pdf = PdfFileReader(path)
+    return [pdf.getPage(page).extractText() for page in range(pdf.getNumPages())]
+
+
+@pytest.fixture
+def texts():
+    return ["Zeile %d" % row for row in range(60)]
+
+
+@pytest.fixture
+def output_path(tmp_path):
+    return str(tmp_path.joinpath("result.pdf"))
+
+
+def build_reference(texts, tmp_path):
+    reference_path = str(tmp_path.joinpath("reference.pdf"))
+    SimpleDocTemplate(reference_path, **layout).build(make_rows(texts))
+    return page_texts(reference_path)
+
+
+def test_first_build(texts, output_path, tmp_path):
+    page_cache = PageCache(output_path, layout)
+    pages = page_cache.build(make_rows(texts))
+    assert page_cache.rendered_pages == pages
+    assert page_cache.reused_pages == 0
+    assert page_texts(output_path) == build_reference(texts, tmp_path)
+    assert tmp_path.joinpath("result_seite_%02d.pdf" % pages).exists()
+
+
+def test_unchanged_build(texts, output_path):
+    pages = PageCache(output_path, layout).build(make_rows(texts))
+    page_cache = PageCache(output_path, layout)
+    assert page_cache.build(make_rows(texts)) == pages
+    assert page_cache.rendered_pages == 0
+    assert page_cache.reused_pages == pages
+
+
+def test_changed_row(texts, output_path, tmp_path):
+    pages = PageCache(output_path, layout).build(make_rows(texts))
+    texts[30] = "Zeile 30 ist so lang, dass sie über mehrere Zeilen umgebrochen wird."
+    page_cache = PageCache(output_path, layout)
+    page_cache.build(make_rows(texts))
+    assert 0 < page_cache.rendered_pages < pages
+    assert page_cache.reused_pages > 0
+    assert page_texts(output_path) == build_reference(texts, tmp_path)
+
+
+def test_shorter_result(texts, output_path, tmp_path):
+    pages = PageCache(output_path, layout).build(make_rows(texts))
+    shorter_pages = PageCache(output_path, layout).build(make_rows(texts[:20]))
+    assert shorter_pages < pages
+    assert page_texts(output_path) == build_reference(texts[:20], tmp_path)
+    assert not tmp_path.joinpath("result_seite_%02d.pdf" % pages).exists()
+    assert len(list(tmp_path.joinpath("result_pages").glob("*.pdf"))) == shorter_pages
+
+
+def test_single_pages_rotated(texts, output_path):
+    PageCache(output_path, layout).build(make_rows(texts), multi_page=False)
+    page = PdfFileReader(PostProcessor.single_page_path(output_path, 1)).getPage(0)
+    assert page["/Rotate"] == PostProcessor.rotation
+
+
+def test_other_layout(texts, output_path):
+    PageCache(output_path, layout).build(make_rows(texts))
+    page_cache = PageCache(output_path, dict(layout, pagesize=(200, 150)))
+    page_cache.build(make_rows(texts))
+    assert page_cache.reused_pages == 0
@@ -0,0 +1,57 @@
+import pytest
+from PyPDF2.pdf import PdfFileReader
+from reportlab.pdfgen.canvas import Canvas
+
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+
+
+@pytest.fixture
+def multipage_pdf(tmp_path) -> str:
+    """Create a PDF with seven numbered pages
+
+    :returns: the path to the PDF
+    """
+    path = str(tmp_path.joinpath("multipage.pdf"))
+    canvas = Canvas(path, invariant=True)
+    for page_number in range(7):
+        canvas.drawString(100, 100, "Seite %d" % (page_number + 1))
+        canvas.showPage()
+    canvas.save()
+    return path
+
+
+def test_divide_pages():
+    assert PostProcessor._divide_pages(7, 3) == [range(0, 2), range(2, 4), range(4, 7)]
+
+
+def test_finalize_print_preparation(multipage_pdf, tmp_path):
+    PostProcessor(multipage_pdf).finalize_print_preparation()
+    for page_number in range(1, 8):
+        page = PdfFileReader(
+            str(tmp_path.joinpath("multipage_seite_%02d.pdf" % page_number))
+        ).getPage(0)
+        assert page.get("/Rotate") == -90
+
+
+@pytest.mark.parametrize("workers", [2, 3, 16])
+def test_parallel_print_preparation(multipage_pdf, tmp_path, workers):
+    """Splitting in parallel should result in the same files as splitting serially"""
+    PostProcessor(multipage_pdf).finalize_print_preparation()
+    serial_results = [
+        tmp_path.joinpath("multipage_seite_%02d.pdf" % page_number).read_bytes()
+        for page_number in range(1, 8)
+    ]
+    PostProcessor(multipage_pdf, workers).finalize_print_preparation()
+    assert [
+        tmp_path.joinpath("multipage_seite_%02d.pdf" % page_number).read_bytes()
+        for page_number in range(1, 8)
+    ] == serial_results
+
+
+def test_merge_segments(multipage_pdf, tmp_path):
+    merged_path = str(tmp_path.joinpath("merged.pdf"))
+    assert PostProcessor.merge_segments([multipage_pdf] * 2, merged_path) == 14
+    merged = PdfFileReader(merged_path)
+    assert merged.getNumPages() == 14
+    assert "Seite 7" in merged.getPage(13).extractText()
+    assert "Seite 1" in merged.getPage(7).extractText()
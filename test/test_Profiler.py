@@ -0,0 +1,57 @@
+import json
+import tracemalloc
+
+import pytest
+
+from pyxml2pdf.Core.Profiler import Profiler
+
+
+def test_profiler_stage():
+    with Profiler() as profiler:
+        with profiler.stage("test"):
+            sum(range(1000))
+    measurements = profiler.report["stages"]["test"]
+    assert measurements["wall_time"] > 0
+    assert measurements["cpu_time"] >= 0
+    assert "peak_memory" not in measurements
+
+
+def test_profiler_hook():
+    reports = []
+    with Profiler(hook=reports.append) as profiler:
+        with profiler.stage("allocate"):
+            data = [0] * 100000
+        profiler.count("items", len(data))
+    assert not tracemalloc.is_tracing()
+    assert reports[0]["counts"] == {"items": 100000}
+    assert reports[0]["stages"]["allocate"]["peak_memory"] >= 800000
+
+
+def test_profiler_report_path(tmp_path):
+    report_path = tmp_path.joinpath("report.json")
+    with Profiler(str(report_path)) as profiler:
+        with profiler.stage("test"):
+            pass
+    assert set(json.loads(report_path.read_text())["stages"]) == {"test"}
+
+
+def test_profiler_failed_conversion():
+    """Reports should only be handed over for completed conversions"""
+    reports = []
+    with pytest.raises(ValueError):
+        with Profiler(hook=reports.append) as profiler:
+            with profiler.stage("test"):
+                raise ValueError
+    assert "test" in profiler.report["stages"]
+    assert not reports
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiler_describe_input(tmp_path):
+    input_path = tmp_path.joinpath("input.xml")
+    input_path.write_text("<kurse/>")
+    with Profiler() as profiler:
+        profiler.describe_input(str(input_path))
+        profiler.count("events", 0)
+    assert profiler.report["input"] == {"path": str(input_path), "size": 8}
+    assert profiler.report["counts"] == {"events": 0}
@@ -0,0 +1,129 @@
+import pytest
+from reportlab.platypus.paragraph import Paragraph
+
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.RowCache import RowCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path.joinpath("rows.pickle"))
+
+
+def wrap_row(row_cache, texts, width=50.0):
+    paragraphs = [
+        Event.EventParagraph(text, layouts)
+        for text, layouts in zip(texts, row_cache.cell_layouts(texts))
+    ]
+    return [paragraph.wrap(width, 1000) for paragraph in paragraphs]
+
+
+def test_cell_layouts_per_cell():
+    row_cache = RowCache()
+    layouts = row_cache.cell_layouts(["Kletterkurs", "Hochtour"])
+    assert layouts == [{}, {}]
+    assert row_cache.cell_layouts(["Kletterkurs", "Hochtour"]) is layouts
+    assert row_cache.hits == 1
+
+
+def test_wrap_once_per_width(monkeypatch):
+    row_cache = RowCache()
+    (layouts,) = row_cache.cell_layouts(["Wandern im Hochgebirge"])
+    paragraph = Event.EventParagraph("Wandern im Hochgebirge", layouts)
+    size = paragraph.wrap(30, 1000)
+    monkeypatch.setattr(Paragraph, "breakLines", None)
+    assert paragraph.wrap(30, 1000) == size
+    assert list(layouts) == [30]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Wandern im Hochgebirge mit Übernachtung auf der Hütte",
+        "<b>Wandern</b> im Hochgebirge mit Übernachtung auf der Hütte",
+    ],
+)
+def test_wrap_like_fresh_paragraph(text):
+    """A paragraph wrapped from the cache should be in the state of a fresh one"""
+    (layouts,) = RowCache().cell_layouts([text])
+    Event.EventParagraph(text, layouts).wrap(30, 1000)
+    cached_paragraph = Event.EventParagraph(text, layouts)
+    fresh_paragraph = Event.EventParagraph(text)
+    assert cached_paragraph.wrap(30, 1000) == fresh_paragraph.wrap(30, 1000)
+    assert vars(cached_paragraph).keys() == vars(fresh_paragraph).keys()
+    for name in (
+        "_wrapWidths",
+        "height",
+        "width",
+        "_width_max",
+        "_splitLongWordCount",
+        "_hyphenations",
+    ):
+        assert getattr(cached_paragraph, name) == getattr(fresh_paragraph, name)
+    # Reportlab replaces the fragments of texts with markup by the broken words.
+    assert repr(cached_paragraph.frags) == repr(fresh_paragraph.frags)
+
+
+def test_store_and_load(cache_path, monkeypatch):
+    texts = ["Kletterkurs", "Wandern im Hochgebirge"]
+    row_cache = RowCache(cache_path)
+    sizes = wrap_row(row_cache, texts)
+    row_cache.store()
+    monkeypatch.setattr(Paragraph, "breakLines", None)
+    loaded_row_cache = RowCache(cache_path)
+    assert wrap_row(loaded_row_cache, texts) == sizes
+    assert loaded_row_cache.hits == 1
+
+
+def test_store_only_used_rows(cache_path):
+    row_cache = RowCache(cache_path)
+    wrap_row(row_cache, ["Kletterkurs"])
+    row_cache.store()
+    row_cache = RowCache(cache_path)
+    wrap_row(row_cache, ["Hochtour"])
+    row_cache.store()
+    row_cache = RowCache(cache_path)
+    row_cache.cell_layouts(["Kletterkurs"])
+    assert row_cache.hits == 0
+
+
+def test_outdated_cache(cache_path, monkeypatch):
+    """A cache for another configuration should be ignored"""
+    row_cache = RowCache(cache_path)
+    wrap_row(row_cache, ["Kletterkurs"])
+    row_cache.store()
+    monkeypatch.setattr(RowCache, "_cache_key", staticmethod(lambda: ("other",)))
+    row_cache = RowCache(cache_path)
+    row_cache.cell_layouts(["Kletterkurs"])
+    assert row_cache.hits == 0
+
+
+def test_broken_cache(cache_path):
+    with open(cache_path, "wb") as cache_file:
+        cache_file.write(b"no pickle")
+    assert RowCache(cache_path).cell_layouts(["Kletterkurs"]) == [{}]
+
+
+def test_store_nothing_used(cache_path):
+    row_cache = RowCache(cache_path)
+    wrap_row(row_cache, ["Kletterkurs"])
+    row_cache.store()
+    RowCache(cache_path).store()
+    row_cache = RowCache(cache_path)
+    row_cache.cell_layouts(["Kletterkurs"])
+    assert row_cache.hits == 1
+
+
+def test_merge_layouts_of_other_process():
+    """Layouts handed over from another cache should be merged cell by cell"""
+    texts = ["Kletterkurs", "Hochtour"]
+    row_cache, other_row_cache = RowCache(), RowCache()
+    wrap_row(row_cache, texts, 50.0)
+    wrap_row(other_row_cache, texts, 80.0)
+    wrap_row(other_row_cache, texts, 80.0)
+    rows, hits = other_row_cache.take_used()
+    assert hits == 1
+    assert other_row_cache.take_used() == ({}, 0)
+    row_cache.merge(rows, hits)
+    assert row_cache.hits == 1
+    assert [set(cell) for cell in row_cache.cell_layouts(texts)] == [{50.0, 80.0}] * 2
@@ -0,0 +1,128 @@
+import io
+import subprocess
+import sys
+import threading
+import zipfile
+
+import pytest
+import requests
+
+from pyxml2pdf.Core.Server import RenderServer
+
+
+@pytest.fixture(scope="module")
+def server() -> RenderServer:
+    """Start a render server for the test data in a background thread
+
+    :returns: the running server
+    """
+    server = RenderServer(
+        ("127.0.0.1", 0),
+        "test/test_data/testdata_prop.properties",
+        workers=1,
+        pending=1,
+        input_folder="test/test_data",
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def server_url(server) -> str:
+    """:returns: the base URL of the server"""
+    return "http://127.0.0.1:%d" % server.server_address[1]
+
+
+@pytest.fixture(scope="module")
+def xml_input() -> bytes:
+    with open("test/test_data/testdata.xml", "rb") as xml_file:
+        return xml_file.read()
+
+
+def test_render_pdf(server_url, xml_input):
+    response = requests.post(server_url + "/pdf", data=xml_input)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+
+def test_render_pages(server_url, xml_input):
+    response = requests.post(server_url + "/pages", data=xml_input)
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
+        names = zip_file.namelist()
+        assert names[0] == "kursdaten_seite_01.pdf"
+        assert zip_file.read(names[0]).startswith(b"%PDF")
+
+
+def test_render_path(server_url):
+    response = requests.get(server_url + "/pdf", params={"path": "testdata.xml"})
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+
+
+@pytest.mark.parametrize(
+    "path, status", [("../../setup.py", 403), ("missing.xml", 404)]
+)
+def test_render_invalid_path(server_url, path, status):
+    response = requests.get(server_url + "/pdf", params={"path": path})
+    assert response.status_code == status
+
+
+def test_render_invalid_xml(server_url):
+    response = requests.post(server_url + "/pdf", data=b"<kursexport><kurs>")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/", "/png"])
+def test_render_unknown_format(server_url, xml_input, path):
+    assert requests.post(server_url + path, data=xml_input).status_code == 404
+
+
+def test_render_without_input(server_url):
+    assert requests.get(server_url + "/pdf").status_code == 400
+
+
+def test_render_busy(server, server_url, xml_input):
+    for _ in range(2):
+        server._slots.acquire()
+    try:
+        response = requests.post(server_url + "/pdf", data=xml_input)
+        assert response.status_code == 503
+    finally:
+        for _ in range(2):
+            server._slots.release()
+
+
+def test_render_too_large(server, server_url, xml_input, monkeypatch):
+    monkeypatch.setattr(server, "max_body_size", len(xml_input) - 1)
+    response = requests.post(server_url + "/pdf", data=xml_input)
+    assert response.status_code == 413
+
+
+def test_render_failure_hides_details(server, server_url, xml_input, monkeypatch):
+    """The reason of a failed conversion should only be logged on the server"""
+
+    def fail(source, pages):
+        raise RuntimeError("/internal/path")
+
+    monkeypatch.setattr(server, "render", fail)
+    response = requests.post(server_url + "/pdf", data=xml_input)
+    assert response.status_code == 500
+    assert "/internal/path" not in response.text
+
+
+def test_warm_up_registers_fonts():
+    """Warming a worker up should register the fonts before the first request"""
+    script = (
+        "from pyxml2pdf.Core.Server import _warm_up\n"
+        "from pyxml2pdf.PdfVisualisation.FontRegistry import FontRegistry\n"
+        "assert not FontRegistry._registered\n"
+        "_warm_up()\n"
+        "assert FontRegistry._registered\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
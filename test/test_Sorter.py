@@ -0,0 +1,140 @@
+from datetime import datetime
+from xml.etree.ElementTree import Element, SubElement
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import datetimes
+
+from pyxml2pdf.Core.Sorter import Sorter
+
+
+def create_course(date, place="", title=""):
+    course = Element("kurs")
+    for tag, text in (
+        ("TerminDatumVon1", date),
+        ("Ort1", place),
+        ("Bezeichnung", title),
+    ):
+        SubElement(course, tag).text = text
+    return course
+
+
+@given(datetimes(min_value=datetime(1000, 1, 1)))
+def test_parse_date(date):
+    """The fast path should result in the same dates as strptime"""
+    expected = datetime.strptime(date.strftime("%d.%m.%Y %H:%M"), "%d.%m.%Y %H:%M")
+    assert Sorter._parse_date(date.strftime("%d.%m.%Y %H:%M")) == (
+        expected.year,
+        expected.month,
+        expected.day,
+        expected.hour,
+        expected.minute,
+    )
+
+
+@pytest.mark.parametrize(
+    "date",
+    [
+        "01.01.2021 -1:00",
+        "01.01.2021 +1:05",
+        "01.01.2021 10:-5",
+        "01.01.2021  1:05",
+        " 1.01.2021 10:00",
+        "01. 1.2021 10:00",
+        "01.01.+021 10:00",
+        "01.01.2021 \u0661\u0660:00",
+        "\u0660\u0661.01.2021 10:00",
+    ],
+)
+def test_parse_date_like_strptime(date):
+    """Dates not in the fixed length format should be treated like by strptime"""
+    try:
+        expected = datetime.strptime(date, "%d.%m.%Y %H:%M")
+    except ValueError:
+        with pytest.raises(ValueError):
+            Sorter._parse_date(date)
+    else:
+        assert Sorter._parse_date(date) == (
+            expected.year,
+            expected.month,
+            expected.day,
+            expected.hour,
+            expected.minute,
+        )
+
+
+@pytest.mark.parametrize("date", ["", None])
+def test_parse_missing_date(date):
+    assert Sorter._parse_date(date) == Sorter._parse_date("01.01.2099 00:00")
+
+
+def test_parse_leap_day():
+    assert Sorter._parse_date("29.02.2020 10:00") == (2020, 2, 29, 10, 0)
+
+
+def test_parse_irregular_date():
+    """Dates not in the fixed length format should be parsed nevertheless"""
+    assert Sorter._parse_date("1.2.2020 9:05") == (2020, 2, 1, 9, 5)
+
+
+@pytest.mark.parametrize(
+    "date",
+    [
+        "31.13.2020 10:00",
+        "01.01.2020 10:60",
+        "31.02.2021 10:00",
+        "29.02.2021 10:00",
+        "31.04.2020 10:00",
+        "01.01.0000 10:00",
+        "Dezember",
+    ],
+)
+def test_parse_invalid_date(date):
+    with pytest.raises(ValueError):
+        Sorter._parse_date(date)
+
+
+def test_sort_parsed_xml():
+    dates = ["05.01.2020 10:00", "", "01.01.2020 12:00", "01.01.2020 08:00"]
+    courses = [create_course(date) for date in dates]
+    sorted_courses = Sorter(courses).sort_parsed_xml("TerminDatumVon1")
+    assert [course.findtext("TerminDatumVon1") for course in sorted_courses] == [
+        "01.01.2020 08:00",
+        "01.01.2020 12:00",
+        "05.01.2020 10:00",
+        "",
+    ]
+
+
+def test_sort_parsed_xml_stable():
+    """Courses with the same date should keep their order"""
+    courses = [create_course("01.01.2020 08:00", title=title) for title in "cab"]
+    sorted_courses = Sorter(courses[:]).sort_parsed_xml("TerminDatumVon1")
+    assert sorted_courses == courses
+
+
+def test_sort_parsed_xml_sorted():
+    """Already sorted courses should be left untouched"""
+    courses = [create_course("0%d.01.2020 08:00" % day) for day in range(1, 10)]
+    original_courses = courses[:]
+    assert Sorter(courses).sort_parsed_xml("TerminDatumVon1") is courses
+    assert all(
+        course is original_course
+        for course, original_course in zip(courses, original_courses)
+    )
+
+
+def test_sort_parsed_xml_composite_key():
+    courses = [
+        create_course("01.01.2020 08:00", "Sachsen", "b"),
+        create_course("01.01.2020 08:00", "Berlin", "b"),
+        create_course("01.01.2020 08:00", "Sachsen", "a"),
+        create_course("01.01.2019 08:00", "Sachsen", "c"),
+    ]
+    sorted_courses = Sorter(courses).sort_parsed_xml(
+        "TerminDatumVon1", "Ort1", "Bezeichnung"
+    )
+    assert [
+        (course.findtext("Ort1"), course.findtext("Bezeichnung"))
+        for course in sorted_courses
+    ] == [("Sachsen", "c"), ("Berlin", "b"), ("Sachsen", "a"), ("Sachsen", "b")]
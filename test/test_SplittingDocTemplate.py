@@ -0,0 +1,50 @@
+import pytest
+from PyPDF2.pdf import PdfFileReader
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.SplittingDocTemplate import SplittingDocTemplate
+
+
+@pytest.fixture
+def flowables():
+    """Create enough paragraphs to fill several pages
+
+    :returns: a function creating a fresh list of the paragraphs on each call
+    """
+    style = getSampleStyleSheet()["Normal"]
+    return lambda: [Paragraph("Absatz %d" % number, style) for number in range(150)]
+
+
+def extract_texts(path):
+    return [page.extractText() for page in PdfFileReader(path, strict=False).pages]
+
+
+def test_splitting_doc_template(flowables, tmp_path):
+    """Single pass output should match the post processed multi page PDF"""
+    multipage_path = str(tmp_path.joinpath("multi", "doc.pdf"))
+    single_pass_path = str(tmp_path.joinpath("single", "doc.pdf"))
+    tmp_path.joinpath("multi").mkdir()
+    tmp_path.joinpath("single").mkdir()
+    SimpleDocTemplate(multipage_path).build(flowables())
+    PostProcessor(multipage_path).finalize_print_preparation()
+    SplittingDocTemplate(single_pass_path).build(flowables())
+
+    number_of_pages = PdfFileReader(multipage_path).getNumPages()
+    assert number_of_pages > 2
+    assert not tmp_path.joinpath("single", "doc.pdf").exists()
+    assert not tmp_path.joinpath(
+        "single", "doc_seite_%02d.pdf" % (number_of_pages + 1)
+    ).exists()
+    for page_number in range(1, number_of_pages + 1):
+        post_processed_page = PostProcessor.single_page_path(
+            multipage_path, page_number
+        )
+        single_pass_page = PostProcessor.single_page_path(single_pass_path, page_number)
+        assert PdfFileReader(single_pass_page).getNumPages() == 1
+        assert (
+            PdfFileReader(single_pass_page).getPage(0).get("/Rotate")
+            == PostProcessor.rotation
+        )
+        assert extract_texts(single_pass_page) == extract_texts(post_processed_page)
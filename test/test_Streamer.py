@@ -0,0 +1,75 @@
+import tracemalloc
+from io import BytesIO
+
+import pytest
+from defusedxml.ElementTree import parse
+
+from benchmarks.feeds import generate_feed
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.Streamer import Streamer
+
+
+@pytest.fixture
+def xml_path() -> str:
+    return "test/test_data/testdata.xml"
+
+
+def test_streamer_yields_all_courses(xml_path):
+    """Streamer should yield the same courses in the same order as a full parse"""
+    expected = [
+        course.findtext("Kursnummer") for course in parse(xml_path).findall("kurs")
+    ]
+    assert [course.findtext("Kursnummer") for course in Streamer(xml_path)] == expected
+
+
+def test_streamer_clears_consumed_courses(xml_path):
+    """Streamer should free a course as soon as the next one is requested"""
+    streamer = iter(Streamer(xml_path))
+    first_course = next(streamer)
+    assert len(first_course)
+    next(streamer)
+    assert not len(first_course)
+
+
+def test_streamer_custom_tag():
+    """Streamer should only yield the root's children of the requested tag"""
+    source = BytesIO(b"<r><a><b>1</b></a><b>2</b><c/></r>")
+    assert [element.text for element in Streamer(source, "b")] == ["2"]
+
+
+def test_streamer_keeps_nested_elements():
+    """Nested elements with the tag should stay intact like with findall"""
+    source = b"<r><kurs><kurs>1</kurs><x>2</x></kurs><kurs>3</kurs></r>"
+    expected = [
+        [child.text for child in course]
+        for course in parse(BytesIO(source)).findall("kurs")
+    ]
+    assert (
+        [[child.text for child in course] for course in Streamer(BytesIO(source))]
+        == expected
+        == [["1", "2"], []]
+    )
+
+
+def peak_memory(function):
+    tracemalloc.start()
+    try:
+        result = function()
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def test_streamer_saves_memory(tmp_path):
+    """Streaming should not need the memory of the whole tree on top of the events"""
+    input_path = str(tmp_path.joinpath("feed.xml"))
+    generate_feed(input_path, 500)
+    # Stream first, so the caches of the events are filled for the full parse.
+    streamed_peak, events = peak_memory(
+        lambda: [Event(course) for course in Streamer(input_path)]
+    )
+    parsed_peak, _ = peak_memory(
+        lambda: [Event(course) for course in parse(input_path).findall("kurs")]
+    )
+    assert len(events) == 500
+    assert streamed_peak < parsed_peak / 2
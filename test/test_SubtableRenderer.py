@@ -0,0 +1,86 @@
+import pytest
+from defusedxml.ElementTree import parse
+from PyPDF2 import PdfFileReader
+
+from benchmarks.feeds import generate_feed
+from pyxml2pdf.Core.events import Event
+from pyxml2pdf.Core.Initializer import Initializer
+from pyxml2pdf.Core.PostProcessor import PostProcessor
+from pyxml2pdf.Core.RowCache import RowCache
+from pyxml2pdf.Core.SubtableRenderer import SubtableRenderer, render_subtable
+from pyxml2pdf.model.tables.TableBuilder import TableBuilder
+
+
+@pytest.fixture(scope="module")
+def input_path(tmp_path_factory):
+    input_path = str(tmp_path_factory.mktemp("feed").joinpath("feed.xml"))
+    generate_feed(input_path, 40)
+    return input_path
+
+
+@pytest.fixture(scope="module")
+def events(input_path):
+    return read_events(input_path)
+
+
+def read_events(input_path):
+    return [Event(course) for course in parse(input_path).findall("kurs")]
+
+
+def render_segments(events, tmp_path):
+    return [
+        render_subtable(
+            events,
+            subtable,
+            str(tmp_path.joinpath("segment_%02d.pdf" % subtable)),
+            Initializer.document_layout,
+        )
+        for subtable in range(len(TableBuilder().subtable_titles))
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build(events, tmp_path, workers):
+    output_path = str(tmp_path.joinpath("result.pdf"))
+    renderer = SubtableRenderer(output_path, Initializer.document_layout, workers)
+    pages = renderer.build(events)
+    segments = render_segments(events, tmp_path)
+    assert pages == sum(segment_pages for segment_pages, _ in segments)
+    assert renderer.rows == sum(rows for _, rows in segments)
+    assert renderer.rows > 0
+    assert PdfFileReader(output_path).getNumPages() == pages
+
+
+def test_build_routes_events(events, tmp_path, monkeypatch):
+    """Each subtable should only receive the events routed to it"""
+    received = []
+    monkeypatch.setattr(
+        "pyxml2pdf.Core.SubtableRenderer.render_subtable",
+        lambda subtable_events, *arguments: received.append(subtable_events) or (0, 0),
+    )
+    monkeypatch.setattr(PostProcessor, "merge_segments", lambda *arguments: 0)
+    output_path = str(tmp_path.joinpath("result.pdf"))
+    SubtableRenderer(output_path, Initializer.document_layout).build(events)
+    assert received == TableBuilder().route_events(events)
+    assert all(len(subtable_events) < len(events) for subtable_events in received)
+
+
+@pytest.mark.parametrize("persisted", [False, True])
+def test_build_hands_layouts_back(input_path, tmp_path, monkeypatch, persisted):
+    """The workers' layouts should only be merged, if the row cache is persisted"""
+    # The events of the other tests already hold the layouts of their cells.
+    events = read_events(input_path)
+    row_cache_path = str(tmp_path.joinpath("feed.xml.rows")) if persisted else None
+    monkeypatch.setattr(Event, "row_cache", RowCache(row_cache_path))
+    merged = []
+    monkeypatch.setattr(
+        Event.row_cache, "merge", lambda rows, hits=0: merged.append(rows)
+    )
+    output_path = str(tmp_path.joinpath("result.pdf"))
+    SubtableRenderer(output_path, Initializer.document_layout, 2).build(events)
+    assert any(merged) == persisted
+
+
+def test_render_subtable_repeatedly(events, tmp_path):
+    """Rendering in one process should not depend on the subtables before"""
+    assert render_segments(events, tmp_path) == render_segments(events, tmp_path)
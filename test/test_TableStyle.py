@@ -0,0 +1,45 @@
+import pytest
+from reportlab.platypus import Table
+from reportlab.platypus import TableStyle as ReportlabTableStyle
+
+from pyxml2pdf.model.tables.TableBuilder import TableBuilder
+from pyxml2pdf.PdfVisualisation.TableStyle import TableStyle
+
+
+def test_table_style_shared():
+    """All instances should share the styles built once"""
+    assert TableStyle() is TableStyle()
+    assert TableStyle().custom_styles["Normal"] is TableStyle().custom_styles["Normal"]
+
+
+def test_table_style_prebuilt():
+    table_style = TableStyle()
+    for style in (table_style.heading, table_style.normal, table_style.sub_heading):
+        assert isinstance(style, ReportlabTableStyle)
+
+
+def test_reduced_column_widths():
+    table_style = TableStyle()
+    assert table_style.reduced_column_widths[:4] == table_style.column_widths[:4]
+    assert table_style.reduced_column_widths[-1] == sum(table_style.column_widths[4:])
+    assert sum(table_style.reduced_column_widths) == sum(table_style.column_widths)
+
+
+def test_table_style_read_only():
+    with pytest.raises(AttributeError):
+        TableStyle().normal = TableStyle().heading
+
+
+def test_fixedwidth_tables_styled_separately():
+    """Restyling one table should not restyle other tables with the same style"""
+    table_builder = TableBuilder()
+    cells = [["a", "b", "c"]]
+    for style in TableStyle().prebuilt:
+        table = table_builder.create_fixedwidth_table(cells, [1, 2, 3], style)
+        other_table = table_builder.create_fixedwidth_table(cells, [1, 2, 3], style)
+        expected = Table(cells, colWidths=[1, 2, 3], style=style)
+        table.setStyle([("ALIGN", (0, 0), (-1, -1), "RIGHT")])
+        assert table._cellStyles[0][0].alignment == "RIGHT"
+        assert [vars(cell_style) for cell_style in other_table._cellStyles[0]] == [
+            vars(cell_style) for cell_style in expected._cellStyles[0]
+        ]
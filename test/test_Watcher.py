@@ -0,0 +1,160 @@
+import os
+import shutil
+
+import pytest
+
+from benchmarks.feeds import generate_feed
+from pyxml2pdf.Core.RowCache import RowCache
+from pyxml2pdf.Core.Watcher import Watcher
+
+
+@pytest.fixture
+def watcher(tmp_path) -> Watcher:
+    """Create a watcher for a copy of the test data
+
+    :returns: the watcher
+    """
+    shutil.copy("test/test_data/testdata.xml", str(tmp_path))
+    return Watcher(
+        str(tmp_path.joinpath("testdata.xml")),
+        str(tmp_path.joinpath("testdata.pdf")),
+        str(tmp_path.joinpath("testdata_prop.properties")),
+        interval=0.0,
+    )
+
+
+def touch(path, content=None):
+    """Change a file and make sure its modification time changes as well"""
+    if content is not None:
+        with open(path, "wb") as file:
+            file.write(content)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_watcher_builds_once(watcher, tmp_path):
+    assert watcher.rebuild()
+    assert tmp_path.joinpath("testdata_seite_01.pdf").exists()
+    assert not watcher.rebuild()
+
+
+def test_watcher_reuses_unchanged_events(watcher, tmp_path):
+    watcher.rebuild()
+    xml_path = tmp_path.joinpath("testdata.xml")
+    content = xml_path.read_bytes()
+    touch(str(xml_path), content.replace(b"Kuhlake", b"Kuhlache", 1))
+    assert watcher.rebuild()
+    assert watcher.reused_events == len(watcher._sorted_events) - 1
+
+
+def test_watcher_rebuilds_same_document(watcher, tmp_path):
+    watcher.rebuild()
+    first_result = tmp_path.joinpath("testdata_seite_01.pdf").stat().st_size
+    tmp_path.joinpath("testdata_seite_01.pdf").unlink()
+    touch(str(tmp_path.joinpath("testdata.xml")))
+    assert watcher.rebuild()
+    assert watcher.reused_events == len(watcher._sorted_events)
+    assert tmp_path.joinpath("testdata_seite_01.pdf").stat().st_size == first_result
+
+
+def test_watcher_ignores_properties_change(watcher, tmp_path):
+    """The properties file does not affect the layout, so it is not watched"""
+    watcher.rebuild()
+    tmp_path.joinpath("testdata_prop.properties").write_text("changed")
+    assert not watcher.rebuild()
+
+
+def test_watcher_waits_for_valid_xml(watcher, tmp_path):
+    xml_path = str(tmp_path.joinpath("testdata.xml"))
+    touch(xml_path, b"<kursexport><kurs>")
+    assert not watcher.rebuild()
+    shutil.copy("test/test_data/testdata.xml", xml_path)
+    touch(xml_path)
+    assert watcher.rebuild()
+
+
+def test_watcher_waits_for_missing_xml(watcher, tmp_path):
+    watcher.rebuild()
+    xml_path = tmp_path.joinpath("testdata.xml")
+    content = xml_path.read_bytes()
+    xml_path.unlink()
+    assert not watcher.rebuild()
+    touch(str(xml_path), content)
+    assert watcher.rebuild()
+    assert watcher.reused_events == len(watcher._sorted_events)
+
+
+def test_watcher_reuses_events_after_incomplete_xml(watcher, tmp_path):
+    watcher.rebuild()
+    xml_path = tmp_path.joinpath("testdata.xml")
+    content = xml_path.read_bytes()
+    touch(str(xml_path), content[: len(content) // 2])
+    assert not watcher.rebuild()
+    touch(str(xml_path), content)
+    assert watcher.rebuild()
+    assert watcher.reused_events == len(watcher._sorted_events)
+
+
+def test_watcher_resets_reused_events(watcher, tmp_path):
+    watcher.rebuild()
+    touch(str(tmp_path.joinpath("testdata.xml")))
+    watcher.rebuild()
+    assert watcher.reused_events
+    watcher._events.clear()
+    touch(str(tmp_path.joinpath("testdata.xml")))
+    assert watcher.rebuild()
+    assert watcher.reused_events == 0
+
+
+def test_watcher_survives_failed_build(watcher, tmp_path, monkeypatch):
+    """A failing build should be reported and retried once the inputs change"""
+
+    def fail(profiler):
+        raise ValueError("layout failed")
+
+    report_path = tmp_path.joinpath("report.json")
+    watcher._report_path = str(report_path)
+    with monkeypatch.context() as context:
+        context.setattr(watcher, "_build", fail)
+        assert not watcher.rebuild()
+        assert not watcher.rebuild()
+    assert not report_path.exists()
+    touch(str(tmp_path.joinpath("testdata.xml")))
+    assert watcher.rebuild()
+    assert report_path.exists()
+
+
+def test_watcher_writes_no_report_for_invalid_xml(watcher, tmp_path):
+    report_path = tmp_path.joinpath("report.json")
+    watcher._report_path = str(report_path)
+    touch(str(tmp_path.joinpath("testdata.xml")), b"<kursexport><kurs>")
+    assert not watcher.rebuild()
+    assert not report_path.exists()
+
+
+def test_watch(watcher, tmp_path):
+    watcher.watch(builds=1)
+    assert tmp_path.joinpath("testdata_seite_01.pdf").exists()
+
+
+def test_watcher_row_cache(tmp_path):
+    """Only the line breaks of the latest build's rows should be kept and stored"""
+    xml_path = tmp_path.joinpath("feed.xml")
+    row_cache_path = str(tmp_path.joinpath("feed.xml.rows"))
+    generate_feed(str(xml_path), 20)
+    watcher = Watcher(
+        str(xml_path),
+        str(tmp_path.joinpath("feed.pdf")),
+        "test/test_data/testdata_prop.properties",
+        interval=0.0,
+        row_cache_path=row_cache_path,
+    )
+    watcher.rebuild()
+    number_of_rows = len(watcher._row_cache._rows)
+    assert number_of_rows
+    content = xml_path.read_bytes()
+    touch(str(xml_path), content.replace(b"<Bezeichnung>", b"<Bezeichnung>Neu ", 1))
+    assert watcher.rebuild()
+    assert watcher._row_cache.hits
+    assert len(watcher._row_cache._rows) == number_of_rows
+    assert RowCache(row_cache_path)._rows.keys() == watcher._row_cache._rows.keys()
@@ -0,0 +1,72 @@
+import json
+from io import BytesIO
+
+import pytest
+from defusedxml.ElementTree import parse
+
+from benchmarks.feeds import generate_feed
+from benchmarks.run import (
+    BASELINES_PATH,
+    STAGES,
+    benchmark_stages,
+    compare_to_baselines,
+    find_missing_baselines,
+    relative_times,
+)
+
+
+@pytest.fixture
+def feed() -> bytes:
+    output = BytesIO()
+    generate_feed(output, 100)
+    return output.getvalue()
+
+
+def test_generate_feed(feed):
+    courses = parse(BytesIO(feed)).findall("kurs")
+    assert len(courses) == 100
+    assert all(course.findtext("Kategorie") for course in courses)
+    assert any(
+        course.findtext("TerminDatumBis1") == "01.01.2099 00:00" for course in courses
+    )
+
+
+def test_generate_feed_reproducible(feed):
+    output = BytesIO()
+    generate_feed(output, 100)
+    assert output.getvalue() == feed
+
+
+def test_benchmark_stages(tmp_path):
+    times = benchmark_stages(30, str(tmp_path))
+    assert tuple(times) == STAGES
+    assert all(seconds > 0 for seconds in times.values())
+
+
+def test_relative_times():
+    runs = [
+        dict.fromkeys(STAGES, 2.0),
+        dict(dict.fromkeys(STAGES, 3.0), calibration=0.5),
+    ]
+    assert relative_times(runs) == dict.fromkeys(STAGES[1:], 4.0)
+
+
+def test_compare_to_baselines():
+    baselines = {"1000": {"parse": 1.0, "sort": 1.0}}
+    results = {"1000": {"parse": 1.1, "sort": 1.3, "build": 9.0}}
+    regressions = compare_to_baselines(results, baselines, 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("sort")
+
+
+def test_find_missing_baselines():
+    baselines = {"1000": {"parse": 1.0, "sort": 1.0}}
+    results = {"1000": {"parse": 1.1, "build": 9.0}, "10000": {"parse": 9.0}}
+    assert len(find_missing_baselines(results, baselines)) == 2
+
+
+def test_committed_baselines():
+    """The default size should have a baseline for every stage"""
+    with open(BASELINES_PATH) as baselines_file:
+        baselines = json.load(baselines_file)
+    assert not find_missing_baselines({"1000": dict.fromkeys(STAGES[1:])}, baselines)
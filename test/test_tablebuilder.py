@@ -1,5 +1,9 @@
+from xml.etree.ElementTree import Element, SubElement
+
 import pytest
+from reportlab.platypus import LongTable
 
+from pyxml2pdf.Core.events import Event
 from pyxml2pdf.model.tables.TableBuilder import TableBuilder
 
 
@@ -15,3 +19,89 @@ def table_builder():
 
 def test_tablebuilder_fixedwidth_call(table_data, table_builder):
     table_builder.create_fixedwidth_table(table_data)
+
+
+@pytest.mark.parametrize(
+    "categories",
+    [
+        [],
+        ["Wandern"],
+        ["Familie"],
+        ["Klettern", "Mittelgebirge"],
+        ["Klettern", "Hochgebirge", "Mittelgebirge"],
+        ["Familie", "Jugend", "Klettern", "Hochgebirge"],
+        ["Höhle", "Mittelgebirge", "Hochgebirge", "in Berlin"],
+    ],
+)
+def test_find_subtables(table_builder, categories):
+    """The index should find the same subtables as intersecting each of them"""
+    expected = [
+        subtable
+        for subtable in table_builder._subtables
+        if set(categories).intersection(subtable.activities)
+        and set(categories).intersection(subtable.locations)
+    ]
+    assert table_builder._find_subtables(categories) == expected
+
+
+def test_single_subtable():
+    """A single subtable should contain the same rows as in the whole document"""
+    courses = []
+    for categories in ("Familie, Jugend", "Familie", "Jugend"):
+        course = Element("kurs")
+        SubElement(course, "Kategorie").text = categories
+        SubElement(course, "Bezeichnung").text = "Ausflug"
+        courses.append(course)
+    jugend = TableBuilder().subtable_titles.index("Jugendgruppen und -events")
+    table_builder = TableBuilder(jugend)
+    events = [Event(course) for course in courses]
+    for event in events:
+        table_builder.distribute_event(event)
+    single_tables = table_builder.collect_subtables()
+    # The full row of the first event belongs to the family subtable.
+    assert not hasattr(events[0], "_full_row")
+    assert len(single_tables) == 4
+    assert single_tables[0]._cellvalues[0][0].text == "Jugendgruppen und -events"
+    # The reduced row of the first event refers to the family subtable.
+    assert len(single_tables[2]._cellvalues[0]) == 5
+    assert len(single_tables[3]._cellvalues[0]) == 7
+
+
+def test_long_tables():
+    """Each subtable should be one table with the same rows as the single tables"""
+    courses = []
+    for categories in ("Familie, Jugend", "Familie", "Jugend"):
+        course = Element("kurs")
+        SubElement(course, "Kategorie").text = categories
+        SubElement(course, "Bezeichnung").text = "Ausflug"
+        courses.append(course)
+    table_builders = [TableBuilder(), TableBuilder(long_tables=True)]
+    for table_builder in table_builders:
+        for event in [Event(course) for course in courses]:
+            table_builder.distribute_event(event)
+    rows = table_builders[0].collect_subtables()
+    tables = table_builders[1].collect_subtables()
+    assert len(tables) == 4
+    assert all(isinstance(table, LongTable) for table in tables)
+    assert table_builders[1].rows == len(rows) == 12
+    assert tables[0].repeatRows == 2
+    # Rows and tables break their cells into the same lines.
+    assert sum(table.wrap(1000, 10000)[1] for table in tables) == pytest.approx(
+        sum(row.wrap(1000, 10000)[1] for row in rows)
+    )
+
+
+def test_route_events(table_builder):
+    """Routing should sort the events into the subtables without building rows"""
+    events = []
+    for categories in ("Familie, Jugend", "Familie", "Wandern"):
+        course = Element("kurs")
+        SubElement(course, "Kategorie").text = categories
+        SubElement(course, "Bezeichnung").text = "Ausflug"
+        events.append(Event(course))
+    with pytest.warns(RuntimeWarning):
+        familie, bergsteigen, jugend, klettern = table_builder.route_events(events)
+    assert familie == events[:2]
+    assert jugend == events[:1]
+    assert bergsteigen == klettern == []
+    assert all(event._full_subtable is None for event in events)